@@ -0,0 +1,117 @@
+"""
+Delta responses for `POST /games/{id}/advance`.
+
+With `?delta=1` (or `Accept: application/vnd.mercury.delta+json`) the advance response carries only
+what the event changed: the transcript rows it inserted and an RFC 6902 patch from the client's state
+version (`since`) to the new one, instead of the full state and a follow-up transcript read.
+
+The rows and the final state are recorded as they are written. `insert_transcript_entry` and the
+state write report into the `AdvanceWrites` of the current request through a context variable, so
+building the delta costs no extra reads.
+"""
+
+import contextvars
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .state_patch import state_patch
+
+ADVANCE_DELTA_MEDIA_TYPE = "application/vnd.mercury.delta+json"
+
+T = TypeVar("T")
+
+
+class AdvanceWrites:
+    """Transcript rows and the last state write of one advance, in write order."""
+
+    def __init__(self) -> None:
+        self.transcript: List[Dict[str, Any]] = []
+        self.version: Optional[int] = None
+        self.status: Optional[str] = None
+        self._state_json: Optional[str] = None
+        self._state_object: Optional[Dict[str, Any]] = None
+
+    def record_transcript(self, entry: Dict[str, Any]) -> None:
+        self.transcript.append(entry)
+
+    def record_state(
+        self, version: int, status: Optional[str], state_json: str, state: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self.version = version
+        self.status = status
+        self._state_json = state_json
+        self._state_object = state
+
+    def encoded_state(self, state: Any) -> Optional[str]:
+        """The JSON written for `state` if it is the dict the last write serialized, else None."""
+        return self._state_json if state is not None and state is self._state_object else None
+
+    def state(self) -> Optional[Dict[str, Any]]:
+        """The state as stored by the last write (what GET /games/{id} returns at `version`)."""
+        return None if self._state_json is None else json.loads(self._state_json)
+
+    def merge(self, other: "AdvanceWrites") -> None:
+        self.transcript.extend(other.transcript)
+        if other.version is not None:
+            self.version, self.status = other.version, other.status
+            self._state_json, self._state_object = other._state_json, other._state_object
+
+
+_CURRENT_WRITES: "contextvars.ContextVar[Optional[AdvanceWrites]]" = contextvars.ContextVar(
+    "advance_writes", default=None
+)
+
+
+def current_advance_writes() -> Optional[AdvanceWrites]:
+    return _CURRENT_WRITES.get()
+
+
+async def record_advance_writes(fn: Callable[[], Awaitable[T]]) -> Tuple[T, AdvanceWrites]:
+    """Run `fn` collecting its writes, and return them with its result so that they can be shared."""
+    writes = AdvanceWrites()
+    token = _CURRENT_WRITES.set(writes)
+    try:
+        return await fn(), writes
+    finally:
+        _CURRENT_WRITES.reset(token)
+
+
+def wants_advance_delta(delta: bool, accept: Optional[str]) -> bool:
+    return delta or (accept is not None and ADVANCE_DELTA_MEDIA_TYPE in accept)
+
+
+def advance_delta_body(
+    game_id: str,
+    since: Optional[int],
+    base_state: Optional[Dict[str, Any]],
+    writes: AdvanceWrites,
+    fallback_state: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Delta envelope. `patch` is set when the state at `since` was known, otherwise `state` holds the
+    full new state. `version` is null when this request did not observe the write itself (a duplicate
+    served from another worker's flight, or an event that changed nothing); the client should re-read.
+    """
+    new_state = writes.state()
+    patch = None
+    if new_state is not None and base_state is not None:
+        patch = state_patch(base_state, new_state)
+    return {
+        "game_id": game_id,
+        "version": writes.version,
+        "base_version": since if patch is not None else None,
+        "status": writes.status if writes.version is not None else fallback_state.get("status"),
+        "patch": patch,
+        "state": None if patch is not None else (new_state if new_state is not None else fallback_state),
+        "transcript": writes.transcript,
+    }
+
+
+__all__ = [
+    "ADVANCE_DELTA_MEDIA_TYPE",
+    "AdvanceWrites",
+    "advance_delta_body",
+    "current_advance_writes",
+    "record_advance_writes",
+    "wants_advance_delta",
+]
@@ -0,0 +1,251 @@
+"""
+Response compression for JSON payloads.
+
+`CompressionMiddleware` negotiates `br` (via `brotli`, pinned in backend/requirements.txt) or `gzip`
+from `Accept-Encoding` and compresses buffered JSON and text responses of at least
+RESPONSE_COMPRESSION_MIN_BYTES. Bodies of RESPONSE_COMPRESSION_THREAD_BYTES or more are compressed in
+a worker thread so the event loop keeps serving other requests. Streaming responses (SSE) and
+responses that already carry a `Content-Encoding` pass through untouched.
+
+A compressed body is a different byte sequence from the identity one, so its `ETag` is made weak (`W/`).
+So is the `ETag` of a 304 sent to a client that negotiated an encoding. `etag_matches` compares weakly,
+so conditional requests still match.
+
+Immutable payloads opt into a cache of compressed bytes by setting the internal
+`X-Compression-Cache-Key` header (stripped before sending). Examples are a materialized review or a
+game body at a given version. Each (key, encoding) pair is then compressed once per worker, at a
+higher quality.
+"""
+
+import asyncio
+import collections
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, OrderedDict, Sequence, Tuple
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None  # type: ignore[assignment]
+
+COMPRESSION_CACHE_KEY_HEADER = "x-compression-cache-key"
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+# (dynamic, cached) quality per encoding: cached payloads are compressed once, so they get more effort.
+_GZIP_LEVELS = (6, 9)
+_BROTLI_QUALITIES = (5, 11)
+
+
+def available_encodings() -> Tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Sequence[str]) -> Optional[str]:
+    """Best encoding from `available` (in server preference order) accepted by the client, or None."""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+    best: Optional[str] = None
+    best_q = 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    if encoding == "br":
+        assert brotli is not None
+        return brotli.compress(body, quality=_BROTLI_QUALITIES[cached])
+    return gzip.compress(body, compresslevel=_GZIP_LEVELS[cached])
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by (cache key, encoding)."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Tuple[str, str], bytes] = collections.OrderedDict()
+
+    def get(self, key: str, encoding: str) -> Optional[bytes]:
+        body = self._entries.get((key, encoding))
+        if body is not None:
+            self._entries.move_to_end((key, encoding))
+        return body
+
+    def put(self, key: str, encoding: str, body: bytes) -> None:
+        self._entries[(key, encoding)] = body
+        self._entries.move_to_end((key, encoding))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_CACHE_KEY = COMPRESSION_CACHE_KEY_HEADER.encode()
+
+
+def _without(headers: List[Tuple[bytes, bytes]], name: bytes) -> List[Tuple[bytes, bytes]]:
+    return [(key, value) for key, value in headers if key.lower() != name]
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _weak_etag(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    etag = _header(headers, b"etag")
+    if etag is None or etag.startswith(b"W/"):
+        return headers
+    return _without(headers, b"etag") + [(b"etag", b"W/" + etag)]
+
+
+class CompressionMiddleware:
+    """ASGI middleware; `settings` is called on first use so configuration is read lazily."""
+
+    def __init__(self, app: Any, settings: Callable[[], Any]) -> None:
+        self.app = app
+        self._settings = settings
+        self._config: Optional[Tuple[bool, int, int]] = None
+        self.cache = CompressedBodyCache()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _configure(self) -> Tuple[bool, int, int]:
+        if self._config is None:
+            settings = self._settings()
+            self._config = (
+                settings.response_compression_enabled,
+                settings.response_compression_min_bytes,
+                settings.response_compression_thread_bytes,
+            )
+            self.cache.max_entries = settings.response_compression_cache_entries
+        return self._config
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        enabled, min_bytes, thread_bytes = self._configure()
+        if not enabled:
+
+            async def strip_cache_key(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    message = {**message, "headers": _without(message.get("headers", []), _CACHE_KEY)}
+                await send(message)
+
+            await self.app(scope, receive, strip_cache_key)
+            return
+        request_headers = dict(scope.get("headers") or [])
+        encoding = negotiate_encoding(
+            request_headers.get(b"accept-encoding", b"").decode("latin-1"), available_encodings()
+        )
+
+        start: Optional[Dict[str, Any]] = None
+        chunks: List[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            assert start is not None
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                # Streaming response (e.g. SSE): send it as produced, uncompressed.
+                passthrough = True
+                await send(start)
+                await send({**message, "body": b"".join(chunks)})
+                chunks.clear()
+                return
+            await self._send_buffered(start, b"".join(chunks), encoding, min_bytes, thread_bytes, send)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_buffered(
+        self,
+        start: Dict[str, Any],
+        body: bytes,
+        encoding: Optional[str],
+        min_bytes: int,
+        thread_bytes: int,
+        send: Callable,
+    ) -> None:
+        headers = _without(start.get("headers", []), _CACHE_KEY)
+        cache_key = _header(start.get("headers", []), _CACHE_KEY)
+        content_type = (_header(headers, b"content-type") or b"").decode("latin-1")
+        eligible = (
+            start["status"] not in (204, 304)
+            and _header(headers, b"content-encoding") is None
+            and content_type.startswith(COMPRESSIBLE_TYPES)
+            and len(body) >= min_bytes
+        )
+        if eligible:
+            vary = _header(headers, b"vary")
+            if vary is None:
+                headers.append((b"vary", b"Accept-Encoding"))
+            elif b"accept-encoding" not in vary.lower():
+                headers = _without(headers, b"vary")
+                headers.append((b"vary", vary + b", Accept-Encoding"))
+        if eligible and encoding is not None:
+            body = await self._compressed(body, encoding, cache_key.decode("latin-1") if cache_key else None, thread_bytes)
+            headers = _without(headers, b"content-length")
+            headers.append((b"content-length", str(len(body)).encode()))
+            headers.append((b"content-encoding", encoding.encode()))
+            headers = _weak_etag(headers)
+        elif start["status"] == 304 and encoding is not None:
+            # Stands in for the compressed representation, so it carries the same weak tag.
+            headers = _weak_etag(headers)
+        await send({**start, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _compressed(self, body: bytes, encoding: str, cache_key: Optional[str], thread_bytes: int) -> bytes:
+        if cache_key is not None:
+            cached = self.cache.get(cache_key, encoding)
+            if cached is not None:
+                return cached
+        if len(body) >= thread_bytes:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="compress")
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, compress, body, encoding, cache_key is not None
+            )
+        else:
+            result = compress(body, encoding, cache_key is not None)
+        if cache_key is not None:
+            self.cache.put(cache_key, encoding, result)
+        return result
+
+
+__all__ = [
+    "COMPRESSION_CACHE_KEY_HEADER",
+    "CompressedBodyCache",
+    "CompressionMiddleware",
+    "available_encodings",
+    "compress",
+    "negotiate_encoding",
+]
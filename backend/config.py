@@ -1,5 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
+from typing import Any, Dict
 import os
 
 from pydantic import Field, field_validator
@@ -30,9 +31,55 @@ class Settings(BaseSettings):
     llm_provider: str | None = Field(default=None, validation_alias="LLM_PROVIDER")
     openai_api_key: str | None = Field(default=None, validation_alias="OPENAI_API_KEY")
     openai_model: str | None = Field(default=None, validation_alias="OPENAI_MODEL")
+    openai_reasoning_effort: str | None = Field(default="minimal", validation_alias="OPENAI_REASONING_EFFORT")
     openai_round3_debate_speeches: bool = Field(
         default=False, validation_alias="OPENAI_ROUND3_DEBATE_SPEECHES"
     )
+    llm_max_concurrency: int = Field(default=8, validation_alias="LLM_MAX_CONCURRENCY")
+    llm_background_max_concurrency: int = Field(default=4, validation_alias="LLM_BACKGROUND_MAX_CONCURRENCY")
+    round2_side_negotiations_enabled: bool = Field(default=False, validation_alias="ROUND2_SIDE_NEGOTIATIONS_ENABLED")
+    round2_side_negotiation_turns: int = Field(default=2, validation_alias="ROUND2_SIDE_NEGOTIATION_TURNS")
+    llm_job_workers: int = Field(default=0, validation_alias="LLM_JOB_WORKERS")
+    llm_job_poll_seconds: float = Field(default=0.5, validation_alias="LLM_JOB_POLL_SECONDS")
+    llm_job_lease_seconds: float = Field(default=300.0, validation_alias="LLM_JOB_LEASE_SECONDS")
+    llm_job_max_attempts: int = Field(default=3, validation_alias="LLM_JOB_MAX_ATTEMPTS")
+    advance_single_flight_enabled: bool = Field(default=True, validation_alias="ADVANCE_SINGLE_FLIGHT_ENABLED")
+    advance_single_flight_shared: bool = Field(default=False, validation_alias="ADVANCE_SINGLE_FLIGHT_SHARED")
+    advance_single_flight_poll_seconds: float = Field(default=0.2, validation_alias="ADVANCE_SINGLE_FLIGHT_POLL_SECONDS")
+    idempotency_key_ttl_seconds: float = Field(default=86400.0, validation_alias="IDEMPOTENCY_KEY_TTL_SECONDS")
+    game_events_keepalive_seconds: float = Field(default=15.0, validation_alias="GAME_EVENTS_KEEPALIVE_SECONDS")
+    response_compression_enabled: bool = Field(default=True, validation_alias="RESPONSE_COMPRESSION_ENABLED")
+    response_compression_min_bytes: int = Field(default=1024, validation_alias="RESPONSE_COMPRESSION_MIN_BYTES")
+    response_compression_thread_bytes: int = Field(default=65536, validation_alias="RESPONSE_COMPRESSION_THREAD_BYTES")
+    response_compression_cache_entries: int = Field(default=256, validation_alias="RESPONSE_COMPRESSION_CACHE_ENTRIES")
+    speech_library_enabled: bool = Field(default=False, validation_alias="SPEECH_LIBRARY_ENABLED")
+    llm_request_deadline_seconds: float = Field(default=60.0, validation_alias="LLM_REQUEST_DEADLINE_SECONDS")
+    llm_retry_base_delay: float = Field(default=0.5, validation_alias="LLM_RETRY_BASE_DELAY")
+    llm_retry_max_delay: float = Field(default=8.0, validation_alias="LLM_RETRY_MAX_DELAY")
+    llm_retry_budget_ratio: float = Field(default=0.2, validation_alias="LLM_RETRY_BUDGET_RATIO")
+    llm_circuit_failure_threshold: int = Field(default=5, validation_alias="LLM_CIRCUIT_FAILURE_THRESHOLD")
+    llm_circuit_reset_seconds: float = Field(default=30.0, validation_alias="LLM_CIRCUIT_RESET_SECONDS")
+    llm_fallback_provider: str | None = Field(default=None, validation_alias="LLM_FALLBACK_PROVIDER")
+    llm_routing_file: str | None = Field(default=None, validation_alias="LLM_ROUTING_FILE")
+    llm_routing_reload_seconds: float = Field(default=5.0, validation_alias="LLM_ROUTING_RELOAD_SECONDS")
+    prompt_token_budgets: Dict[str, int] = Field(default_factory=dict, validation_alias="PROMPT_TOKEN_BUDGETS")
+    llm_output_limits: Dict[str, Dict[str, Any]] = Field(default_factory=dict, validation_alias="LLM_OUTPUT_LIMITS")
+    llm_replay_file: str | None = Field(default=None, validation_alias="LLM_REPLAY_FILE")
+    llm_replay_latency_mode: str = Field(default="recorded", validation_alias="LLM_REPLAY_LATENCY_MODE")
+    llm_replay_fixed_latency_ms: int = Field(default=0, validation_alias="LLM_REPLAY_FIXED_LATENCY_MS")
+    llm_replay_latency_scale: float = Field(default=1.0, validation_alias="LLM_REPLAY_LATENCY_SCALE")
+    llm_simulated_profile: Dict[str, Any] = Field(default_factory=dict, validation_alias="LLM_SIMULATED_PROFILE")
+    llm_simulated_seed: int | None = Field(default=None, validation_alias="LLM_SIMULATED_SEED")
+    llm_hedge_enabled: bool = Field(default=False, validation_alias="LLM_HEDGE_ENABLED")
+    llm_hedge_percentile: float = Field(default=95.0, validation_alias="LLM_HEDGE_PERCENTILE")
+    llm_hedge_initial_delay: float = Field(default=2.0, validation_alias="LLM_HEDGE_INITIAL_DELAY")
+    llm_hedge_budget_ratio: float = Field(default=0.1, validation_alias="LLM_HEDGE_BUDGET_RATIO")
+    llm_reuse_cache_enabled: bool = Field(default=False, validation_alias="LLM_REUSE_CACHE_ENABLED")
+    llm_reuse_cache_granularity: float = Field(default=0.1, validation_alias="LLM_REUSE_CACHE_GRANULARITY")
+    llm_reuse_cache_max_keys: int = Field(default=1024, validation_alias="LLM_REUSE_CACHE_MAX_KEYS")
+    llm_reuse_cache_variants_per_key: int = Field(
+        default=3, validation_alias="LLM_REUSE_CACHE_VARIANTS_PER_KEY"
+    )
 
     _env_file = _default_env_file()
     model_config = SettingsConfigDict(
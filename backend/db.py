@@ -20,7 +20,8 @@ def get_engine() -> AsyncEngine:
     return _engine
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+def get_session_maker() -> async_sessionmaker[AsyncSession]:
+    """Shared session factory for code that runs outside a request (background workers, batch jobs)."""
     global _session_maker
     if _session_maker is None:
         _session_maker = async_sessionmaker(
@@ -28,8 +29,12 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             expire_on_commit=False,
             autoflush=False
         )
-    async with _session_maker() as session:
+    return _session_maker
+
+
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    async with get_session_maker()() as session:
         yield session
 
 
-__all__ = ["get_engine", "get_session", "AsyncSession"]
\ No newline at end of file
+__all__ = ["get_engine", "get_session", "get_session_maker", "AsyncSession"]
\ No newline at end of file
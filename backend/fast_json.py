@@ -0,0 +1,115 @@
+"""
+Fast JSON rendering for game state responses.
+
+Returning the `GameResponse` model from a route makes FastAPI validate the nested state dict, convert it
+with `jsonable_encoder`, and then serialize it with the stdlib encoder, on every call. These helpers
+skip that. Bodies are assembled as bytes, and the state JSON is spliced in as-is when the caller
+already has it (the string just written to `game_state`, or the column selected as `state::text`;
+asyncpg would otherwise decode jsonb into a dict).
+Otherwise it is encoded with orjson (pinned in backend/requirements.txt), or the stdlib encoder if orjson
+is missing.
+
+Run `python -m backend.fast_json` for a benchmark of both paths on a late-game state.
+"""
+
+import json
+import uuid
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=_default).encode("utf-8")
+
+
+def _raw(encoded: Union[str, bytes]) -> bytes:
+    return encoded.encode("utf-8") if isinstance(encoded, str) else encoded
+
+
+def game_response_body(game_id: Any, state: Dict[str, Any], state_json: Optional[Union[str, bytes]] = None) -> bytes:
+    """`{"game_id", "state"}` as bytes; `state_json`, when given, must be the encoding of `state`."""
+    encoded = _raw(state_json) if state_json is not None else dumps(state)
+    return b'{"game_id":' + dumps(str(game_id)) + b',"state":' + encoded + b"}"
+
+
+def object_body(fields: Dict[str, Any], raw_fields: Dict[str, Union[str, bytes]]) -> bytes:
+    """A JSON object from `fields` plus members whose values are already encoded JSON."""
+    head = dumps(fields)
+    members = b",".join(dumps(key) + b":" + _raw(value) for key, value in raw_fields.items())
+    if not members:
+        return head
+    return head[:-1] + (b"," if len(head) > 2 else b"") + members + b"}"
+
+
+def _benchmark(iterations: int) -> None:
+    import time
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from pydantic import BaseModel
+
+    from .state import COUNTRIES, ISSUES, NGOS, initial_state
+
+    state: Dict[str, Any] = initial_state("USA")
+    state["stances"] = {
+        role: {
+            issue: {"acceptance": {f"{issue}.{n}": 0.5 for n in range(1, 5)}, "firmness": 0.4, "log": ["shift"] * 6}
+            for issue in ISSUES
+        }
+        for role in COUNTRIES + NGOS
+    }
+    state["checkpoints"] = [
+        {"checkpoint_id": str(uuid.uuid4()), "created_at": "2026-01-01T00:00:00+00:00", "status": "S", "transcript_upto": None}
+        for _ in range(250)
+    ]
+    game_id = uuid.uuid4()
+    state_json = json.dumps(state)
+
+    class GameResponse(BaseModel):
+        game_id: uuid.UUID
+        state: Dict[str, Any]
+
+    def model_path() -> bytes:
+        # What a `response_model=GameResponse` route does: validate, encode, stdlib dumps.
+        validated = GameResponse.model_validate({"game_id": game_id, "state": state})
+        return JSONResponse(content=jsonable_encoder(validated.model_dump(mode="json"))).body
+
+    cases = {
+        "response_model": model_path,
+        "fast_json (encode state)": lambda: game_response_body(game_id, state),
+        "fast_json (reuse written JSON)": lambda: game_response_body(game_id, state, state_json),
+    }
+    print(f"state: {len(state_json)} bytes, encoder: {'orjson' if orjson is not None else 'json'}")
+    for name, fn in cases.items():
+        fn()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        per_call_us = (time.perf_counter() - started) / iterations * 1e6
+        print(f"{name:32s} {per_call_us:9.1f} us/request")
+
+
+__all__ = ["dumps", "game_response_body", "object_body"]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark game state response rendering.")
+    parser.add_argument("--iterations", type=int, default=500)
+    _benchmark(parser.parse_args().iterations)
+
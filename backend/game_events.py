@@ -0,0 +1,144 @@
+"""
+Cross-worker game change notifications.
+
+Every state write issues `pg_notify('game_events', {"game_id", "version", "status"})` inside its
+transaction, so Postgres delivers it only on commit. Each API worker holds one dedicated LISTEN
+connection (opened on first use) and fans the notices out in-process: SSE streams get a queue per
+subscriber, and long-poll waiters sleep on a per-game condition until the version moves past theirs.
+"""
+
+import asyncio
+import collections
+import json
+import logging
+from typing import Any, Dict, Optional, OrderedDict, Set, Tuple
+
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+GAME_EVENTS_CHANNEL = "game_events"
+
+
+def listen_dsn(database_url: str) -> str:
+    """Plain libpq DSN for asyncpg from the SQLAlchemy URL (drops the +asyncpg driver suffix)."""
+    return make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class GameEventHub:
+    """In-process fan-out of `game_events` notifications, keyed by game id."""
+
+    def __init__(self, max_tracked_games: int = 4096) -> None:
+        self.max_tracked_games = max_tracked_games
+        self._latest: OrderedDict[str, Tuple[int, Optional[str]]] = collections.OrderedDict()
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._queues: Dict[str, Set["asyncio.Queue[Dict[str, Any]]"]] = {}
+        self._conn: Any = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def listening(self) -> bool:
+        return self._conn is not None and self._loop is asyncio.get_running_loop()
+
+    async def ensure_started(self, database_url: str) -> bool:
+        """Open the LISTEN connection for this event loop if needed; False if it cannot be opened."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Connections and events are bound to one loop (tests run a loop per test).
+            self._conn = None
+            self._changed.clear()
+            self._queues.clear()
+            self._start_lock = asyncio.Lock()
+            self._loop = loop
+        if self._conn is not None:
+            return True
+        assert self._start_lock is not None
+        async with self._start_lock:
+            if self._conn is not None:
+                return True
+            try:
+                import asyncpg
+
+                conn = await asyncpg.connect(listen_dsn(database_url))
+                await conn.add_listener(GAME_EVENTS_CHANNEL, self._on_notify)
+                conn.add_termination_listener(self._on_terminated)
+            except Exception as exc:
+                logger.warning("Game events listener unavailable", extra={"error": repr(exc)})
+                return False
+            self._conn = conn
+            return True
+
+    async def stop(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                await conn.close()
+            except Exception:
+                logger.exception("Failed to close game events listener")
+
+    def _on_terminated(self, _conn: Any) -> None:
+        self._conn = None
+
+    def _on_notify(self, _conn: Any, _pid: int, _channel: str, payload: str) -> None:
+        try:
+            notice = json.loads(payload)
+            self.publish(str(notice["game_id"]), int(notice["version"]), notice.get("status"))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Malformed game_events payload", extra={"payload": payload})
+
+    def publish(self, game_id: str, version: int, status: Optional[str]) -> None:
+        current = self._latest.get(game_id)
+        if current is not None and current[0] >= version:
+            return
+        self._latest[game_id] = (version, status)
+        self._latest.move_to_end(game_id)
+        while len(self._latest) > self.max_tracked_games:
+            self._latest.popitem(last=False)
+        notice = {"game_id": game_id, "version": version, "status": status}
+        for queue in self._queues.get(game_id, ()):
+            queue.put_nowait(notice)
+        changed = self._changed.pop(game_id, None)
+        if changed is not None:
+            changed.set()
+
+    def latest_version(self, game_id: str) -> Optional[int]:
+        current = self._latest.get(game_id)
+        return current[0] if current else None
+
+    def latest_status(self, game_id: str) -> Optional[str]:
+        current = self._latest.get(game_id)
+        return current[1] if current else None
+
+    async def wait_for_version(self, game_id: str, after_version: int, timeout: float) -> Optional[int]:
+        """Sleep until a version above `after_version` is published or `timeout` passes; returns it or None."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            latest = self.latest_version(game_id)
+            if latest is not None and latest > after_version:
+                return latest
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            changed = self._changed.setdefault(game_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return None
+
+    def subscribe(self, game_id: str) -> "asyncio.Queue[Dict[str, Any]]":
+        queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self._queues.setdefault(game_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, game_id: str, queue: "asyncio.Queue[Dict[str, Any]]") -> None:
+        queues = self._queues.get(game_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._queues[game_id]
+
+
+__all__ = ["GAME_EVENTS_CHANNEL", "GameEventHub", "listen_dsn"]
@@ -0,0 +1,55 @@
+"""
+State versions for conditional reads of `GET /games/{game_id}`.
+
+Every state write bumps `game_state.version`; the version is the response ETag. A poll carrying
+`If-None-Match` costs one primary-key lookup of the version and gets 304 when unchanged. Response
+bodies are cached in-process per (game, version), so a changed version read by several clients is
+serialized only once per worker.
+"""
+
+import collections
+import uuid
+from typing import Optional, OrderedDict, Tuple
+
+
+def game_state_etag(version: int, variant: Optional[str] = None) -> str:
+    """ETag of a state version; projected representations (`variant`) get their own tag."""
+    return f'"v{version}-{variant}"' if variant else f'"v{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # Weak comparison per RFC 9110: W/"v3" matches "v3".
+    return any(candidate == "*" or candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+class GameBodyCache:
+    """Small LRU of serialized GET /games/{id} bodies, one entry (the latest seen version) per game."""
+
+    def __init__(self, max_games: int = 512) -> None:
+        self.max_games = max_games
+        self._entries: OrderedDict[uuid.UUID, Tuple[int, bytes]] = collections.OrderedDict()
+
+    def get(self, game_id: uuid.UUID, version: int) -> Optional[bytes]:
+        entry = self._entries.get(game_id)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(game_id)
+        return entry[1]
+
+    def put(self, game_id: uuid.UUID, version: int, body: bytes) -> None:
+        current = self._entries.get(game_id)
+        if current is not None and current[0] > version:
+            return
+        self._entries[game_id] = (version, body)
+        self._entries.move_to_end(game_id)
+        while len(self._entries) > self.max_games:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+__all__ = ["GameBodyCache", "etag_matches", "game_state_etag"]
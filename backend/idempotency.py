@@ -0,0 +1,156 @@
+"""
+Idempotency keys for `POST /games/{id}/advance`.
+
+A client that sends `Idempotency-Key: <key>` gets the same response for every retry of that key
+(per game) within IDEMPOTENCY_KEY_TTL_SECONDS. The first request claims the key, runs, and stores
+its status and gzip-compressed JSON body in `idempotency_keys`. Retries replay the stored
+response without reading game state or calling the provider. Server errors, timeouts, and
+client disconnects release the key so that a retry runs again.
+"""
+
+import gzip
+import hashlib
+import json
+import uuid
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+def idempotency_request_hash(
+    event: str,
+    payload: Dict[str, Any],
+    async_job: bool,
+    delta: bool = False,
+    since: Optional[int] = None,
+    projection: Optional[str] = None,
+) -> str:
+    """Hash of what determines the response; delta responses also depend on the client's base version."""
+    fields: Dict[str, Any] = {"event": event, "payload": payload or {}, "async": bool(async_job)}
+    if delta:
+        fields["delta_since"] = since
+    if projection is not None:
+        fields["projection"] = projection
+    canonical = json.dumps(
+        fields,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def should_store_response(status_code: int) -> bool:
+    """Final outcomes are stored; server errors and cancellations (499) stay retryable."""
+    return status_code < 500 and status_code != 499
+
+
+def compress_body(body: Any) -> bytes:
+    return gzip.compress(json.dumps(body, separators=(",", ":")).encode("utf-8"))
+
+
+def decompress_body(data: bytes) -> bytes:
+    return gzip.decompress(bytes(data))
+
+
+async def claim_idempotency_key(
+    session: AsyncSession,
+    game_id: uuid.UUID,
+    key: str,
+    request_hash: str,
+    ttl_seconds: float,
+) -> Optional[Dict[str, Any]]:
+    """
+    Claim `key` for this request. Returns None when the caller now owns the key, otherwise the existing
+    record (`request_hash`, `status`, `response_status`, `response_body`). Expired keys are replaced.
+    """
+    await session.execute(
+        text("DELETE FROM idempotency_keys WHERE game_id = :game_id AND idempotency_key = :key AND expires_at < now()"),
+        {"game_id": str(game_id), "key": key},
+    )
+    inserted = await session.execute(
+        text(
+            """
+            INSERT INTO idempotency_keys (game_id, idempotency_key, request_hash, expires_at)
+            VALUES (:game_id, :key, :request_hash, now() + make_interval(secs => :ttl_seconds))
+            ON CONFLICT (game_id, idempotency_key) DO NOTHING
+            RETURNING idempotency_key
+            """
+        ),
+        {"game_id": str(game_id), "key": key, "request_hash": request_hash, "ttl_seconds": float(ttl_seconds)},
+    )
+    if inserted.first() is not None:
+        return None
+    existing = await session.execute(
+        text(
+            """
+            SELECT request_hash, status, response_status, response_body
+            FROM idempotency_keys
+            WHERE game_id = :game_id AND idempotency_key = :key
+            """
+        ),
+        {"game_id": str(game_id), "key": key},
+    )
+    row = existing.mappings().first()
+    return dict(row) if row else None
+
+
+async def store_idempotent_response(
+    session: AsyncSession,
+    game_id: uuid.UUID,
+    key: str,
+    status_code: int,
+    body: Any,
+) -> None:
+    await session.execute(
+        text(
+            """
+            UPDATE idempotency_keys
+            SET status = 'done', response_status = :status_code, response_body = :response_body
+            WHERE game_id = :game_id AND idempotency_key = :key
+            """
+        ),
+        {"game_id": str(game_id), "key": key, "status_code": status_code, "response_body": compress_body(body)},
+    )
+
+
+async def release_idempotency_key(session: AsyncSession, game_id: uuid.UUID, key: str) -> None:
+    await session.execute(
+        text(
+            "DELETE FROM idempotency_keys WHERE game_id = :game_id AND idempotency_key = :key AND status = 'running'"
+        ),
+        {"game_id": str(game_id), "key": key},
+    )
+
+
+async def purge_expired_idempotency_keys(session: AsyncSession, limit: int = 1000) -> int:
+    result = await session.execute(
+        text(
+            """
+            DELETE FROM idempotency_keys
+            WHERE ctid IN (SELECT ctid FROM idempotency_keys WHERE expires_at < now() LIMIT :limit)
+            """
+        ),
+        {"limit": limit},
+    )
+    return int(result.rowcount or 0)
+
+
+__all__ = [
+    "IDEMPOTENCY_HEADER",
+    "IDEMPOTENCY_KEY_MAX_LENGTH",
+    "IDEMPOTENCY_REPLAYED_HEADER",
+    "claim_idempotency_key",
+    "compress_body",
+    "decompress_body",
+    "idempotency_request_hash",
+    "purge_expired_idempotency_keys",
+    "release_idempotency_key",
+    "should_store_response",
+    "store_idempotent_response",
+]
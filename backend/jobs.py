@@ -0,0 +1,324 @@
+"""
+Background LLM job queue backed by the `llm_jobs` table.
+
+API handlers enqueue a job and return 202; workers claim jobs with `FOR UPDATE SKIP LOCKED`, run the
+registered handler for the job's kind, and write the result back. Jobs for the same game run one at a
+time in creation order. Workers can run inside the API process (`LLM_JOB_WORKERS`) or on their own:
+    python -m backend.jobs --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUS_QUEUED = "queued"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_SUCCEEDED = "succeeded"
+JOB_STATUS_FAILED = "failed"
+
+# A handler runs one job in its own session and returns (http status, JSON-able body).
+JobHandler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[Tuple[int, Any]]]
+
+
+def _json_column(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+async def enqueue_llm_job(
+    session: AsyncSession,
+    game_id: uuid.UUID,
+    kind: str,
+    payload: Dict[str, Any],
+    max_attempts: int = 3,
+) -> uuid.UUID:
+    result = await session.execute(
+        text(
+            """
+            INSERT INTO llm_jobs (game_id, kind, payload, max_attempts)
+            VALUES (:game_id, :kind, CAST(:payload AS JSONB), :max_attempts)
+            RETURNING id
+            """
+        ),
+        {"game_id": str(game_id), "kind": kind, "payload": json.dumps(payload), "max_attempts": max_attempts},
+    )
+    return uuid.UUID(str(result.scalar_one()))
+
+
+async def fetch_llm_job(session: AsyncSession, job_id: uuid.UUID) -> Optional[Dict[str, Any]]:
+    result = await session.execute(
+        text(
+            """
+            SELECT id, game_id, kind, status, result_status, result, error, attempts, max_attempts,
+                   created_at, updated_at
+            FROM llm_jobs
+            WHERE id = :id
+            """
+        ),
+        {"id": str(job_id)},
+    )
+    row = result.mappings().first()
+    if not row:
+        return None
+    return {
+        "job_id": str(row["id"]),
+        "game_id": str(row["game_id"]),
+        "kind": row["kind"],
+        "status": row["status"],
+        "result_status": row["result_status"],
+        "result": _json_column(row["result"]),
+        "error": _json_column(row["error"]),
+        "attempts": row["attempts"],
+        "max_attempts": row["max_attempts"],
+        "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+        "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
+    }
+
+
+async def claim_llm_job(session: AsyncSession, worker_id: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+    """
+    Claim the oldest runnable job. Running jobs whose lease expired (crashed worker) are reclaimed;
+    a job is skipped while an older unfinished job exists for the same game. The first claim records the
+    game's state version as `start_version`; retries keep it.
+    """
+    result = await session.execute(
+        text(
+            """
+            WITH next_job AS (
+              SELECT j.id
+              FROM llm_jobs j
+              WHERE (
+                  (j.status = 'queued' AND j.available_at <= now())
+                  OR (j.status = 'running' AND j.locked_at < now() - make_interval(secs => :lease_seconds))
+                )
+                AND NOT EXISTS (
+                  SELECT 1 FROM llm_jobs e
+                  WHERE e.game_id = j.game_id
+                    AND e.created_at < j.created_at
+                    AND e.status IN ('queued', 'running')
+                )
+              ORDER BY j.created_at
+              FOR UPDATE SKIP LOCKED
+              LIMIT 1
+            )
+            UPDATE llm_jobs
+            SET status = 'running', locked_by = :worker_id, locked_at = now(),
+                attempts = llm_jobs.attempts + 1, updated_at = now(),
+                start_version = COALESCE(
+                  llm_jobs.start_version,
+                  (SELECT gs.version FROM game_state gs WHERE gs.game_id = llm_jobs.game_id)
+                )
+            FROM next_job
+            WHERE llm_jobs.id = next_job.id
+            RETURNING llm_jobs.id, llm_jobs.game_id, llm_jobs.kind, llm_jobs.payload,
+                      llm_jobs.attempts, llm_jobs.max_attempts, llm_jobs.start_version
+            """
+        ),
+        {"worker_id": worker_id, "lease_seconds": float(lease_seconds)},
+    )
+    row = result.mappings().first()
+    if not row:
+        return None
+    return {
+        "id": uuid.UUID(str(row["id"])),
+        "game_id": uuid.UUID(str(row["game_id"])),
+        "kind": row["kind"],
+        "payload": _json_column(row["payload"]) or {},
+        "attempts": row["attempts"],
+        "max_attempts": row["max_attempts"],
+        "start_version": int(row["start_version"]) if row["start_version"] is not None else None,
+    }
+
+
+async def finish_llm_job(
+    session: AsyncSession,
+    job_id: uuid.UUID,
+    status: str,
+    result_status: Optional[int],
+    result: Any = None,
+    error: Any = None,
+) -> None:
+    await session.execute(
+        text(
+            """
+            UPDATE llm_jobs
+            SET status = :status, result_status = :result_status,
+                result = CAST(:result AS JSONB), error = CAST(:error AS JSONB),
+                locked_by = NULL, locked_at = NULL, updated_at = now()
+            WHERE id = :id
+            """
+        ),
+        {
+            "id": str(job_id),
+            "status": status,
+            "result_status": result_status,
+            "result": json.dumps(result) if result is not None else None,
+            "error": json.dumps(error) if error is not None else None,
+        },
+    )
+
+
+async def requeue_llm_job(session: AsyncSession, job_id: uuid.UUID, delay_seconds: float, error: Any) -> None:
+    await session.execute(
+        text(
+            """
+            UPDATE llm_jobs
+            SET status = 'queued', error = CAST(:error AS JSONB), locked_by = NULL, locked_at = NULL,
+                available_at = now() + make_interval(secs => :delay_seconds), updated_at = now()
+            WHERE id = :id
+            """
+        ),
+        {"id": str(job_id), "delay_seconds": float(delay_seconds), "error": json.dumps(error)},
+    )
+
+
+class LLMJobWorkerPool:
+    """
+    `concurrency` asyncio workers polling `llm_jobs`. Handler responses below 400 mark the job succeeded,
+    other responses mark it failed; an exception is retried with linear backoff until `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        handlers: Dict[str, JobHandler],
+        *,
+        concurrency: int = 2,
+        poll_interval: float = 0.5,
+        lease_seconds: float = 300.0,
+        retry_delay: float = 2.0,
+        name: Optional[str] = None,
+    ) -> None:
+        self._session_maker = session_maker
+        self._handlers = dict(handlers)
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.retry_delay = retry_delay
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._stopping = asyncio.Event()
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(f"{self.name}:{index}")) for index in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_once(self, worker_id: str) -> bool:
+        """Claim and run at most one job; returns False when the queue had nothing runnable."""
+        async with self._session_maker() as session:
+            async with session.begin():
+                job = await claim_llm_job(session, worker_id, self.lease_seconds)
+        if job is None:
+            return False
+
+        handler = self._handlers.get(job["kind"])
+        try:
+            if handler is None:
+                status_code, body = 400, {"detail": f"Unknown job kind {job['kind']!r}"}
+            else:
+                async with self._session_maker() as session:
+                    status_code, body = await handler(session, job)
+        except Exception as exc:
+            error = {"type": exc.__class__.__name__, "message": str(exc), "attempt": job["attempts"]}
+            logger.warning("LLM job failed", extra={"job_id": str(job["id"]), "kind": job["kind"], **error})
+            async with self._session_maker() as session:
+                async with session.begin():
+                    if job["attempts"] >= job["max_attempts"]:
+                        await finish_llm_job(session, job["id"], JOB_STATUS_FAILED, None, error=error)
+                    else:
+                        await requeue_llm_job(session, job["id"], self.retry_delay * job["attempts"], error)
+            return True
+
+        async with self._session_maker() as session:
+            async with session.begin():
+                if status_code < 400:
+                    await finish_llm_job(session, job["id"], JOB_STATUS_SUCCEEDED, status_code, result=body)
+                else:
+                    await finish_llm_job(session, job["id"], JOB_STATUS_FAILED, status_code, error=body)
+        return True
+
+    async def _worker_loop(self, worker_id: str) -> None:
+        while not self._stopping.is_set():
+            try:
+                ran = await self.run_once(worker_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("LLM job worker error", extra={"worker_id": worker_id})
+                ran = False
+            if not ran:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+
+async def _main(argv: Optional[List[str]] = None) -> None:
+    from .config import get_settings
+    from .db import get_session_maker
+    from .main import default_job_handlers
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run LLM job workers against llm_jobs.")
+    parser.add_argument("--workers", type=int, default=max(1, settings.llm_job_workers))
+    args = parser.parse_args(argv)
+
+    pool = LLMJobWorkerPool(
+        get_session_maker(),
+        default_job_handlers(),
+        concurrency=args.workers,
+        poll_interval=settings.llm_job_poll_seconds,
+        lease_seconds=settings.llm_job_lease_seconds,
+    )
+    pool.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await pool.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
+
+
+__all__ = [
+    "JOB_STATUS_QUEUED",
+    "JOB_STATUS_RUNNING",
+    "JOB_STATUS_SUCCEEDED",
+    "JOB_STATUS_FAILED",
+    "LLMJobWorkerPool",
+    "claim_llm_job",
+    "enqueue_llm_job",
+    "fetch_llm_job",
+    "finish_llm_job",
+    "requeue_llm_job",
+]
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+import collections
+import hashlib
+import inspect
+import json
 import logging
+import math
 import os
-import inspect
-from typing import Any, Dict, Optional, Protocol, TypedDict
+import random
+import re
+import time
+from pathlib import Path
+from typing import Any, AsyncContextManager, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Protocol, Tuple, TypedDict
 
 from .ai import AIResponder, FakeLLM
 from .config import get_settings
+from .prompt_builder import ROUND2_PROMPT_VERSION
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +25,31 @@ class ValidationError(Exception):
     """Raised when an LLM response fails basic structure validation."""
 
 
+class LLMCallError(RuntimeError):
+    """Raised when a provider call fails after retries; carries the structured error class."""
+
+    def __init__(self, message: str, *, error_class: str, attempts: int) -> None:
+        super().__init__(message)
+        self.error_class = error_class
+        self.attempts = attempts
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the provider circuit is open and no fallback provider is configured."""
+
+
+CANCEL_REASON_CLIENT_DISCONNECTED = "client_disconnected"
+CANCEL_REASON_DEADLINE_EXCEEDED = "deadline_exceeded"
+
+
+class LLMCancelledError(Exception):
+    """Raised when an in-flight generation is abandoned (client went away or the request deadline passed)."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(f"LLM generation cancelled: {reason}")
+        self.reason = reason
+
+
 class LLMRequest(TypedDict, total=False):
     game_id: str
     role_id: str
@@ -24,6 +59,12 @@ class LLMRequest(TypedDict, total=False):
     conversation_context: Any
     game_state_excerpt: Dict[str, Any]
     request_payload: Dict[str, Any]
+    # Absolute time.monotonic() deadline for the whole call, retries included.
+    deadline: float
+    # Output length controls; see DEFAULT_OUTPUT_LIMITS / apply_output_limits.
+    max_output_tokens: int
+    stop: List[str]
+    target_words: int
 
 
 class LLMResponse(TypedDict, total=False):
@@ -44,18 +85,376 @@ class LLMProvider(Protocol):
         ...
 
 
+def remaining_seconds(request: LLMRequest) -> Optional[float]:
+    deadline = request.get("deadline")
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+async def generate_with_cancellation(
+    provider: LLMProvider,
+    request: LLMRequest,
+    *,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    poll_interval: float = 0.25,
+    limiter: Optional[AsyncContextManager[Any]] = None,
+) -> LLMResponse:
+    """
+    Run provider.generate as a task that is cancelled when the request deadline passes or
+    `is_disconnected()` reports the client has gone away; raises LLMCancelledError in both cases.
+    Waiting for a `limiter` slot happens inside the task, so it counts against the deadline too.
+    """
+
+    async def call() -> LLMResponse:
+        if limiter is None:
+            return await provider.generate(request)
+        async with limiter:
+            return await provider.generate(request)
+
+    task = asyncio.ensure_future(call())
+    try:
+        while True:
+            timeout = poll_interval if is_disconnected is not None else None
+            remaining = remaining_seconds(request)
+            if remaining is not None:
+                if remaining <= 0:
+                    raise LLMCancelledError(CANCEL_REASON_DEADLINE_EXCEEDED)
+                timeout = remaining if timeout is None else min(timeout, remaining)
+            done, _ = await asyncio.wait({task}, timeout=timeout)
+            if done:
+                return task.result()
+            if is_disconnected is not None and await is_disconnected():
+                raise LLMCancelledError(CANCEL_REASON_CLIENT_DISCONNECTED)
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
 def validate_llm_response(resp: Any) -> LLMResponse:
     if not isinstance(resp, dict):
         raise ValidationError("LLM response must be a dict")
     text = resp.get("assistant_text")
     if not isinstance(text, str):
         raise ValidationError("assistant_text must be a string")
+    if not text.strip():
+        raise ValidationError("assistant_text is empty")
     meta = resp.get("metadata")
     if meta is not None and not isinstance(meta, dict):
         raise ValidationError("metadata must be a dict or None")
     return {"assistant_text": text, "metadata": meta}
 
 
+DEFAULT_OUTPUT_LIMITS: Dict[str, Dict[str, Any]] = {
+    ROUND2_PROMPT_VERSION: {"max_output_tokens": 800, "target_words": 120, "stop": ["\n\nHuman message:"]},
+    "r3_debate_speech_v1": {"max_output_tokens": 1200, "target_words": 180, "stop": ["\n\nSpeech:", "\n\nContext:"]},
+}
+# Hard cap applied after generation, relative to target_words, for providers that overrun the target.
+OUTPUT_WORD_OVERSHOOT = 1.5
+_OUTPUT_LIMIT_KEYS = ("max_output_tokens", "stop", "target_words")
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]?(?=\s|$)")
+
+
+def output_limits_for(prompt_version: str, overrides: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    limits = dict(DEFAULT_OUTPUT_LIMITS.get(prompt_version, {}))
+    if overrides and isinstance(overrides.get(prompt_version), dict):
+        limits.update(overrides[prompt_version])
+    return {key: value for key, value in limits.items() if key in _OUTPUT_LIMIT_KEYS and value not in (None, 0)}
+
+
+def apply_output_limits(request: LLMRequest) -> LLMRequest:
+    """Fill missing output limits on the request from the per-prompt_version defaults and LLM_OUTPUT_LIMITS."""
+    limits = output_limits_for(request.get("prompt_version") or "", get_settings().llm_output_limits)
+    for key, value in limits.items():
+        request.setdefault(key, value)  # type: ignore[misc]
+    return request
+
+
+def output_word_cap(request: LLMRequest) -> Optional[int]:
+    target = request.get("target_words")
+    if not isinstance(target, int) or target <= 0:
+        return None
+    return int(target * OUTPUT_WORD_OVERSHOOT)
+
+
+def truncate_output(text: str, request: LLMRequest) -> Tuple[str, bool]:
+    """
+    Enforce stop sequences and the word cap on generated text.
+    Word-capped text is cut back to the last sentence end when one falls in the second half of the cut.
+    """
+    result = text
+    for stop in request.get("stop") or []:
+        if stop and stop in result:
+            result = result[: result.index(stop)]
+    cap = output_word_cap(request)
+    if cap is not None:
+        words = list(re.finditer(r"\S+", result))
+        if len(words) > cap:
+            cut = result[: words[cap - 1].end()]
+            ends = [match.end() for match in _SENTENCE_END.finditer(cut)]
+            if ends and ends[-1] >= len(cut) // 2:
+                cut = cut[: ends[-1]]
+            result = cut
+    result = result.rstrip()
+    return result, result != text.rstrip()
+
+
+def output_limit_reached(text: str, request: LLMRequest) -> bool:
+    """True once streamed text has hit a stop sequence or run past the word cap."""
+    if any(stop and stop in text for stop in request.get("stop") or []):
+        return True
+    cap = output_word_cap(request)
+    return cap is not None and len(text.split()) > cap
+
+
+ERROR_CLASS_RATE_LIMIT = "rate_limit"
+ERROR_CLASS_TIMEOUT = "timeout"
+ERROR_CLASS_CONNECTION = "connection"
+ERROR_CLASS_SERVER = "server"
+ERROR_CLASS_CLIENT = "client"
+ERROR_CLASS_UNKNOWN = "unknown"
+RETRYABLE_ERROR_CLASSES = frozenset(
+    {ERROR_CLASS_RATE_LIMIT, ERROR_CLASS_TIMEOUT, ERROR_CLASS_CONNECTION, ERROR_CLASS_SERVER}
+)
+
+_ERROR_CLASS_BY_EXCEPTION_NAME = {
+    "RateLimitError": ERROR_CLASS_RATE_LIMIT,
+    "APITimeoutError": ERROR_CLASS_TIMEOUT,
+    "TimeoutException": ERROR_CLASS_TIMEOUT,
+    "ReadTimeout": ERROR_CLASS_TIMEOUT,
+    "ConnectTimeout": ERROR_CLASS_TIMEOUT,
+    "APIConnectionError": ERROR_CLASS_CONNECTION,
+    "ConnectError": ERROR_CLASS_CONNECTION,
+    "InternalServerError": ERROR_CLASS_SERVER,
+    "ServiceUnavailableError": ERROR_CLASS_SERVER,
+    "BadRequestError": ERROR_CLASS_CLIENT,
+    "AuthenticationError": ERROR_CLASS_CLIENT,
+    "PermissionDeniedError": ERROR_CLASS_CLIENT,
+    "NotFoundError": ERROR_CLASS_CLIENT,
+    "UnprocessableEntityError": ERROR_CLASS_CLIENT,
+}
+
+
+def classify_llm_error(exc: BaseException) -> str:
+    """
+    Map a provider exception to a structured error class.
+    Matches on exception type names and HTTP status codes so the openai SDK stays an optional import.
+    """
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError)):
+        return ERROR_CLASS_TIMEOUT
+    if isinstance(exc, ConnectionError):
+        return ERROR_CLASS_CONNECTION
+    for cls in type(exc).__mro__:
+        error_class = _ERROR_CLASS_BY_EXCEPTION_NAME.get(cls.__name__)
+        if error_class:
+            return error_class
+    status_code = getattr(exc, "status_code", None)
+    if isinstance(status_code, int):
+        if status_code == 429:
+            return ERROR_CLASS_RATE_LIMIT
+        if status_code in (408, 504):
+            return ERROR_CLASS_TIMEOUT
+        if status_code >= 500:
+            return ERROR_CLASS_SERVER
+        if 400 <= status_code < 500:
+            return ERROR_CLASS_CLIENT
+    return ERROR_CLASS_UNKNOWN
+
+
+def backoff_delay(
+    attempt: int,
+    *,
+    base_delay: float,
+    max_delay: float,
+    retry_after: Optional[float] = None,
+    rng: Optional[random.Random] = None,
+) -> float:
+    """Exponential backoff with full jitter; a server-provided Retry-After acts as a floor."""
+    ceiling = min(max_delay, base_delay * (2**attempt))
+    delay = (rng or random).uniform(0.0, ceiling)
+    if retry_after is not None and retry_after > delay:
+        delay = min(retry_after, max_delay)
+    return delay
+
+
+def _retry_after_seconds(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    try:
+        value = headers.get("retry-after")
+    except Exception:
+        return None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryBudget:
+    """
+    Sliding-window retry budget: retries may not exceed `ratio` of recent requests
+    (with a small floor), so a provider brownout cannot multiply outbound traffic.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_retries: int = 3,
+        window_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._requests: Deque[float] = collections.deque()
+        self._retries: Deque[float] = collections.deque()
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._requests and self._requests[0] < cutoff:
+            self._requests.popleft()
+        while self._retries and self._retries[0] < cutoff:
+            self._retries.popleft()
+
+    def record_request(self) -> None:
+        now = self._clock()
+        self._prune(now)
+        self._requests.append(now)
+
+    def try_acquire_retry(self) -> bool:
+        now = self._clock()
+        self._prune(now)
+        allowed = max(self.min_retries, int(len(self._requests) * self.ratio))
+        if len(self._retries) >= allowed:
+            return False
+        self._retries.append(now)
+        return True
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+    closed -> open after `failure_threshold` failures; open -> half_open after `reset_timeout`
+    seconds, letting one trial call through; the trial's outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._trial_in_flight = False
+
+    def record_cancelled(self) -> None:
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+        self._trial_in_flight = False
+
+
+_PROCESS_RETRY_BUDGET = RetryBudget()
+
+
+def _process_retry_budget(ratio: float) -> RetryBudget:
+    """The one retry budget shared by every OpenAI provider in the process (one per routed model)."""
+    _PROCESS_RETRY_BUDGET.ratio = ratio
+    return _PROCESS_RETRY_BUDGET
+class _LimiterLane:
+    """Reusable async context manager holding one slot of each semaphore, acquired in order."""
+
+    def __init__(self, *semaphores: asyncio.Semaphore) -> None:
+        self._semaphores = semaphores
+
+    async def __aenter__(self) -> None:
+        acquired: List[asyncio.Semaphore] = []
+        try:
+            for semaphore in self._semaphores:
+                await semaphore.acquire()
+                acquired.append(semaphore)
+        except BaseException:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+            raise
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        for semaphore in reversed(self._semaphores):
+            semaphore.release()
+
+
+class LLMConcurrencyLimiter:
+    """
+    `limit` in-flight LLM calls per process, of which background work (side negotiations) may hold at
+    most `background_limit`. The remaining slots are reserved for request-driven calls, so a player's
+    turn never queues behind background calls, only behind other request-driven ones.
+    """
+
+    def __init__(self, limit: int, background_limit: int) -> None:
+        self.limit = max(1, limit)
+        self.background_limit = max(1, min(background_limit, self.limit - 1))
+        self._slots = asyncio.Semaphore(self.limit)
+        self._background_slots = asyncio.Semaphore(self.background_limit)
+        self.foreground = _LimiterLane(self._slots)
+        self.background = _LimiterLane(self._background_slots, self._slots)
+
+
+_LLM_CONCURRENCY: Optional[LLMConcurrencyLimiter] = None
+
+
+def llm_concurrency_limiter() -> LLMConcurrencyLimiter:
+    """Process-wide limiter (LLM_MAX_CONCURRENCY, of which LLM_BACKGROUND_MAX_CONCURRENCY for background calls)."""
+    global _LLM_CONCURRENCY
+    if _LLM_CONCURRENCY is None:
+        settings = get_settings()
+        _LLM_CONCURRENCY = LLMConcurrencyLimiter(settings.llm_max_concurrency, settings.llm_background_max_concurrency)
+    return _LLM_CONCURRENCY
+
+
 class FakeLLMProvider:
     def __init__(self, responder: Optional[AIResponder] = None) -> None:
         self._responder = responder or FakeLLM()
@@ -76,6 +475,76 @@ class FakeLLMProvider:
         return {"assistant_text": assistant_text, "metadata": None}
 
 
+CANNED_RESPONSES: Dict[str, str] = {
+    ROUND2_PROMPT_VERSION: (
+        "Thank you. Our delegation needs a moment to consult before responding in detail. "
+        "Could you say more about which option matters most to you?"
+    ),
+    "r3_debate_speech_v1": (
+        "Our delegation stands by the position set out in our opening statement "
+        "and remains open to constructive proposals on this issue."
+    ),
+}
+DEFAULT_CANNED_RESPONSE = "Our delegation has noted your remarks and will respond shortly."
+
+
+class CannedLLMProvider:
+    """Deterministic fallback that returns a neutral canned line per prompt_version."""
+
+    def __init__(self, responses: Optional[Dict[str, str]] = None) -> None:
+        self._responses = dict(CANNED_RESPONSES if responses is None else responses)
+        self._provider_name = "canned"
+        self._model_name: Optional[str] = "canned"
+
+    @property
+    def provider_name(self) -> str:
+        return self._provider_name
+
+    @property
+    def model_name(self) -> Optional[str]:
+        return self._model_name
+
+    async def generate(self, request: LLMRequest) -> LLMResponse:
+        prompt_version = request.get("prompt_version") or ""
+        assistant_text, _ = truncate_output(self._responses.get(prompt_version, DEFAULT_CANNED_RESPONSE), request)
+        return {"assistant_text": assistant_text, "metadata": None}
+
+
+def _build_fallback_provider(choice: Optional[str], app_state: Any) -> Optional[LLMProvider]:
+    normalized = (choice or "").strip().lower()
+    if normalized == "fake":
+        responder = getattr(app_state, "ai_responder", None) or FakeLLM()
+        return FakeLLMProvider(responder)
+    if normalized == "canned":
+        return CannedLLMProvider()
+    return None
+
+
+def _build_openai_provider(settings: Any, app_state: Any, model_name: str) -> "OpenAIProvider":
+    return OpenAIProvider(
+        api_key=settings.openai_api_key,
+        model=model_name,
+        retry_base_delay=settings.llm_retry_base_delay,
+        retry_max_delay=settings.llm_retry_max_delay,
+        retry_budget=_process_retry_budget(settings.llm_retry_budget_ratio),
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=settings.llm_circuit_failure_threshold,
+            reset_timeout=settings.llm_circuit_reset_seconds,
+        ),
+        fallback=_build_fallback_provider(settings.llm_fallback_provider, app_state),
+        reasoning_effort=settings.openai_reasoning_effort if is_reasoning_model(model_name) else None,
+    )
+
+
+def _build_route_target_provider(target: Dict[str, Any], settings: Any, app_state: Any) -> Optional[LLMProvider]:
+    name = str(target.get("provider") or "").strip().lower()
+    if name == "openai":
+        if not settings.openai_api_key:
+            return None
+        return _build_openai_provider(settings, app_state, target.get("model") or DEFAULT_OPENAI_MODEL)
+    return _build_fallback_provider(name, app_state)
+
+
 def get_llm_provider(app_state: Any) -> LLMProvider:
     existing = getattr(app_state, "llm_provider", None)
     if existing:
@@ -92,12 +561,51 @@ def get_llm_provider(app_state: Any) -> LLMProvider:
         provider = FakeLLMProvider(responder)
     else:
         provider_choice = (settings.llm_provider or "").lower()
-        if provider_choice == "openai" and settings.openai_api_key:
-            model_name = settings.openai_model or DEFAULT_OPENAI_MODEL
-            provider = OpenAIProvider(api_key=settings.openai_api_key, model=model_name)
+        if settings.llm_routing_file:
+            provider = RoutedLLMProvider(
+                ModelRouter(path=settings.llm_routing_file, reload_interval=settings.llm_routing_reload_seconds),
+                lambda target: _build_route_target_provider(target, settings, app_state),
+            )
+        elif provider_choice == "openai" and settings.openai_api_key:
+            provider = _build_openai_provider(settings, app_state, settings.openai_model or DEFAULT_OPENAI_MODEL)
+        elif provider_choice == "replay" and settings.llm_replay_file:
+            provider = ReplayLLMProvider(
+                latency_mode=settings.llm_replay_latency_mode,
+                fixed_latency_ms=settings.llm_replay_fixed_latency_ms,
+                latency_scale=settings.llm_replay_latency_scale,
+            )
+            provider.load_export(settings.llm_replay_file)
+        elif provider_choice == "simulated":
+            provider = ResilientLLMProvider(
+                SimulatedLLMProvider(settings.llm_simulated_profile, seed=settings.llm_simulated_seed),
+                retry_base_delay=settings.llm_retry_base_delay,
+                retry_max_delay=settings.llm_retry_max_delay,
+                retry_budget=_process_retry_budget(settings.llm_retry_budget_ratio),
+                circuit_breaker=CircuitBreaker(
+                    failure_threshold=settings.llm_circuit_failure_threshold,
+                    reset_timeout=settings.llm_circuit_reset_seconds,
+                ),
+                fallback=_build_fallback_provider(settings.llm_fallback_provider, app_state),
+            )
         else:
             responder = getattr(app_state, "ai_responder", None) or FakeLLM()
             provider = FakeLLMProvider(responder)
+        if settings.llm_hedge_enabled:
+            provider = HedgedLLMProvider(
+                provider,
+                percentile=settings.llm_hedge_percentile,
+                initial_delay=settings.llm_hedge_initial_delay,
+                hedge_budget=RetryBudget(ratio=settings.llm_hedge_budget_ratio, min_retries=1),
+            )
+        if settings.llm_reuse_cache_enabled:
+            provider = ReusingLLMProvider(
+                provider,
+                SpeechReuseCache(
+                    max_keys=settings.llm_reuse_cache_max_keys,
+                    variants_per_key=settings.llm_reuse_cache_variants_per_key,
+                    granularity=settings.llm_reuse_cache_granularity,
+                ),
+            )
 
     if settings.app_env == "local":
         logger.info(
@@ -115,16 +623,199 @@ def get_llm_provider(app_state: Any) -> LLMProvider:
 
 
 DEFAULT_OPENAI_MODEL = "gpt-5-nano"
+# Models that spend output tokens on hidden reasoning before any text; they are sent a reasoning effort.
+REASONING_MODEL_PREFIXES: Tuple[str, ...] = ("gpt-5", "o1", "o3", "o4")
+
+
+def is_reasoning_model(model: str) -> bool:
+    return model.startswith(REASONING_MODEL_PREFIXES) and not model.startswith("gpt-5-chat")
+
+
+def _incomplete_error(reason: Any, limits: LLMRequest) -> ValidationError:
+    detail = getattr(reason, "reason", reason) or "unknown"
+    return ValidationError(
+        f"OpenAI response was incomplete ({detail}) before any output text"
+        f" (max_output_tokens={limits.get('max_output_tokens')}); a reasoning model may have spent the cap"
+        " on reasoning. Raise the cap in LLM_OUTPUT_LIMITS or lower OPENAI_REASONING_EFFORT."
+    )
+
+
+async def generate_resilient(
+    attempt: Callable[[], Awaitable[LLMResponse]],
+    request: LLMRequest,
+    *,
+    label: str,
+    provider_name: str,
+    max_retries: int,
+    retry_base_delay: float,
+    retry_max_delay: float,
+    retry_budget: RetryBudget,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    fallback: Optional[LLMProvider] = None,
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+) -> LLMResponse:
+    """
+    Run `attempt` under the retry policy and circuit breaker: classified availability errors are retried
+    with backoff inside the request deadline and the retry budget, and count against the circuit.
+    """
+    breaker = circuit_breaker
+    if breaker is not None and not breaker.allow():
+        return await _generate_while_open(request, label, provider_name, fallback)
+
+    retry_budget.record_request()
+    last_error: Optional[Exception] = None
+    error_class = ERROR_CLASS_UNKNOWN
+    attempts = 0
+    while True:
+        try:
+            response = await attempt()
+        except ValidationError:
+            # The provider answered; an empty body is a content problem, not an outage.
+            if breaker is not None:
+                breaker.record_success()
+            raise
+        except asyncio.CancelledError:
+            if breaker is not None:
+                breaker.record_cancelled()
+            raise
+        except Exception as exc:
+            last_error = exc
+            error_class = classify_llm_error(exc)
+            if (
+                attempts >= max_retries
+                or error_class not in RETRYABLE_ERROR_CLASSES
+                or not retry_budget.try_acquire_retry()
+            ):
+                break
+            delay = backoff_delay(
+                attempts,
+                base_delay=retry_base_delay,
+                max_delay=retry_max_delay,
+                retry_after=_retry_after_seconds(exc),
+            )
+            remaining = remaining_seconds(request)
+            if remaining is not None and delay >= remaining:
+                break
+            attempts += 1
+            await sleep(delay)
+            continue
+        if breaker is not None:
+            breaker.record_success()
+        metadata = dict(response.get("metadata") or {})
+        metadata["attempts"] = attempts + 1
+        return {"assistant_text": response["assistant_text"], "metadata": metadata}
+
+    if breaker is not None:
+        # Only availability failures count against the circuit; a rejected request proves the provider is up.
+        if error_class in RETRYABLE_ERROR_CLASSES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+    message = f"{label} call failed: {last_error}" if last_error else f"{label} call failed"
+    raise LLMCallError(message, error_class=error_class, attempts=attempts + 1)
+
+
+async def _generate_while_open(
+    request: LLMRequest, label: str, provider_name: str, fallback: Optional[LLMProvider]
+) -> LLMResponse:
+    if fallback is None:
+        raise CircuitOpenError(f"{label} circuit is open; failing fast")
+    response = validate_llm_response(await fallback.generate(request))
+    metadata = dict(response.get("metadata") or {})
+    metadata.update(
+        {
+            "provider": getattr(fallback, "provider_name", None),
+            "model": getattr(fallback, "model_name", None),
+            "fallback_from": provider_name,
+            "circuit_state": CircuitBreaker.OPEN,
+        }
+    )
+    return {"assistant_text": response["assistant_text"], "metadata": metadata}
+
+
+class ResilientLLMProvider:
+    """
+    Applies the OpenAI retry policy and circuit breaker (`generate_resilient`) to another provider, so that
+    simulated errors exercise the same retry budget, backoff, breaker and fallback as real outages.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        *,
+        max_retries: int = 2,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 8.0,
+        retry_budget: Optional[RetryBudget] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        fallback: Optional[LLMProvider] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._inner = inner
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.retry_budget = retry_budget or _PROCESS_RETRY_BUDGET
+        self.circuit_breaker = circuit_breaker
+        self.fallback = fallback
+        self._sleep = sleep
+
+    @property
+    def provider_name(self) -> str:
+        return self._inner.provider_name
+
+    @property
+    def model_name(self) -> Optional[str]:
+        return self._inner.model_name
+
+    async def generate(self, request: LLMRequest) -> LLMResponse:
+        async def attempt() -> LLMResponse:
+            return validate_llm_response(await self._inner.generate(request))
+
+        return await generate_resilient(
+            attempt,
+            request,
+            label=self.provider_name,
+            provider_name=self.provider_name,
+            max_retries=self.max_retries,
+            retry_base_delay=self.retry_base_delay,
+            retry_max_delay=self.retry_max_delay,
+            retry_budget=self.retry_budget,
+            circuit_breaker=self.circuit_breaker,
+            fallback=self.fallback,
+            sleep=self._sleep,
+        )
 
 
 class OpenAIProvider:
-    def __init__(self, api_key: str, model: str, timeout: float = 30.0, max_retries: int = 2, client: Any = None) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        timeout: float = 30.0,
+        max_retries: int = 2,
+        client: Any = None,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 8.0,
+        retry_budget: Optional[RetryBudget] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        fallback: Optional[LLMProvider] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        reasoning_effort: Optional[str] = None,
+    ) -> None:
         self.api_key = api_key
         self._model_name: str = model
         self.timeout = timeout
         self.max_retries = max_retries
         self._client = client
         self._provider_name = "openai"
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.retry_budget = retry_budget or _PROCESS_RETRY_BUDGET
+        self.circuit_breaker = circuit_breaker
+        self.fallback = fallback
+        self._sleep = sleep
+        self.reasoning_effort = reasoning_effort
 
     @property
     def provider_name(self) -> str:
@@ -139,58 +830,945 @@ class OpenAIProvider:
         if settings.mercury_env == "test":
             raise RuntimeError("OpenAI is disabled in test mode (MERCURY_ENV=test).")
 
-        # Lazy import to avoid hard dependency when not used
+        return await generate_resilient(
+            lambda: self._attempt(request),
+            request,
+            label="OpenAI",
+            provider_name=self.provider_name,
+            max_retries=self.max_retries,
+            retry_base_delay=self.retry_base_delay,
+            retry_max_delay=self.retry_max_delay,
+            retry_budget=self.retry_budget,
+            circuit_breaker=self.circuit_breaker,
+            fallback=self.fallback,
+            sleep=self._sleep,
+        )
+
+    async def _attempt(self, request: LLMRequest) -> LLMResponse:
+        content, usage = await self._call(request.get("prompt") or "", remaining_seconds(request), request)
+        truncated = False
+        if isinstance(content, str):
+            content, truncated = truncate_output(content, request)
+        if not isinstance(content, str) or not content.strip():
+            raise ValidationError("OpenAI response was empty")
+        metadata: Dict[str, Any] = {"provider": "openai", "model": self.model_name}
+        if usage:
+            metadata["usage"] = usage
+        if truncated:
+            metadata["truncated"] = True
+        return {"assistant_text": content, "metadata": metadata}
+
+    async def _call(
+        self, prompt: str, remaining: Optional[float] = None, request: Optional[LLMRequest] = None
+    ) -> Tuple[Any, Optional[Dict[str, int]]]:
+        timeout = self.timeout if remaining is None else max(0.0, min(self.timeout, remaining))
+        limits: LLMRequest = request if request is not None else {}
+        if callable(self._client):
+            maybe_result = self._client(prompt)
+            content = await maybe_result if inspect.isawaitable(maybe_result) else maybe_result
+            return content, None
+        client = self._client
+        if client is None:
+            # Lazy import to avoid hard dependency when not used
+            try:
+                from openai import AsyncOpenAI  # type: ignore
+            except Exception as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError("OpenAI client not available") from exc
+            # Retries are owned by generate(); disable the SDK's own retry loop so they don't compound.
+            client = AsyncOpenAI(api_key=self.api_key, timeout=self.timeout, max_retries=0)
+            self._client = client
+        max_output_tokens = limits.get("max_output_tokens")
+        # Use Responses API if available; fall back to chat completions if not.
+        if hasattr(client, "responses"):
+            params: Dict[str, Any] = {"model": self._model_name, "input": prompt, "timeout": timeout}
+            if max_output_tokens:
+                params["max_output_tokens"] = max_output_tokens
+            if self.reasoning_effort:
+                params["reasoning"] = {"effort": self.reasoning_effort}
+            if limits.get("stop") or limits.get("target_words"):
+                # The Responses API has no stop sequences; stream and stop reading once the limits are hit.
+                return await self._stream_responses(client, params, limits)
+            resp = await client.responses.create(**params)  # type: ignore[attr-defined]
+            output_text = getattr(resp, "output_text", None) or ""
+            if not output_text.strip() and getattr(resp, "status", None) == "incomplete":
+                raise _incomplete_error(getattr(resp, "incomplete_details", None), limits)
+            return output_text, _usage_from_response(resp)
+        chat_params: Dict[str, Any] = {
+            "model": self._model_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "timeout": timeout,
+        }
+        if max_output_tokens:
+            chat_params["max_completion_tokens"] = max_output_tokens
+        if limits.get("stop"):
+            chat_params["stop"] = list(limits["stop"])[:4]
+        if self.reasoning_effort:
+            chat_params["reasoning_effort"] = self.reasoning_effort
+        chat = await client.chat.completions.create(**chat_params)  # type: ignore[attr-defined]
+        content = chat.choices[0].message.content if chat.choices else ""
+        if not (content or "").strip() and chat.choices and chat.choices[0].finish_reason == "length":
+            raise _incomplete_error("length", limits)
+        return content, _usage_from_response(chat)
+
+    @staticmethod
+    async def _stream_responses(
+        client: Any, params: Dict[str, Any], limits: LLMRequest
+    ) -> Tuple[str, Optional[Dict[str, int]]]:
+        stream = await client.responses.create(stream=True, **params)  # type: ignore[attr-defined]
+        parts: List[str] = []
+        usage: Optional[Dict[str, int]] = None
+        incomplete: Any = None
         try:
-            from openai import AsyncOpenAI  # type: ignore
-        except Exception as exc:  # pragma: no cover - optional dependency
-            raise RuntimeError("OpenAI client not available") from exc
+            async for event in stream:
+                event_type = getattr(event, "type", "")
+                if event_type == "response.output_text.delta":
+                    parts.append(getattr(event, "delta", "") or "")
+                    if output_limit_reached("".join(parts), limits):
+                        break
+                elif event_type in ("response.completed", "response.incomplete"):
+                    response = getattr(event, "response", None)
+                    usage = _usage_from_response(response)
+                    if event_type == "response.incomplete":
+                        incomplete = getattr(response, "incomplete_details", None) or "incomplete"
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                maybe_closed = close()
+                if inspect.isawaitable(maybe_closed):
+                    await maybe_closed
+        text = "".join(parts)
+        if incomplete is not None and not text.strip():
+            raise _incomplete_error(incomplete, limits)
+        return text, usage
+
+
+def _usage_from_response(resp: Any) -> Optional[Dict[str, int]]:
+    """
+    Normalize Responses API (input/output_tokens) and Chat Completions (prompt/completion_tokens) usage,
+    including provider-side prompt cache hits (`cached_input_tokens`).
+    """
+    usage = getattr(resp, "usage", None)
+    if usage is None:
+        return None
+    input_tokens = getattr(usage, "input_tokens", None)
+    if input_tokens is None:
+        input_tokens = getattr(usage, "prompt_tokens", None)
+    output_tokens = getattr(usage, "output_tokens", None)
+    if output_tokens is None:
+        output_tokens = getattr(usage, "completion_tokens", None)
+    details = getattr(usage, "input_tokens_details", None) or getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None)
+    normalized: Dict[str, int] = {}
+    if isinstance(input_tokens, int):
+        normalized["input_tokens"] = input_tokens
+    if isinstance(output_tokens, int):
+        normalized["output_tokens"] = output_tokens
+    if isinstance(cached_tokens, int):
+        normalized["cached_input_tokens"] = cached_tokens
+    return normalized or None
+
+
+class ReplayLLMProvider:
+    """
+    Replays recorded `llm_traces` responses for load testing.
+    Rows are indexed by (prompt_version, prompt_hash); an exact hit returns that row's text, a miss
+    returns a deterministic pick from the same prompt_version so payload sizes stay realistic.
+    Latency is sampled from the recorded `latency_ms` values ("recorded"), a fixed value ("fixed"),
+    or skipped ("none"); `latency_scale` stretches or compresses whichever is used.
+    """
+
+    def __init__(
+        self,
+        records: Iterable[Dict[str, Any]] = (),
+        *,
+        latency_mode: str = "recorded",
+        fixed_latency_ms: int = 0,
+        latency_scale: float = 1.0,
+        seed: int = 0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        if latency_mode not in ("recorded", "fixed", "none"):
+            raise ValueError("latency_mode must be one of: recorded, fixed, none")
+        self.latency_mode = latency_mode
+        self.fixed_latency_ms = fixed_latency_ms
+        self.latency_scale = latency_scale
+        self._rng = random.Random(seed)
+        self._sleep = sleep
+        self._by_hash: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._by_version: Dict[str, List[Dict[str, Any]]] = {}
+        self._latencies: Dict[str, List[int]] = {}
+        self._provider_name = "replay"
+        self._model_name: Optional[str] = "replay"
+        self.add_records(records)
+
+    @property
+    def provider_name(self) -> str:
+        return self._provider_name
+
+    @property
+    def model_name(self) -> Optional[str]:
+        return self._model_name
+
+    @property
+    def record_count(self) -> int:
+        return sum(len(rows) for rows in self._by_version.values())
+
+    def add_records(self, records: Iterable[Dict[str, Any]]) -> int:
+        added = 0
+        for row in records:
+            entry = _replay_entry_from_trace(row)
+            if entry is None:
+                continue
+            version = entry["prompt_version"]
+            self._by_version.setdefault(version, []).append(entry)
+            if entry["prompt_hash"]:
+                self._by_hash.setdefault((version, entry["prompt_hash"]), []).append(entry)
+            if entry["latency_ms"] is not None:
+                self._latencies.setdefault(version, []).append(entry["latency_ms"])
+            added += 1
+        return added
+
+    def load_export(self, path: str | Path) -> int:
+        """Bulk-load a trace export: JSON Lines (one row per line) or a single JSON array of rows."""
+        raw = Path(path).read_text(encoding="utf-8")
+        stripped = raw.lstrip()
+        if stripped.startswith("["):
+            rows = json.loads(stripped)
+        else:
+            rows = [json.loads(line) for line in raw.splitlines() if line.strip()]
+        return self.add_records(row for row in rows if isinstance(row, dict))
+
+    async def load_from_session(
+        self, session: Any, prompt_versions: Optional[List[str]] = None, limit: int = 10000
+    ) -> int:
+        from sqlalchemy import text
+
+        where = "WHERE response_payload ? 'assistant_text'"
+        params: Dict[str, Any] = {"limit": int(limit)}
+        if prompt_versions:
+            where += " AND prompt_version = ANY(:versions)"
+            params["versions"] = list(prompt_versions)
+        result = await session.execute(
+            text(
+                f"""
+                SELECT prompt_version, prompt_hash, latency_ms, request_payload, response_payload
+                FROM llm_traces
+                {where}
+                ORDER BY created_at DESC, id DESC
+                LIMIT :limit
+                """
+            ),
+            params,
+        )
+        return self.add_records(dict(row._mapping) for row in result)
+
+    def _pick(self, prompt_version: str, prompt: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        exact = self._by_hash.get((prompt_version, prompt_hash(prompt)))
+        if exact:
+            return exact[self._rng.randrange(len(exact))], True
+        candidates = self._by_version.get(prompt_version)
+        if candidates:
+            return candidates[self._rng.randrange(len(candidates))], False
+        return None, False
 
+    def _latency_seconds(self, prompt_version: str, entry: Dict[str, Any]) -> float:
+        if self.latency_mode == "none":
+            return 0.0
+        if self.latency_mode == "fixed":
+            latency_ms = self.fixed_latency_ms
+        else:
+            recorded = self._latencies.get(prompt_version)
+            latency_ms = recorded[self._rng.randrange(len(recorded))] if recorded else entry["latency_ms"] or 0
+        return max(0.0, latency_ms * self.latency_scale / 1000.0)
+
+    async def generate(self, request: LLMRequest) -> LLMResponse:
+        prompt_version = request.get("prompt_version") or ""
         prompt = request.get("prompt") or ""
+        entry, exact = self._pick(prompt_version, prompt)
+        if entry is None:
+            raise RuntimeError(f"No recorded traces for prompt_version {prompt_version!r}")
+        delay = self._latency_seconds(prompt_version, entry)
+        if delay:
+            await self._sleep(delay)
+        assistant_text, truncated = truncate_output(entry["assistant_text"], request)
+        metadata: Dict[str, Any] = {
+            "provider": self.provider_name,
+            "replay_match": "exact" if exact else "prompt_version",
+            "replay_latency_ms": int(delay * 1000),
+        }
+        if truncated:
+            metadata["truncated"] = True
+        return {"assistant_text": assistant_text, "metadata": metadata}
+
+
+def _replay_entry_from_trace(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    response = _json_field(row.get("response_payload"))
+    text = response.get("assistant_text") if isinstance(response, dict) else None
+    if not isinstance(text, str) or not text or "error" in response:
+        return None
+    request = _json_field(row.get("request_payload"))
+    version = row.get("prompt_version") or (request.get("prompt_version") if isinstance(request, dict) else None)
+    if not isinstance(version, str) or not version:
+        return None
+    hashed = row.get("prompt_hash")
+    if not hashed and isinstance(request, dict) and isinstance(request.get("prompt"), str):
+        hashed = prompt_hash(request["prompt"])
+    latency = row.get("latency_ms")
+    return {
+        "prompt_version": version,
+        "prompt_hash": hashed or None,
+        "assistant_text": text,
+        "latency_ms": int(latency) if isinstance(latency, (int, float)) else None,
+    }
+
+
+def _json_field(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return None
+    return value
+
+
+class SimulatedLLMError(Exception):
+    """Injected failure from SimulatedLLMProvider; status codes/bases make classify_llm_error see a real class."""
+
+    status_code: Optional[int] = None
+
+    def __init__(self, error_class: str) -> None:
+        super().__init__(f"Simulated {error_class} error")
+        self.error_class = error_class
+
+
+class SimulatedRateLimitError(SimulatedLLMError):
+    status_code = 429
+
+
+class SimulatedTimeoutError(SimulatedLLMError, TimeoutError):
+    pass
+
+
+class SimulatedConnectionError(SimulatedLLMError, ConnectionError):
+    pass
+
+
+class SimulatedServerError(SimulatedLLMError):
+    status_code = 503
+
+
+class SimulatedClientError(SimulatedLLMError):
+    status_code = 400
+
+
+_SIMULATED_ERRORS: Dict[str, type] = {
+    ERROR_CLASS_RATE_LIMIT: SimulatedRateLimitError,
+    ERROR_CLASS_TIMEOUT: SimulatedTimeoutError,
+    ERROR_CLASS_CONNECTION: SimulatedConnectionError,
+    ERROR_CLASS_SERVER: SimulatedServerError,
+    ERROR_CLASS_CLIENT: SimulatedClientError,
+}
+
+DEFAULT_SIMULATED_PROFILE: Dict[str, Any] = {
+    "latency": {"distribution": "lognormal", "median_ms": 1200, "sigma": 0.5},
+    "jitter_ms": 100,
+    "errors": {},
+    "error_latency_factor": 0.5,
+    "empty_rate": 0.0,
+    "output_words": {"mean": 120, "stddev": 40, "min": 5},
+}
+
+_SIMULATED_WORDS = (
+    "mercury emissions delegation option support proposal binding voluntary financing capacity "
+    "artisanal mining trade phase-out compliance reporting monitoring we our position consider "
+    "flexibility timeline developing countries convention measures agree concerns"
+).split()
+
+
+class SimulatedLLMProvider:
+    """
+    Synthetic provider for load tests and resilience testing (LLM_PROVIDER=simulated).
+
+    The profile (LLM_SIMULATED_PROFILE, JSON) controls, optionally per prompt_version under "prompt_versions":
+      latency: {"distribution": "fixed" | "uniform" | "normal" | "lognormal", ...} with
+               ms / min_ms,max_ms / mean_ms,stddev_ms / median_ms,sigma, plus "jitter_ms" (uniform +/-)
+      errors: {"rate_limit": 0.02, "timeout": 0.01, "connection": 0.0, "server": 0.01, "client": 0.0}
+      error_latency_factor: share of the sampled latency spent before an error is raised
+      empty_rate: probability of an empty assistant_text
+      output_words: {"mean", "stddev", "min"} normal model of reply length in words
+    A sampled latency past the request deadline sleeps until the deadline and raises a timeout.
+    Output limits on the request are applied like any other provider.
+    """
+
+    def __init__(
+        self,
+        profile: Optional[Dict[str, Any]] = None,
+        *,
+        seed: Optional[int] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.profile = {**DEFAULT_SIMULATED_PROFILE, **(profile or {})}
+        self._rng = random.Random(seed)
+        self._sleep = sleep
+        self._provider_name = "simulated"
+        self._model_name: Optional[str] = "simulated"
+
+    @property
+    def provider_name(self) -> str:
+        return self._provider_name
+
+    @property
+    def model_name(self) -> Optional[str]:
+        return self._model_name
+
+    def _profile_for(self, prompt_version: str) -> Dict[str, Any]:
+        overrides = (self.profile.get("prompt_versions") or {}).get(prompt_version)
+        return {**self.profile, **overrides} if isinstance(overrides, dict) else self.profile
+
+    def sample_latency(self, profile: Dict[str, Any]) -> float:
+        spec = profile.get("latency") or {}
+        distribution = spec.get("distribution", "fixed")
+        if distribution == "uniform":
+            millis = self._rng.uniform(float(spec.get("min_ms", 0)), float(spec.get("max_ms", 0)))
+        elif distribution == "normal":
+            millis = self._rng.gauss(float(spec.get("mean_ms", 0)), float(spec.get("stddev_ms", 0)))
+        elif distribution == "lognormal":
+            median = max(1.0, float(spec.get("median_ms", 1)))
+            millis = self._rng.lognormvariate(math.log(median), float(spec.get("sigma", 0)))
+        else:
+            millis = float(spec.get("ms", 0))
+        jitter = float(profile.get("jitter_ms", 0) or 0)
+        if jitter:
+            millis += self._rng.uniform(-jitter, jitter)
+        return max(0.0, millis) / 1000.0
+
+    def sample_error(self, profile: Dict[str, Any]) -> Optional[str]:
+        roll = self._rng.random()
+        cumulative = 0.0
+        for error_class, rate in sorted((profile.get("errors") or {}).items()):
+            cumulative += float(rate)
+            if roll < cumulative and error_class in _SIMULATED_ERRORS:
+                return error_class
+        return None
+
+    def sample_text(self, profile: Dict[str, Any]) -> str:
+        spec = profile.get("output_words") or {}
+        count = int(round(self._rng.gauss(float(spec.get("mean", 120)), float(spec.get("stddev", 0)))))
+        count = max(int(spec.get("min", 1)), count)
+        words = [self._rng.choice(_SIMULATED_WORDS) for _ in range(count)]
+        sentences = [" ".join(words[i : i + 12]) for i in range(0, len(words), 12)]
+        return "[SIMULATED] " + " ".join(sentence[:1].upper() + sentence[1:] + "." for sentence in sentences)
+
+    async def generate(self, request: LLMRequest) -> LLMResponse:
+        profile = self._profile_for(request.get("prompt_version") or "")
+        latency = self.sample_latency(profile)
+        error_class = self.sample_error(profile)
+        if error_class is not None:
+            latency *= float(profile.get("error_latency_factor", 1.0))
+        remaining = remaining_seconds(request)
+        if remaining is not None and latency > remaining:
+            await self._sleep(max(0.0, remaining))
+            raise SimulatedTimeoutError(ERROR_CLASS_TIMEOUT)
+        if latency:
+            await self._sleep(latency)
+        if error_class is not None:
+            raise _SIMULATED_ERRORS[error_class](error_class)
+        if self._rng.random() < float(profile.get("empty_rate", 0.0)):
+            assistant_text = ""
+            truncated = False
+        else:
+            assistant_text, truncated = truncate_output(self.sample_text(profile), request)
+        metadata: Dict[str, Any] = {"provider": self.provider_name, "simulated_latency_ms": int(latency * 1000)}
+        if truncated:
+            metadata["truncated"] = True
+        return {"assistant_text": assistant_text, "metadata": metadata}
+
+
+class LatencyTracker:
+    """Rolling window of observed latencies per key (prompt_version), used to derive hedge thresholds."""
+
+    def __init__(self, window: int = 200) -> None:
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, key: str, seconds: float) -> None:
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = collections.deque(maxlen=self.window)
+            self._samples[key] = samples
+        samples.append(seconds)
+
+    def sample_count(self, key: str) -> int:
+        return len(self._samples.get(key) or ())
+
+    def percentile(self, key: str, pct: float) -> Optional[float]:
+        samples = self._samples.get(key)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+        return ordered[index]
+
+
+class HedgedLLMProvider:
+    """
+    Opt-in tail-latency hedging around another provider.
+    If the primary call has not returned by the tracked percentile latency for its prompt_version,
+    an identical second call is issued; the first successful response wins and the other is cancelled.
+    Hedges are capped by a budget so a slow provider is not sent double traffic across the board.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        *,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        initial_delay: float = 2.0,
+        min_delay: float = 0.05,
+        tracker: Optional[LatencyTracker] = None,
+        hedge_budget: Optional[RetryBudget] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._inner = inner
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.tracker = tracker or LatencyTracker()
+        self.hedge_budget = hedge_budget or RetryBudget(ratio=0.1, min_retries=1)
+        self._clock = clock
+
+    @property
+    def provider_name(self) -> str:
+        return self._inner.provider_name
+
+    @property
+    def model_name(self) -> Optional[str]:
+        return self._inner.model_name
+
+    def hedge_delay(self, prompt_version: str) -> float:
+        if self.tracker.sample_count(prompt_version) < self.min_samples:
+            return self.initial_delay
+        observed = self.tracker.percentile(prompt_version, self.percentile)
+        if observed is None:
+            return self.initial_delay
+        return max(self.min_delay, observed)
+
+    async def generate(self, request: LLMRequest) -> LLMResponse:
+        prompt_version = request.get("prompt_version") or ""
+        threshold = self.hedge_delay(prompt_version)
+        started = self._clock()
+        self.hedge_budget.record_request()
+        primary = asyncio.create_task(self._inner.generate(request))
+        tasks: Dict["asyncio.Task[LLMResponse]", str] = {primary: "primary"}
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=threshold)
+            if done or not self.hedge_budget.try_acquire_retry():
+                response = await primary
+                winner = "primary"
+            else:
+                tasks[asyncio.create_task(self._inner.generate(request))] = "hedge"
+                winner, response = await self._first_success(tasks)
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        self.tracker.record(prompt_version, self._clock() - started)
+        metadata = dict(response.get("metadata") or {})
+        metadata["hedge"] = {
+            "hedge_count": len(tasks) - 1,
+            "hedge_won": winner == "hedge",
+            "threshold_ms": int(threshold * 1000),
+        }
+        return {"assistant_text": response.get("assistant_text", ""), "metadata": metadata}
+
+    @staticmethod
+    async def _first_success(tasks: Dict["asyncio.Task[LLMResponse]", str]) -> tuple[str, LLMResponse]:
+        pending = set(tasks)
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    return tasks[task], task.result()
+                if tasks[task] == "primary" or first_error is None:
+                    first_error = error
+        assert first_error is not None
+        raise first_error
+
+
+ROUTE_DEFAULT_KEY = "default"
+
+
+class ModelRouter:
+    """
+    Routing table from prompt_version to ordered provider/model targets.
+
+    The table is JSON:
+        {"default": [{"provider": "openai", "model": "gpt-5-nano"}],
+         "prompt_versions": {"r3_debate_speech_v1": [
+             {"name": "quality", "when": {"min_remaining_seconds": 20, "max_latency_ms": 8000},
+              "targets": [{"provider": "openai", "model": "gpt-5-mini"}, {"provider": "canned"}]},
+             {"name": "fast", "targets": [{"provider": "openai", "model": "gpt-5-nano"}]}]}}
+    Rules are tried in order and the first whose `when` conditions all hold is used:
+    `min_prompt_tokens` / `max_prompt_tokens` (estimated), `min_remaining_seconds` / `max_remaining_seconds`
+    (request deadline), and `max_latency_ms` (observed p95 of the rule's first target).
+    When loaded from `path`, the file is re-read when its mtime changes, checked every `reload_interval` seconds;
+    a file that fails to parse keeps the previous table.
+    """
+
+    def __init__(
+        self,
+        table: Optional[Dict[str, Any]] = None,
+        *,
+        path: Optional[str] = None,
+        reload_interval: float = 5.0,
+        tracker: Optional[LatencyTracker] = None,
+        latency_percentile: float = 95.0,
+        min_latency_samples: int = 5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = Path(path) if path else None
+        self.reload_interval = reload_interval
+        self.tracker = tracker or LatencyTracker()
+        self.latency_percentile = latency_percentile
+        self.min_latency_samples = min_latency_samples
+        self._clock = clock
+        self._table: Dict[str, Any] = table or {}
+        self._mtime: Optional[float] = None
+        self._checked_at: Optional[float] = None
+        if self.path is not None:
+            self.maybe_reload(force=True)
+
+    @property
+    def table(self) -> Dict[str, Any]:
+        return self._table
+
+    def maybe_reload(self, force: bool = False) -> bool:
+        if self.path is None:
+            return False
+        now = self._clock()
+        if not force and self._checked_at is not None and now - self._checked_at < self.reload_interval:
+            return False
+        self._checked_at = now
+        try:
+            mtime = self.path.stat().st_mtime
+            if not force and mtime == self._mtime:
+                return False
+            table = json.loads(self.path.read_text(encoding="utf-8"))
+            if not isinstance(table, dict):
+                raise ValueError("routing table must be a JSON object")
+        except (OSError, ValueError) as exc:
+            logger.warning("LLM routing table not reloaded", extra={"path": str(self.path), "error": str(exc)})
+            return False
+        self._table = table
+        self._mtime = mtime
+        logger.info("LLM routing table loaded", extra={"path": str(self.path)})
+        return True
+
+    @staticmethod
+    def target_key(target: Dict[str, Any]) -> str:
+        return f"{target.get('provider')}:{target.get('model') or ''}"
+
+    def default_targets(self) -> List[Dict[str, Any]]:
+        targets = self._table.get(ROUTE_DEFAULT_KEY)
+        return [t for t in targets if isinstance(t, dict)] if isinstance(targets, list) else []
+
+    def select(self, request: LLMRequest) -> Tuple[str, List[Dict[str, Any]]]:
+        """Return (rule name, ordered targets) for the request."""
+        self.maybe_reload()
+        rules = (self._table.get("prompt_versions") or {}).get(request.get("prompt_version") or "")
+        if isinstance(rules, list):
+            for index, rule in enumerate(rules):
+                if not isinstance(rule, dict):
+                    continue
+                targets = [t for t in rule.get("targets") or [] if isinstance(t, dict)]
+                if targets and self._matches(rule.get("when") or {}, request, targets[0]):
+                    return str(rule.get("name") or f"rule_{index}"), targets
+        return ROUTE_DEFAULT_KEY, self.default_targets()
+
+    def _matches(self, when: Dict[str, Any], request: LLMRequest, first_target: Dict[str, Any]) -> bool:
+        tokens = _request_token_estimate(request)
+        if "min_prompt_tokens" in when and tokens < when["min_prompt_tokens"]:
+            return False
+        if "max_prompt_tokens" in when and tokens > when["max_prompt_tokens"]:
+            return False
+        remaining = remaining_seconds(request)
+        if remaining is not None:
+            if "min_remaining_seconds" in when and remaining < when["min_remaining_seconds"]:
+                return False
+            if "max_remaining_seconds" in when and remaining > when["max_remaining_seconds"]:
+                return False
+        if "max_latency_ms" in when:
+            key = self.target_key(first_target)
+            if self.tracker.sample_count(key) >= self.min_latency_samples:
+                observed = self.tracker.percentile(key, self.latency_percentile)
+                if observed is not None and observed * 1000 > when["max_latency_ms"]:
+                    return False
+        return True
+
+
+def _request_token_estimate(request: LLMRequest) -> int:
+    payload = request.get("request_payload")
+    if isinstance(payload, dict):
+        estimate = (payload.get("token_estimate") or {}).get("estimated_tokens")
+        if isinstance(estimate, int):
+            return estimate
+    return len(request.get("prompt") or "") // 4
+
+
+def served_by(provider_name: str, model_name: Optional[str], response: Optional[Dict[str, Any]]) -> Tuple[str, Optional[str]]:
+    """(provider, model) that produced `response`: the routed target when there was one, else the given names."""
+    metadata = response.get("metadata") if isinstance(response, dict) else None
+    routing = metadata.get("routing") if isinstance(metadata, dict) else None
+    if isinstance(routing, dict) and routing.get("provider"):
+        return str(routing["provider"]), routing.get("model")
+    return provider_name, model_name
+
+
+class RoutedLLMProvider:
+    """
+    Dispatches each request to the provider/model chosen by a ModelRouter, trying the rule's targets in order.
+    A target that raises (or returns an invalid response) falls through to the next one; cancellation does not.
+    The decision is recorded as `metadata.routing` so it lands in `llm_traces.response_payload`.
+    """
+
+    # Per request the serving target is in `metadata.routing`; see `served_by`.
+    provider_name = "routed"
+    model_name: Optional[str] = None
+
+    def __init__(
+        self,
+        router: ModelRouter,
+        provider_factory: Callable[[Dict[str, Any]], Optional[LLMProvider]],
+    ) -> None:
+        self.router = router
+        self._provider_factory = provider_factory
+        self._providers: Dict[str, Optional[LLMProvider]] = {}
+
+    def _provider_for(self, target: Dict[str, Any]) -> Optional[LLMProvider]:
+        key = ModelRouter.target_key(target)
+        if key not in self._providers:
+            self._providers[key] = self._provider_factory(target)
+        return self._providers[key]
+
+    async def generate(self, request: LLMRequest) -> LLMResponse:
+        rule, targets = self.router.select(request)
+        attempts: List[Dict[str, Any]] = []
         last_error: Optional[Exception] = None
-        for attempt in range(self.max_retries + 1):
+        for index, target in enumerate(targets):
+            key = ModelRouter.target_key(target)
+            provider = self._provider_for(target)
+            if provider is None:
+                attempts.append({"target": key, "error_class": "unavailable"})
+                continue
+            started = time.monotonic()
             try:
-                if callable(self._client):
-                    maybe_result = self._client(prompt)
-                    content = await maybe_result if inspect.isawaitable(maybe_result) else maybe_result
-                else:
-                    client = self._client or AsyncOpenAI(api_key=self.api_key, timeout=self.timeout)
-                    # Use Responses API if available; fall back to chat completions if not.
-                    if hasattr(client, "responses"):
-                        resp = await client.responses.create(  # type: ignore[attr-defined]
-                            model=self._model_name,
-                            input=prompt,
-                        )
-                        content = getattr(resp, "output_text", None) or ""
-                    else:
-                        chat = await client.chat.completions.create(  # type: ignore[attr-defined]
-                            model=self._model_name,
-                            messages=[{"role": "user", "content": prompt}],
-                        )
-                        content = chat.choices[0].message.content if chat.choices else ""
-                if not isinstance(content, str) or not content.strip():
-                    raise ValidationError("OpenAI response was empty")
-                return {"assistant_text": content or "", "metadata": {"provider": "openai", "model": self.model_name}}
-            except ValidationError:
+                response = validate_llm_response(await provider.generate(request))
+            except LLMCancelledError:
                 raise
-            except Exception as exc:  # pragma: no cover - best effort retry
+            except Exception as exc:
                 last_error = exc
-                if attempt >= self.max_retries:
-                    break
-                if isinstance(exc, (TimeoutError,)):
-                    continue
-                if "rate" in str(exc).lower() or "timeout" in str(exc).lower():
-                    continue
-                break
-        raise RuntimeError(f"OpenAI call failed: {last_error}") if last_error else RuntimeError("OpenAI call failed")
+                error_class = getattr(exc, "error_class", None) or classify_llm_error(exc)
+                attempts.append({"target": key, "error_class": error_class})
+                logger.warning(
+                    "LLM route target failed",
+                    extra={"rule": rule, "target": key, "error_class": error_class},
+                )
+                continue
+            self.router.tracker.record(key, time.monotonic() - started)
+            metadata = dict(response.get("metadata") or {})
+            metadata["routing"] = {
+                "prompt_version": request.get("prompt_version"),
+                "rule": rule,
+                "provider": target.get("provider"),
+                "model": target.get("model") or getattr(provider, "model_name", None),
+                "fallback_index": index,
+                "failed_attempts": attempts,
+            }
+            return {"assistant_text": response.get("assistant_text", ""), "metadata": metadata}
+        if last_error is not None:
+            raise last_error
+        raise LLMCallError(
+            f"No routable LLM target for prompt_version {request.get('prompt_version')!r} (rule {rule})",
+            error_class=ERROR_CLASS_CLIENT,
+            attempts=0,
+        )
+
+
+SPEECH_REUSE_PROMPT_VERSIONS: Tuple[str, ...] = ("r3_debate_speech_v1",)
+
+
+def _quantize(value: Any, granularity: float) -> Any:
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or granularity <= 0:
+        return value
+    return round(round(float(value) / granularity) * granularity, 6)
+
+
+class SpeechReuseCache:
+    """
+    LRU cache of generated speeches keyed on a canonicalized prompt context.
+    Acceptance and firmness are bucketed to `granularity` so near-identical stances share a key.
+    Each key collects up to `variants_per_key` distinct speeches from the provider; once full,
+    lookups rotate through them instead of generating more.
+    """
+
+    def __init__(self, *, max_keys: int = 1024, variants_per_key: int = 3, granularity: float = 0.1) -> None:
+        self.max_keys = max(1, max_keys)
+        self.variants_per_key = max(1, variants_per_key)
+        self.granularity = granularity
+        self._entries: "collections.OrderedDict[str, Dict[str, Any]]" = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key_for(self, request: LLMRequest) -> Optional[str]:
+        payload = request.get("request_payload")
+        if not isinstance(payload, dict):
+            return None
+        stance = payload.get("speaker_issue_stance_snapshot")
+        stance = stance if isinstance(stance, dict) else {}
+        acceptance = stance.get("acceptance")
+        acceptance = acceptance if isinstance(acceptance, dict) else {}
+        canonical = {
+            "prompt_version": request.get("prompt_version") or payload.get("prompt_version"),
+            "speaker_role": payload.get("speaker_role"),
+            "issue_id": payload.get("issue_id"),
+            "debate_round": payload.get("debate_round"),
+            "speech_number": payload.get("speech_number"),
+            "opening_summary": payload.get("speaker_opening_summary"),
+            "transcript_tail": payload.get("debate_transcript_tail") or [],
+            "stance": {
+                "preferred": stance.get("preferred"),
+                "conditions": stance.get("conditions"),
+                "firmness": _quantize(stance.get("firmness"), self.granularity),
+                "acceptance": {
+                    str(opt_id): _quantize(val, self.granularity) for opt_id, val in acceptance.items()
+                },
+            },
+        }
+        encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Return a stored speech once the key has its full set of variants, else None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        texts: List[str] = entry["texts"]
+        if len(texts) < self.variants_per_key:
+            return None
+        served = entry["served"]
+        entry["served"] = served + 1
+        return texts[served % len(texts)]
+
+    def store(self, key: str, text: str) -> None:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = {"texts": [], "served": 0}
+            self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if text not in entry["texts"] and len(entry["texts"]) < self.variants_per_key:
+            entry["texts"].append(text)
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+
+    def variant_count(self, key: str) -> int:
+        entry = self._entries.get(key)
+        return len(entry["texts"]) if entry else 0
+
+
+class ReusingLLMProvider:
+    """
+    Serves repeated speech contexts from a SpeechReuseCache instead of calling the wrapped provider.
+    Only prompt versions in `prompt_versions` are cached; fallback responses are never stored.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        cache: Optional[SpeechReuseCache] = None,
+        *,
+        prompt_versions: Iterable[str] = SPEECH_REUSE_PROMPT_VERSIONS,
+    ) -> None:
+        self._inner = inner
+        self.cache = cache if cache is not None else SpeechReuseCache()
+        self.prompt_versions = frozenset(prompt_versions)
+
+    @property
+    def provider_name(self) -> str:
+        return self._inner.provider_name
+
+    @property
+    def model_name(self) -> Optional[str]:
+        return self._inner.model_name
+
+    async def generate(self, request: LLMRequest) -> LLMResponse:
+        key = None
+        if request.get("prompt_version") in self.prompt_versions:
+            key = self.cache.key_for(request)
+        if key is None:
+            return await self._inner.generate(request)
+
+        cached = self.cache.lookup(key)
+        if cached is not None:
+            return {
+                "assistant_text": cached,
+                "metadata": {"reuse": {"hit": True, "key": key[:16], "variants": self.cache.variant_count(key)}},
+            }
+
+        response = await self._inner.generate(request)
+        metadata = dict(response.get("metadata") or {})
+        text = response.get("assistant_text")
+        if isinstance(text, str) and text.strip() and "fallback_from" not in metadata:
+            self.cache.store(key, text)
+        metadata["reuse"] = {"hit": False, "key": key[:16], "variants": self.cache.variant_count(key)}
+        return {"assistant_text": response.get("assistant_text", ""), "metadata": metadata}
 
 
 __all__ = [
+    "CannedLLMProvider",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "LLMCallError",
+    "LLMConcurrencyLimiter",
+    "LLMCancelledError",
     "LLMProvider",
     "LLMRequest",
     "LLMResponse",
     "FakeLLMProvider",
+    "HedgedLLMProvider",
+    "LatencyTracker",
+    "ModelRouter",
+    "DEFAULT_OUTPUT_LIMITS",
     "DEFAULT_OPENAI_MODEL",
     "OpenAIProvider",
+    "ReplayLLMProvider",
+    "ResilientLLMProvider",
+    "RoutedLLMProvider",
+    "RetryBudget",
+    "SimulatedLLMError",
+    "SimulatedLLMProvider",
+    "ReusingLLMProvider",
+    "SpeechReuseCache",
+    "apply_output_limits",
+    "backoff_delay",
+    "classify_llm_error",
+    "generate_resilient",
+    "generate_with_cancellation",
+    "output_limits_for",
     "get_llm_provider",
+    "is_reasoning_model",
+    "llm_concurrency_limiter",
+    "prompt_hash",
+    "remaining_seconds",
+    "served_by",
+    "truncate_output",
     "validate_llm_response",
 ]
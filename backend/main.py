@@ -1,29 +1,94 @@
+import asyncio
+import base64
+import copy
 import datetime
+import gzip
 import json
 import random
 import uuid
 import hashlib
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
-from typing import Any, Dict, List, Optional, TypedDict, cast
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Literal, Optional, Set, Tuple, Union, cast
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .advance_delta import (
+    advance_delta_body,
+    current_advance_writes,
+    record_advance_writes,
+    wants_advance_delta,
+)
 from .ai import FakeLLM, AIResponder
-from .llm_provider import LLMRequest, LLMResponse, get_llm_provider, validate_llm_response, ValidationError
-from .db import get_session
+from .llm_provider import (
+    CANCEL_REASON_CLIENT_DISCONNECTED,
+    FakeLLMProvider,
+    LLMCancelledError,
+    LLMProvider,
+    LLMRequest,
+    LLMResponse,
+    apply_output_limits,
+    generate_with_cancellation,
+    get_llm_provider,
+    llm_concurrency_limiter,
+    prompt_hash,
+    served_by,
+    validate_llm_response,
+    ValidationError,
+)
+from .compression import COMPRESSION_CACHE_KEY_HEADER, CompressionMiddleware, available_encodings, negotiate_encoding
+from .db import get_session, get_session_maker
+from .fast_json import game_response_body, object_body
+from .game_events import GAME_EVENTS_CHANNEL, GameEventHub
+from .game_versions import GameBodyCache, etag_matches, game_state_etag
+from .idempotency import (
+    IDEMPOTENCY_HEADER,
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    IDEMPOTENCY_REPLAYED_HEADER,
+    claim_idempotency_key,
+    decompress_body,
+    idempotency_request_hash,
+    purge_expired_idempotency_keys,
+    release_idempotency_key,
+    should_store_response,
+    store_idempotent_response,
+)
+from .jobs import JobHandler, LLMJobWorkerPool, enqueue_llm_job, fetch_llm_job
 from .prompt_builder import (
+    ROUND2_PROMPT_VERSION,
     build_round2_conversation_prompt,
     build_round2_context,
     build_round3_debate_speech_prompt_v1,
 )
-from .stance_shift import apply_stance_shift
+from .reviews import (
+    REVIEW_STATUS,
+    build_review,
+    encode_review,
+    fetch_stored_review,
+    materialize_review,
+    store_review,
+)
+from .side_negotiations import SIDE_NEGOTIATION_STATUS, apply_side_negotiation_shifts, run_side_negotiations
+from .single_flight import (
+    SingleFlightGroup,
+    abandon_advance_flight,
+    advance_flight_key,
+    claim_advance_flight,
+    finish_advance_flight,
+    wait_for_advance_flight,
+)
+from .speech_library import select_library_speech
+from .stance_shift import apply_stance_shifts_for_roles
+from .state_patch import state_patch
+from .state_views import parse_state_fields, project_state, projection_tag
 from .config import get_settings
 from .config import get_settings
 from .state import (
@@ -65,7 +130,22 @@ async def lifespan(app: FastAPI):
                 "responder_class": responder.__class__.__name__,
             },
         )
-    yield
+    job_pool: Optional[LLMJobWorkerPool] = None
+    if settings.llm_job_workers > 0:
+        job_pool = LLMJobWorkerPool(
+            get_session_maker(),
+            default_job_handlers(),
+            concurrency=settings.llm_job_workers,
+            poll_interval=settings.llm_job_poll_seconds,
+            lease_seconds=settings.llm_job_lease_seconds,
+        )
+        job_pool.start()
+    try:
+        yield
+    finally:
+        if job_pool is not None:
+            await job_pool.stop()
+        await _GAME_EVENTS.stop()
 
 
 app = FastAPI(title="Mercury Game Backend", lifespan=lifespan)
@@ -82,15 +162,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
-class _RequiredLLMRequest(TypedDict):
-    game_id: str
-    role_id: str
-    status: str
-    prompt_version: str
-    prompt: str
-    request_payload: Dict[str, Any]
-
+# gzip/brotli for buffered JSON responses; see backend/compression.py.
+app.add_middleware(CompressionMiddleware, settings=get_settings)
 
 class CreateGameRequest(BaseModel):
     user_id: Optional[uuid.UUID] = Field(default=None)
@@ -116,6 +189,10 @@ def utc_iso() -> str:
     return datetime.datetime.now(datetime.timezone.utc).isoformat()
 
 
+def _elapsed_ms(started: float) -> int:
+    return int((time.perf_counter() - started) * 1000)
+
+
 ROUND2_TRANSCRIPT_TAIL_LIMIT = 10
 
 
@@ -245,7 +322,8 @@ async def persist_state(
     status: str,
     state: Dict[str, Any],
     checkpoint_transcript_id: Optional[uuid.UUID] = None,
-) -> None:
+) -> int:
+    """Write status and state plus a checkpoint; returns the new state version."""
     # Ensure deterministic vote ordering before persisting
     if isinstance(state, dict):
         ai = state.get("round3", {}).get("active_issue") if isinstance(state.get("round3"), dict) else None
@@ -257,10 +335,6 @@ async def persist_state(
         text("UPDATE games SET status = :status WHERE id = :id"),
         {"status": status, "id": str(game_id)},
     )
-    await session.execute(
-        text("UPDATE game_state SET state = :state, updated_at = now() WHERE game_id = :id"),
-        {"state": json.dumps(state), "id": str(game_id)},
-    )
     checkpoint = await session.execute(
         text(
             """
@@ -289,19 +363,48 @@ async def persist_state(
                 "transcript_upto": None if checkpoint_transcript_id is None else str(checkpoint_transcript_id),
             }
         )
+    # Written last so the stored state (and its JSON, reused for the response) includes the new checkpoint.
+    version = await _write_game_state(session, game_id, state)
+    return version
 
 
-async def persist_state_no_checkpoint(session: AsyncSession, game_id: uuid.UUID, status: str, state: Dict[str, Any]) -> None:
+async def persist_state_no_checkpoint(session: AsyncSession, game_id: uuid.UUID, status: str, state: Dict[str, Any]) -> int:
     state["status"] = status
     state["updated_at"] = utc_iso()
     await session.execute(
         text("UPDATE games SET status = :status WHERE id = :id"),
         {"status": status, "id": str(game_id)},
     )
-    await session.execute(
-        text("UPDATE game_state SET state = :state, updated_at = now() WHERE game_id = :id"),
-        {"state": json.dumps(state), "id": str(game_id)},
+    return await _write_game_state(session, game_id, state)
+
+
+async def _write_game_state(session: AsyncSession, game_id: uuid.UUID, state: Dict[str, Any]) -> int:
+    # Every state write bumps the version that GET /games/{id} exposes as its ETag.
+    # The NOTIFY is delivered to listeners only if and when this transaction commits.
+    state_json = json.dumps(state)
+    result = await session.execute(
+        text(
+            """
+            WITH updated AS (
+              UPDATE game_state SET state = :state, version = version + 1, updated_at = now()
+              WHERE game_id = :id
+              RETURNING game_id, version
+            )
+            SELECT version,
+                   pg_notify(
+                     :channel,
+                     json_build_object('game_id', game_id, 'version', version, 'status', CAST(:status AS TEXT))::text
+                   )
+            FROM updated
+            """
+        ),
+        {"state": state_json, "id": str(game_id), "channel": GAME_EVENTS_CHANNEL, "status": state.get("status")},
     )
+    version = int(result.scalar_one())
+    writes = current_advance_writes()
+    if writes is not None:
+        writes.record_state(version, state.get("status"), state_json, state)
+    return version
 
 
 def _proposal_support(state: Dict[str, Any], issue_id: str, options: List[Dict[str, Any]]) -> Dict[str, float]:
@@ -340,33 +443,6 @@ def _issue_option_spec_from_active_issue(issue_id: str, options: Any) -> Dict[st
     return {issue_id: {"options": options}}
 
 
-def _apply_stance_shifts_for_roles(
-    *,
-    state: Dict[str, Any],
-    role_ids: List[str],
-    round_id: int,
-    issue_id: Optional[str],
-    trigger_text: str,
-    issue_option_spec: Dict[str, Any],
-) -> List[Dict[str, Any]]:
-    updated = state.get("stances", {})
-    reasons_all: List[Dict[str, Any]] = []
-    for rid in role_ids:
-        updated, reasons = apply_stance_shift(
-            role_id=rid,
-            round_id=round_id,
-            issue_id=issue_id,
-            trigger_text=trigger_text,
-            stance_snapshot=updated,
-            issue_option_spec=issue_option_spec,
-        )
-        if reasons:
-            reasons_all.extend(reasons)
-    if reasons_all:
-        state["stances"] = updated
-    return reasons_all
-
-
 def _canonicalize_votes(ai: Dict[str, Any]) -> None:
     votes = ai.get("votes")
     if isinstance(votes, dict):
@@ -421,7 +497,7 @@ async def insert_transcript_entry(
             INSERT INTO transcript_entries
             (game_id, role_id, phase, round, issue_id, visible_to_human, content, metadata)
             VALUES (:game_id, :role_id, :phase, :round, :issue_id, :visible_to_human, :content, :metadata)
-            RETURNING id
+            RETURNING seq, id, game_id, role_id, phase, round, issue_id, visible_to_human, content, metadata, created_at
             """
         ),
         {
@@ -435,7 +511,11 @@ async def insert_transcript_entry(
             "metadata": metadata_json,
         },
     )
-    return uuid.UUID(str(result.scalar_one()))
+    row = result.mappings().one()
+    writes = current_advance_writes()
+    if writes is not None:
+        writes.record_transcript({**_transcript_entry_json(row), "seq": int(row["seq"])})
+    return uuid.UUID(str(row["id"]))
 
 
 async def insert_llm_trace(
@@ -448,13 +528,21 @@ async def insert_llm_trace(
     prompt_version: Optional[str],
     request_payload: Optional[Dict[str, Any]],
     response_payload: Optional[Dict[str, Any]],
+    latency_ms: Optional[int] = None,
+    prompt: Optional[str] = None,
 ) -> None:
+    # The prompt text is passed explicitly; request payloads differ in shape between prompt versions.
+    if prompt is None and isinstance(request_payload, dict) and isinstance(request_payload.get("prompt"), str):
+        prompt = request_payload["prompt"]
+    provider, model = served_by(provider, model, response_payload)
     await session.execute(
         text(
             """
             INSERT INTO llm_traces
-            (game_id, role_id, status, provider, model, prompt_version, request_payload, response_payload)
-            VALUES (:game_id, :role_id, :status, :provider, :model, :prompt_version, :request_payload, :response_payload)
+            (game_id, role_id, status, provider, model, prompt_version, prompt_hash, latency_ms,
+             request_payload, response_payload)
+            VALUES (:game_id, :role_id, :status, :provider, :model, :prompt_version, :prompt_hash, :latency_ms,
+                    :request_payload, :response_payload)
             """
         ),
         {
@@ -464,12 +552,185 @@ async def insert_llm_trace(
             "provider": provider,
             "model": model,
             "prompt_version": prompt_version,
+            "prompt_hash": prompt_hash(prompt) if prompt is not None else None,
+            "latency_ms": latency_ms,
             "request_payload": json.dumps(request_payload) if request_payload is not None else None,
             "response_payload": json.dumps(response_payload) if response_payload is not None else None,
         },
     )
 
 
+_BACKGROUND_TASKS: Set["asyncio.Task[Any]"] = set()
+# Identical /advance calls already in flight share one execution (see backend/single_flight.py).
+_ADVANCE_FLIGHTS = SingleFlightGroup()
+# Shared flights expire this long after the LLM request deadline.
+ADVANCE_FLIGHT_GRACE_SECONDS = 30.0
+# Serialized GET /games/{id} bodies by state version.
+_GAME_BODIES = GameBodyCache()
+# LISTEN/NOTIFY fan-out for /events streams and /wait long polls.
+_GAME_EVENTS = GameEventHub()
+GAME_WAIT_MAX_TIMEOUT_SECONDS = 60.0
+
+
+def _log_background_failure(task: "asyncio.Task[Any]") -> None:
+    _BACKGROUND_TASKS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background task failed", exc_info=task.exception())
+
+
+def start_side_negotiations(game_id: uuid.UUID, state: Dict[str, Any], issues: List[Dict[str, Any]]) -> None:
+    """Kick off Round 2 AI-to-AI negotiations without blocking the caller; results land at ROUND_2_WRAP_READY."""
+    settings = get_settings()
+    provider = get_llm_provider(app.state)
+    provider_name = getattr(provider, "provider_name", "fake")
+    model_name = getattr(provider, "model_name", None)
+
+    async def write_trace(
+        session: AsyncSession,
+        trace_game_id: uuid.UUID,
+        role_id: str,
+        request: LLMRequest,
+        response: LLMResponse,
+        latency_ms: int,
+    ) -> None:
+        await insert_llm_trace(
+            session,
+            trace_game_id,
+            role_id,
+            SIDE_NEGOTIATION_STATUS,
+            provider=provider_name,
+            model=model_name,
+            prompt_version=request.get("prompt_version"),
+            request_payload=request.get("request_payload"),
+            response_payload=dict(response),
+            prompt=request.get("prompt"),
+            latency_ms=latency_ms,
+        )
+
+    task = asyncio.create_task(
+        run_side_negotiations(
+            get_session_maker(),
+            provider,
+            game_id,
+            copy.deepcopy(state),
+            issues,
+            turns=settings.round2_side_negotiation_turns,
+            limiter=llm_concurrency_limiter().background,
+            trace_writer=write_trace,
+        )
+    )
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_log_background_failure)
+
+
+async def record_cancelled_generation(
+    session: AsyncSession,
+    game_id: uuid.UUID,
+    role_id: Optional[str],
+    game_status: str,
+    provider: str,
+    model: Optional[str],
+    prompt_version: Optional[str],
+    request_payload: Optional[Dict[str, Any]],
+    exc: LLMCancelledError,
+    latency_ms: Optional[int],
+    prompt: Optional[str] = None,
+) -> JSONResponse:
+    # Abandoned generations are traced with status "cancelled"; nothing is written to transcript/state.
+    async with session.begin():
+        await insert_llm_trace(
+            session,
+            game_id,
+            role_id,
+            "cancelled",
+            provider=provider,
+            model=model,
+            prompt_version=prompt_version,
+            request_payload=request_payload,
+            response_payload={
+                "error": {"type": exc.__class__.__name__, "message": str(exc)},
+                "cancel_reason": exc.reason,
+                "game_status": game_status,
+            },
+            latency_ms=latency_ms,
+            prompt=prompt,
+        )
+    if exc.reason == CANCEL_REASON_CLIENT_DISCONNECTED:
+        return JSONResponse(status_code=499, content={"detail": "Client disconnected"})
+    return JSONResponse(status_code=504, content={"detail": "LLM generation deadline exceeded"})
+
+
+async def generate_unlocked(
+    session: AsyncSession,
+    game_id: uuid.UUID,
+    provider: LLMProvider,
+    request: LLMRequest,
+    *,
+    provider_name: str,
+    model_name: Optional[str],
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    detailed_errors: bool = True,
+) -> Union[Tuple[LLMResponse, int], JSONResponse]:
+    """
+    Middle phase of every LLM-backed transition. Callers read state and build the request in one
+    transaction, call this with no transaction open, then re-read under FOR UPDATE, re-validate and
+    commit. Returns (validated response, latency_ms), or the response to send after tracing a failure.
+    """
+    if session.in_transaction():
+        raise RuntimeError("LLM generation must not run while a transaction holds the game row")
+    role_id = request.get("role_id")
+    game_status = request.get("status") or ""
+    started = time.perf_counter()
+    try:
+        response = validate_llm_response(
+            await generate_with_cancellation(
+                provider, request, is_disconnected=is_disconnected, limiter=llm_concurrency_limiter().foreground
+            )
+        )
+    except LLMCancelledError as e:
+        return await record_cancelled_generation(
+            session,
+            game_id,
+            role_id,
+            game_status,
+            provider=provider_name,
+            model=model_name,
+            prompt_version=request.get("prompt_version"),
+            request_payload=request.get("request_payload"),
+            exc=e,
+            latency_ms=_elapsed_ms(started),
+            prompt=request.get("prompt"),
+        )
+    except Exception as e:
+        is_validation = isinstance(e, ValidationError)
+        error_payload: Dict[str, Any] = {
+            "error": {"type": "ValidationError" if is_validation else e.__class__.__name__, "message": str(e)}
+        }
+        if detailed_errors:
+            error_payload["error_type"] = e.__class__.__name__
+            error_payload["error_message"] = str(e)
+            if getattr(e, "error_class", None):
+                error_payload["error_class"] = getattr(e, "error_class")
+        async with session.begin():
+            await insert_llm_trace(
+                session,
+                game_id,
+                role_id,
+                game_status,
+                provider=provider_name,
+                model=model_name,
+                prompt_version=request.get("prompt_version"),
+                request_payload=request.get("request_payload"),
+                response_payload=error_payload,
+                latency_ms=_elapsed_ms(started),
+                prompt=request.get("prompt"),
+            )
+        # Failed generations return 502 with no transcript/state advance.
+        detail = "LLM response validation failed" if is_validation else "LLM generation failed"
+        return JSONResponse(status_code=502, content={"detail": detail})
+    return response, _elapsed_ms(started)
+
+
 async def fetch_japan_script(session: AsyncSession, script_key: str) -> Optional[str]:
     row = (
         await session.execute(
@@ -497,18 +758,15 @@ def get_ai_responder() -> AIResponder:
     return app.state._default_ai_responder
 
 
-def should_use_openai_round3(settings: Any, provider_name: str, debate_round: int, speaker: str) -> bool:
-    if settings.mercury_env == "test":
-        if not settings.openai_round3_debate_speeches:
-            return False
-        if provider_name != "openai":
-            return False
-        if debate_round not in (1, 2):
-            return False
-        if speaker == CHAIR:
-            return False
-        return True
-    if provider_name != "openai":
+def is_live_provider(provider_name: str) -> bool:
+    """Any configured provider other than the built-in fake (openai, routed, replay, simulated, ...)."""
+    return provider_name != "fake"
+
+
+def should_use_provider_round3(settings: Any, provider_name: str, debate_round: int, speaker: str) -> bool:
+    if settings.mercury_env == "test" and not settings.openai_round3_debate_speeches:
+        return False
+    if not is_live_provider(provider_name):
         return False
     if debate_round not in (1, 2):
         return False
@@ -517,8 +775,6 @@ def should_use_openai_round3(settings: Any, provider_name: str, debate_round: in
     return True
 
 
-
-
 def _stable_int(seed: int, salt: str) -> int:
     digest = hashlib.sha256(f"{seed}:{salt}".encode("utf-8")).hexdigest()
     return int(digest, 16) % (2**63)
@@ -547,12 +803,61 @@ async def health() -> Dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics() -> Dict[str, Any]:
+    return {
+        "advance_single_flight": {
+            "leaders": _ADVANCE_FLIGHTS.stats["leaders"],
+            "coalesced_local": _ADVANCE_FLIGHTS.stats["coalesced_local"],
+            "coalesced_shared": _ADVANCE_FLIGHTS.stats["coalesced_shared"],
+            "unshared": _ADVANCE_FLIGHTS.stats["unshared"],
+            "in_flight": _ADVANCE_FLIGHTS.in_flight(),
+        }
+    }
+
+
+StateView = Literal["player", "debug", "full"]
+
+
+def _state_projection(fields: Optional[str], view: str) -> Tuple[Optional[List[Tuple[str, ...]]], Optional[str]]:
+    """Parsed `fields` paths and the projection tag (None when the full state is wanted)."""
+    try:
+        paths = parse_state_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return paths, projection_tag(paths, view)
+
+
 @app.get("/games/{game_id}")
-async def get_game(game_id: uuid.UUID, session: AsyncSession = Depends(get_session)):
+async def get_game(
+    game_id: uuid.UUID,
+    request: Request,
+    fields: Optional[str] = None,
+    view: StateView = "full",
+    session: AsyncSession = Depends(get_session),
+):
+    paths, projection = _state_projection(fields, view)
+    # Cheap version lookup first: unchanged polls get 304, known versions come from the in-process cache.
+    version_row = await session.execute(
+        text("SELECT version FROM game_state WHERE game_id = :id"), {"id": str(game_id)}
+    )
+    version = version_row.scalar_one_or_none()
+    if version is not None:
+        etag = game_state_etag(int(version), projection)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        cached = _GAME_BODIES.get(game_id, int(version)) if projection is None else None
+        if cached is not None:
+            return Response(
+                content=cached,
+                media_type="application/json",
+                headers={"ETag": etag, COMPRESSION_CACHE_KEY_HEADER: f"game:{game_id}:v{version}"},
+            )
+
     result = await session.execute(
         text(
             """
-            SELECT g.id, g.user_id, g.human_role_id, g.status, g.seed, g.created_at, g.updated_at, gs.state
+            SELECT g.id, g.user_id, g.human_role_id, g.status, g.seed, g.created_at, g.updated_at, gs.state::text AS state, gs.version
             FROM games g
             JOIN game_state gs ON gs.game_id = g.id
             WHERE g.id = :id
@@ -563,8 +868,9 @@ async def get_game(game_id: uuid.UUID, session: AsyncSession = Depends(get_sessi
     row = result.mappings().first()
     if not row:
         raise HTTPException(status_code=404, detail="Game not found")
-    state = row["state"] if isinstance(row["state"], dict) else json.loads(row["state"])
-    if state is None:
+    # Selected as ::text so asyncpg hands back the JSON unparsed; it is spliced into the body without decoding.
+    state_json = row["state"]
+    if state_json is None or state_json == "null":
         raise HTTPException(status_code=404, detail="Game state not found")
 
     def _iso(val: Any) -> Optional[str]:
@@ -572,21 +878,76 @@ async def get_game(game_id: uuid.UUID, session: AsyncSession = Depends(get_sessi
             return None
         return val.replace(tzinfo=datetime.timezone.utc).isoformat() if hasattr(val, "isoformat") else str(val)
 
+    version = int(row["version"])
     game_obj = {
         "id": str(row["id"]),
         "user_id": str(row["user_id"]) if row["user_id"] else None,
         "human_role_id": row["human_role_id"],
         "status": row["status"],
         "seed": int(row["seed"]),
+        "version": version,
         "created_at": _iso(row["created_at"]),
         "updated_at": _iso(row["updated_at"]),
     }
-    return {"game": game_obj, "state": state}
+    if projection is not None:
+        state = project_state(json.loads(state_json), paths, view)
+        body = object_body({"game": game_obj, "state": state}, {})
+        return Response(content=body, media_type="application/json", headers={"ETag": game_state_etag(version, projection)})
+    body = object_body({"game": game_obj}, {"state": state_json})
+    _GAME_BODIES.put(game_id, version, body)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": game_state_etag(version), COMPRESSION_CACHE_KEY_HEADER: f"game:{game_id}:v{version}"},
+    )
+
+
+TRANSCRIPT_CURSOR_PREFIX = "t1:"
+TRANSCRIPT_PAGE_DEFAULT_LIMIT = 100
+TRANSCRIPT_PAGE_MAX_LIMIT = 500
+
+
+def encode_transcript_cursor(seq: int) -> str:
+    """Opaque cursor for a transcript position; `seq` is per-table, so it is valid under any visibility filter."""
+    return base64.urlsafe_b64encode(f"{TRANSCRIPT_CURSOR_PREFIX}{seq}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_transcript_cursor(cursor: str) -> int:
+    if cursor.isdigit():
+        return int(cursor)
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+    except ValueError:
+        decoded = ""
+    if not decoded.startswith(TRANSCRIPT_CURSOR_PREFIX) or not decoded[len(TRANSCRIPT_CURSOR_PREFIX) :].isdigit():
+        raise HTTPException(status_code=400, detail="Invalid transcript cursor")
+    return int(decoded[len(TRANSCRIPT_CURSOR_PREFIX) :])
+
+
+def _transcript_entry_json(row: Any) -> Dict[str, Any]:
+    created_at = row["created_at"]
+    created_at_str = created_at.replace(tzinfo=datetime.timezone.utc).isoformat() if hasattr(created_at, "isoformat") else str(created_at)
+    return {
+        "id": str(row["id"]),
+        "game_id": str(row["game_id"]),
+        "role_id": row["role_id"],
+        "phase": row["phase"],
+        "round": row["round"],
+        "issue_id": row["issue_id"],
+        "visible_to_human": row["visible_to_human"],
+        "content": row["content"],
+        "metadata": row["metadata"],
+        "created_at": created_at_str,
+    }
 
 
 @app.get("/games/{game_id}/transcript")
 async def get_transcript(
-    game_id: uuid.UUID, visible_to_human: Optional[bool] = None, session: AsyncSession = Depends(get_session)
+    game_id: uuid.UUID,
+    visible_to_human: Optional[bool] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=TRANSCRIPT_PAGE_MAX_LIMIT),
+    session: AsyncSession = Depends(get_session),
 ):
     # Verify game exists
     exists = await session.execute(text("SELECT 1 FROM games WHERE id = :id LIMIT 1"), {"id": str(game_id)})
@@ -599,6 +960,33 @@ async def get_transcript(
         where_clause += " AND visible_to_human = :visible"
         params["visible"] = visible_to_human
 
+    if after is not None or limit is not None:
+        # Keyset page in write order: only entries after the cursor, plus the cursor to resume from.
+        after_seq = decode_transcript_cursor(after) if after else 0
+        page_size = limit or TRANSCRIPT_PAGE_DEFAULT_LIMIT
+        params.update({"after_seq": after_seq, "page_limit": page_size + 1})
+        result = await session.execute(
+            text(
+                f"""
+                SELECT seq, id, game_id, role_id, phase, round, issue_id, visible_to_human, content, metadata, created_at
+                FROM transcript_entries
+                {where_clause} AND seq > :after_seq
+                ORDER BY seq ASC
+                LIMIT :page_limit
+                """
+            ),
+            params,
+        )
+        rows = list(result.mappings())
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        last_seq = int(rows[-1]["seq"]) if rows else after_seq
+        return {
+            "entries": [{**_transcript_entry_json(row), "seq": int(row["seq"])} for row in rows],
+            "next_cursor": encode_transcript_cursor(last_seq),
+            "has_more": has_more,
+        }
+
     result = await session.execute(
         text(
             f"""
@@ -610,89 +998,211 @@ async def get_transcript(
         ),
         params,
     )
-    entries = []
-    for row in result.mappings():
-        created_at = row["created_at"]
-        created_at_str = created_at.replace(tzinfo=datetime.timezone.utc).isoformat() if hasattr(created_at, "isoformat") else str(created_at)
-        entries.append(
-            {
-                "id": str(row["id"]),
-                "game_id": str(row["game_id"]),
-                "role_id": row["role_id"],
-                "phase": row["phase"],
-                "round": row["round"],
-                "issue_id": row["issue_id"],
-                "visible_to_human": row["visible_to_human"],
-                "content": row["content"],
-                "metadata": row["metadata"],
-                "created_at": created_at_str,
-            }
-    )
-    return entries
+    return [_transcript_entry_json(row) for row in result.mappings()]
 
 
-@app.get("/games/{game_id}/review", response_model=ReviewResponse)
-async def get_review(game_id: uuid.UUID, session: AsyncSession = Depends(get_session)):
-    # Transcript: include all except round2 hidden; require ordering by created_at then id
-    result = await session.execute(
-        text(
-            """
-            SELECT id, game_id, role_id, phase, round, issue_id, visible_to_human, content, metadata, created_at
-            FROM transcript_entries
-            WHERE game_id = :gid
-              AND (
-                (round = 2 AND visible_to_human = true) OR (round != 2 OR round IS NULL)
-              )
-            ORDER BY created_at ASC, COALESCE((metadata->>'index')::int, 0) ASC, id ASC
-            """
-        ),
-        {"gid": str(game_id)},
-    )
-    transcript = []
-    for row in result.mappings():
-        created_at = row["created_at"]
-        created_at_str = created_at.replace(tzinfo=datetime.timezone.utc).isoformat() if hasattr(created_at, "isoformat") else str(created_at)
-        transcript.append(
-            {
-                "id": str(row["id"]),
-                "game_id": str(row["game_id"]),
-                "role_id": row["role_id"],
-                "phase": row["phase"],
-                "round": row["round"],
-                "issue_id": row["issue_id"],
-                "visible_to_human": row["visible_to_human"],
-                "content": row["content"],
-                "metadata": row["metadata"],
-                "created_at": created_at_str,
-            }
+async def _read_game_delta(
+    game_id: uuid.UUID, after_seq: int, visible_to_human: Optional[bool]
+) -> Optional[Tuple[int, str, Dict[str, Any], List[Dict[str, Any]]]]:
+    """(version, status, state, transcript entries after `after_seq`) in one short read-only session."""
+    async with get_session_maker()() as session:
+        row = (
+            await session.execute(
+                text(
+                    """
+                    SELECT g.status, gs.state, gs.version
+                    FROM games g
+                    JOIN game_state gs ON gs.game_id = g.id
+                    WHERE g.id = :id
+                    """
+                ),
+                {"id": str(game_id)},
+            )
+        ).mappings().first()
+        if not row:
+            return None
+        params: Dict[str, Any] = {"game_id": str(game_id), "after_seq": after_seq}
+        visibility = ""
+        if visible_to_human is not None:
+            visibility = " AND visible_to_human = :visible"
+            params["visible"] = visible_to_human
+        entries = await session.execute(
+            text(
+                f"""
+                SELECT seq, id, game_id, role_id, phase, round, issue_id, visible_to_human, content, metadata, created_at
+                FROM transcript_entries
+                WHERE game_id = :game_id AND seq > :after_seq{visibility}
+                ORDER BY seq ASC
+                """
+            ),
+            params,
         )
+        transcript = [{**_transcript_entry_json(entry), "seq": int(entry["seq"])} for entry in entries.mappings()]
+    state = row["state"] if isinstance(row["state"], dict) else json.loads(row["state"])
+    return int(row["version"]), row["status"], state, transcript
 
-    votes_rows = await session.execute(
-        text(
-            """
-            SELECT id, issue_id, proposal_option_id, votes_by_country, passed, created_at
-            FROM votes
-            WHERE game_id = :gid
-            ORDER BY created_at ASC, id ASC
-            """
-        ),
-        {"gid": str(game_id)},
+
+def _sse_event(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(jsonable_encoder(data), separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+@app.get("/games/{game_id}/events")
+async def game_events(game_id: uuid.UUID, request: Request, visible_to_human: Optional[bool] = None):
+    """
+    Server-sent events: one `snapshot` (full state, version, transcript cursor), then a `delta` per
+    committed change with new transcript entries, an RFC 6902 patch from the previous state, and the
+    status transition. Changes arrive through Postgres NOTIFY; without a listener the stream checks
+    the version on every keepalive instead.
+    """
+    settings = get_settings()
+    async with get_session_maker()() as session:
+        exists = await session.execute(text("SELECT 1 FROM game_state WHERE game_id = :id"), {"id": str(game_id)})
+        if exists.first() is None:
+            raise HTTPException(status_code=404, detail="Game not found")
+
+    async def stream() -> AsyncIterator[str]:
+        key = str(game_id)
+        listening = await _GAME_EVENTS.ensure_started(settings.database_url)
+        queue = _GAME_EVENTS.subscribe(key)
+        try:
+            # Subscribe before the snapshot read so no commit between the two is missed.
+            snapshot = await _read_game_delta(game_id, 0, visible_to_human)
+            if snapshot is None:
+                return
+            version, status, state, transcript = snapshot
+            last_seq = transcript[-1]["seq"] if transcript else 0
+            yield _sse_event(
+                "snapshot",
+                {
+                    "version": version,
+                    "status": status,
+                    "state": state,
+                    "transcript_cursor": encode_transcript_cursor(last_seq),
+                },
+                version,
+            )
+            while True:
+                try:
+                    notice = await asyncio.wait_for(queue.get(), timeout=settings.game_events_keepalive_seconds)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    if listening:
+                        yield ": keepalive\n\n"
+                        continue
+                    notice = {"version": version + 1}
+                if notice["version"] <= version:
+                    continue
+                while not queue.empty():
+                    queue.get_nowait()
+                current = await _read_game_delta(game_id, last_seq, visible_to_human)
+                if current is None:
+                    return
+                new_version, new_status, new_state, new_entries = current
+                if new_version <= version:
+                    continue
+                if new_entries:
+                    last_seq = new_entries[-1]["seq"]
+                yield _sse_event(
+                    "delta",
+                    {
+                        "version": new_version,
+                        "previous_version": version,
+                        "status": new_status,
+                        "status_transition": {"from": status, "to": new_status} if new_status != status else None,
+                        "patch": state_patch(state, new_state),
+                        "transcript": new_entries,
+                        "transcript_cursor": encode_transcript_cursor(last_seq),
+                    },
+                    new_version,
+                )
+                version, status, state = new_version, new_status, new_state
+        finally:
+            _GAME_EVENTS.unsubscribe(key, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    votes_list = []
-    for row in votes_rows.mappings():
-        c_at = row["created_at"]
-        votes_list.append(
-            {
-                "id": str(row["id"]),
-                "issue_id": row["issue_id"],
-                "proposal_option_id": row["proposal_option_id"],
-                "votes_by_country": row["votes_by_country"],
-                "passed": row["passed"],
-                "created_at": c_at.replace(tzinfo=datetime.timezone.utc).isoformat() if hasattr(c_at, "isoformat") else str(c_at),
-            }
-        )
 
-    return {"game_id": game_id, "transcript": transcript, "votes": votes_list}
+
+@app.get("/games/{game_id}/wait")
+async def wait_for_game_version(
+    game_id: uuid.UUID,
+    version: int = Query(default=0, ge=0),
+    timeout: float = Query(default=25.0, ge=0, le=GAME_WAIT_MAX_TIMEOUT_SECONDS),
+):
+    """
+    Long poll: hold the request until the game's version exceeds `version` or `timeout` seconds pass.
+    One version lookup up front; after that the request sleeps on the in-process per-game condition,
+    which the LISTEN connection wakes on commit.
+    """
+    key = str(game_id)
+    listening = await _GAME_EVENTS.ensure_started(get_settings().database_url)
+
+    async def lookup() -> Tuple[int, str]:
+        async with get_session_maker()() as session:
+            row = (
+                await session.execute(
+                    text(
+                        """
+                        SELECT gs.version, g.status
+                        FROM game_state gs
+                        JOIN games g ON g.id = gs.game_id
+                        WHERE gs.game_id = :id
+                        """
+                    ),
+                    {"id": key},
+                )
+            ).first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Game not found")
+        return int(row[0]), row[1]
+
+    current, status = await lookup()
+    # Seed the hub so concurrent waiters on this worker see the version without their own wake-up.
+    _GAME_EVENTS.publish(key, current, status)
+    if current <= version:
+        if listening:
+            woken = await _GAME_EVENTS.wait_for_version(key, version, timeout)
+            if woken is not None:
+                current = woken
+                status = _GAME_EVENTS.latest_status(key) or status
+        else:
+            await asyncio.sleep(timeout)
+            current, status = await lookup()
+    return JSONResponse(
+        content={"game_id": key, "version": current, "status": status, "changed": current > version},
+        headers={"ETag": game_state_etag(current), "Cache-Control": "no-store"},
+    )
+
+
+@app.get("/games/{game_id}/review", response_model=ReviewResponse)
+async def get_review(game_id: uuid.UUID, request: Request, session: AsyncSession = Depends(get_session)):
+    # Served from the document materialized at the REVIEW transition while no later write has happened.
+    async with session.begin():
+        stored, version, status = await fetch_stored_review(session, game_id)
+        if stored is None:
+            body = encode_review(await build_review(session, game_id))
+            if version is None or status != REVIEW_STATUS:
+                return Response(content=body, media_type="application/json")
+            await store_review(session, game_id, version, body)
+    # Immutable until the next state write, so other encodings are compressed once and cached.
+    headers = {"Vary": "Accept-Encoding", COMPRESSION_CACHE_KEY_HEADER: f"review:{game_id}:v{version}"}
+    if stored is None:
+        return Response(content=body, media_type="application/json", headers=headers)
+    if negotiate_encoding(request.headers.get("accept-encoding"), available_encodings()) == "gzip":
+        return Response(
+            content=stored,
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return Response(content=gzip.decompress(stored), media_type="application/json", headers=headers)
 
 
 @app.post("/games", response_model=GameResponse)
@@ -717,9 +1227,10 @@ async def create_game(req: CreateGameRequest, session: AsyncSession = Depends(ge
         state["created_at"] = now_iso
         state["updated_at"] = now_iso
         ensure_default_stances(state)
+        state_json = json.dumps(state)
         await session.execute(
             text("INSERT INTO game_state (game_id, state) VALUES (:id, :state)"),
-            {"id": str(game_id), "state": json.dumps(state)},
+            {"id": str(game_id), "state": state_json},
         )
         await session.execute(
             text(
@@ -728,24 +1239,319 @@ async def create_game(req: CreateGameRequest, session: AsyncSession = Depends(ge
                 VALUES (:game_id, NULL, :status, :snapshot)
                 """
             ),
-            {"game_id": str(game_id), "status": "ROLE_SELECTION", "snapshot": json.dumps(state)},
+            {"game_id": str(game_id), "status": "ROLE_SELECTION", "snapshot": state_json},
         )
-    return {"game_id": game_id, "state": state}
+    return Response(content=game_response_body(game_id, state, state_json), media_type="application/json")
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: uuid.UUID, session: AsyncSession = Depends(get_session)):
+    job = await fetch_llm_job(session, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
 @app.post("/games/{game_id}/advance", response_model=GameResponse)
-async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSession = Depends(get_session)):
+async def advance_game(
+    game_id: uuid.UUID,
+    req: AdvanceRequest,
+    http_request: Request,
+    async_job: bool = Query(default=False, alias="async"),
+    delta: bool = Query(default=False),
+    since: Optional[int] = Query(default=None, ge=0),
+    fields: Optional[str] = None,
+    view: StateView = "full",
+    session: AsyncSession = Depends(get_session),
+):
+    delta = wants_advance_delta(delta, http_request.headers.get("accept")) and not async_job
+    paths, projection = _state_projection(fields, view)
+    if delta and projection is not None:
+        raise HTTPException(status_code=400, detail="fields and view cannot be combined with delta responses")
+
+    async def dispatch():
+        if delta:
+            return await _dispatch_advance_delta(game_id, req, session, since, http_request.is_disconnected)
+        result, writes = await record_advance_writes(
+            lambda: _dispatch_advance(game_id, req, session, async_job, http_request.is_disconnected)
+        )
+        result = _advance_result_payload(result)
+        if isinstance(result, Response):
+            return result
+        # Rendered directly: the state JSON just written to game_state is reused instead of re-encoding.
+        state = result["state"]
+        if projection is not None:
+            return Response(
+                content=game_response_body(result["game_id"], project_state(state, paths, view)),
+                media_type="application/json",
+            )
+        return Response(
+            content=game_response_body(result["game_id"], state, writes.encoded_state(state)),
+            media_type="application/json",
+        )
+
+    idempotency_key = http_request.headers.get(IDEMPOTENCY_HEADER)
+    if idempotency_key is None:
+        return await dispatch()
+    if not idempotency_key or len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise HTTPException(status_code=400, detail=f"{IDEMPOTENCY_HEADER} must be 1-{IDEMPOTENCY_KEY_MAX_LENGTH} characters")
+    request_hash = idempotency_request_hash(
+        req.event, req.payload, async_job, delta=delta, since=since, projection=projection
+    )
+    async with session.begin():
+        await purge_expired_idempotency_keys(session, limit=100)
+        existing = await claim_idempotency_key(
+            session, game_id, idempotency_key, request_hash, get_settings().idempotency_key_ttl_seconds
+        )
+    if existing is not None:
+        if existing["request_hash"] != request_hash:
+            raise HTTPException(status_code=422, detail=f"{IDEMPOTENCY_HEADER} was already used for a different request")
+        if existing["status"] != "done":
+            raise HTTPException(status_code=409, detail=f"A request with this {IDEMPOTENCY_HEADER} is still in progress")
+        return Response(
+            content=decompress_body(existing["response_body"]),
+            status_code=existing["response_status"],
+            media_type="application/json",
+            headers={IDEMPOTENCY_REPLAYED_HEADER: "true"},
+        )
+
+    outcome: Optional[Tuple[int, Any]] = None
+    try:
+        result = await dispatch()
+        outcome = _advance_result_body(result)
+        return result
+    except HTTPException as exc:
+        outcome = (exc.status_code, {"detail": exc.detail})
+        raise
+    finally:
+        # Shielded, like the advance flight: a cancelled or failed request still releases its key, so a retry
+        # runs instead of getting 409 until the key expires.
+        await asyncio.shield(_settle_idempotency_key(game_id, idempotency_key, outcome))
+
+
+async def _settle_idempotency_key(game_id: uuid.UUID, key: str, outcome: Optional[Tuple[int, Any]]) -> None:
+    # Own session: the request session may be mid-transaction after a cancellation or a failed write.
+    async with get_session_maker()() as session:
+        async with session.begin():
+            if outcome is not None and should_store_response(outcome[0]):
+                await store_idempotent_response(session, game_id, key, outcome[0], outcome[1])
+            else:
+                await release_idempotency_key(session, game_id, key)
+
+
+async def _dispatch_advance(
+    game_id: uuid.UUID,
+    req: AdvanceRequest,
+    session: AsyncSession,
+    async_job: bool,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]],
+):
+    if async_job:
+        async with session.begin():
+            exists = await session.execute(text("SELECT 1 FROM games WHERE id = :id"), {"id": str(game_id)})
+            if exists.first() is None:
+                raise HTTPException(status_code=404, detail="Game not found")
+            job_id = await enqueue_llm_job(
+                session,
+                game_id,
+                "advance",
+                req.model_dump(),
+                max_attempts=get_settings().llm_job_max_attempts,
+            )
+        return JSONResponse(
+            status_code=202,
+            content={"job_id": str(job_id), "status": "queued"},
+            headers={"Location": f"/jobs/{job_id}"},
+        )
+    return await single_flight_advance(game_id, req, session, is_disconnected=is_disconnected)
+
+
+async def _dispatch_advance_delta(
+    game_id: uuid.UUID,
+    req: AdvanceRequest,
+    session: AsyncSession,
+    since: Optional[int],
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]],
+):
+    """Run an advance and answer with its transcript rows and a patch from state version `since`."""
+    base_state: Optional[Dict[str, Any]] = None
+    if since is not None:
+        # The client's version is usually the latest one served, so it is often still in the body cache.
+        cached = _GAME_BODIES.get(game_id, since)
+        if cached is not None:
+            base_state = json.loads(cached)["state"]
+        else:
+            async with session.begin():
+                row = (
+                    await session.execute(
+                        text("SELECT version, state FROM game_state WHERE game_id = :id"), {"id": str(game_id)}
+                    )
+                ).first()
+            if row is not None and int(row[0]) == since:
+                base_state = row[1] if isinstance(row[1], dict) else json.loads(row[1])
+
+    result, writes = await record_advance_writes(
+        lambda: single_flight_advance(game_id, req, session, is_disconnected=is_disconnected)
+    )
+    result = _advance_result_payload(result)
+    if isinstance(result, Response):
+        return result
+    body = advance_delta_body(str(game_id), since, base_state, writes, jsonable_encoder(result)["state"])
+    body["transcript_cursor"] = encode_transcript_cursor(body["transcript"][-1]["seq"]) if body["transcript"] else None
+    headers = {"ETag": game_state_etag(body["version"])} if body["version"] is not None else None
+    return JSONResponse(content=jsonable_encoder(body), headers=headers)
+
+
+def _shareable_advance_result(result: Any) -> bool:
+    """A 499 means the leader's own client went away; duplicates whose clients are still there rerun."""
+    return not (isinstance(result, Response) and result.status_code == 499)
+
+
+def _advance_result_payload(result: Any) -> Union[Response, Dict[str, Any]]:
+    """
+    An advance result as `{"game_id", "state"}`, for rendering in the representation the caller asked for.
+    Error responses (and 202 job receipts) are returned as they are. A 2xx game body that arrives as a
+    Response, e.g. from another worker's shared flight, is parsed back into the payload.
+    """
+    if not isinstance(result, Response):
+        return result
+    if not 200 <= result.status_code < 300:
+        return result
+    body = json.loads(bytes(result.body))
+    return body if isinstance(body, dict) and "state" in body else result
+
+
+def _advance_result_body(result: Any) -> Tuple[int, Any]:
+    """(status code, JSON body) for a run_advance return value, as stored for jobs and shared flights."""
+    if isinstance(result, Response):
+        return result.status_code, json.loads(bytes(result.body))
+    return 200, jsonable_encoder(result)
+
+
+async def _run_advance_job(session: AsyncSession, job: Dict[str, Any]) -> Tuple[int, Any]:
+    req = AdvanceRequest(**job["payload"])
+    if job["attempts"] > 1 and job.get("start_version") is not None:
+        # A retry after the previous attempt may already have committed (failure after the write, or an
+        # expired lease): once the state has moved on, the event is not applied a second time.
+        async with session.begin():
+            current = (
+                await session.execute(
+                    text("SELECT version FROM game_state WHERE game_id = :id"), {"id": str(job["game_id"])}
+                )
+            ).scalar_one_or_none()
+        if current is not None and int(current) != job["start_version"]:
+            return 409, {
+                "detail": "Game state changed since this job started; the advance is not re-run",
+                "start_version": job["start_version"],
+                "version": int(current),
+            }
+    try:
+        result = await run_advance(job["game_id"], req, session)
+    except HTTPException as exc:
+        return exc.status_code, {"detail": exc.detail}
+    return _advance_result_body(result)
+
+
+async def _run_shared_advance_flight(
+    game_id: uuid.UUID,
+    req: AdvanceRequest,
+    session: AsyncSession,
+    flight_key: str,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]],
+):
+    settings = get_settings()
+    ttl = settings.llm_request_deadline_seconds + ADVANCE_FLIGHT_GRACE_SECONDS
+    async with session.begin():
+        flight_id, is_leader = await claim_advance_flight(session, game_id, flight_key, ttl)
+    if not is_leader:
+        stored = await wait_for_advance_flight(
+            session, flight_id, poll_interval=settings.advance_single_flight_poll_seconds, timeout=ttl
+        )
+        if stored is not None:
+            _ADVANCE_FLIGHTS.stats["coalesced_shared"] += 1
+            return JSONResponse(status_code=stored[0], content=stored[1])
+        # The other worker's flight expired without a result; run this request on its own.
+        return await run_advance(game_id, req, session, is_disconnected=is_disconnected)
+
+    stored: Optional[Tuple[int, Any]] = None
+    try:
+        result = await run_advance(game_id, req, session, is_disconnected=is_disconnected)
+        stored = _advance_result_body(result)
+        return result
+    except HTTPException as exc:
+        stored = (exc.status_code, {"detail": exc.detail})
+        raise
+    except Exception:
+        stored = (500, {"detail": "Internal Server Error"})
+        raise
+    finally:
+        # Shielded, so a cancelled leader still releases its row: duplicates run on their own right away
+        # instead of waiting for the flight to expire.
+        await asyncio.shield(_settle_advance_flight(flight_id, stored))
+
+
+async def _settle_advance_flight(flight_id: uuid.UUID, stored: Optional[Tuple[int, Any]]) -> None:
+    # Own session: after a cancellation the request session may be left mid-transaction.
+    async with get_session_maker()() as session:
+        async with session.begin():
+            if stored is None or stored[0] == 499:
+                await abandon_advance_flight(session, flight_id)
+            else:
+                await finish_advance_flight(session, flight_id, stored[0], stored[1])
+
+
+async def single_flight_advance(
+    game_id: uuid.UUID,
+    req: AdvanceRequest,
+    session: AsyncSession,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+):
+    """Run an advance, sharing the outcome with identical (game, event, payload) calls already in flight."""
+    settings = get_settings()
+    if not settings.advance_single_flight_enabled:
+        return await run_advance(game_id, req, session, is_disconnected=is_disconnected)
+    flight_key = advance_flight_key(game_id, req.event, req.payload)
+
+    async def run():
+        if settings.advance_single_flight_shared:
+            return await _run_shared_advance_flight(game_id, req, session, flight_key, is_disconnected)
+        return await run_advance(game_id, req, session, is_disconnected=is_disconnected)
+
+    # Duplicates joining the flight also get the leader's recorded writes for delta responses.
+    result, writes = await _ADVANCE_FLIGHTS.run(
+        flight_key, lambda: record_advance_writes(run), shareable=lambda outcome: _shareable_advance_result(outcome[0])
+    )
+    caller_writes = current_advance_writes()
+    if caller_writes is not None and caller_writes is not writes:
+        caller_writes.merge(writes)
+    return result
+
+
+def default_job_handlers() -> Dict[str, JobHandler]:
+    return {"advance": _run_advance_job}
+
+
+@asynccontextmanager
+async def _transaction_then(session: AsyncSession, after_commit: List[Callable[[], None]]):
+    """`session.begin()`, then run `after_commit` once the transaction has committed (not on rollback)."""
+    async with session.begin():
+        yield
+    for callback in after_commit:
+        callback()
+
+
+async def run_advance(
+    game_id: uuid.UUID,
+    req: AdvanceRequest,
+    session: AsyncSession,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+):
+    """Apply one advance event; shared by the /advance endpoint and the background job worker."""
     event = req.event
-    if event == "ISSUE_DEBATE_STEP":
-        openai_payload: Optional[Dict[str, Any]] = None
-        openai_prompt = ""
-        openai_request: Optional[LLMRequest] = None
-        openai_provider = None
-        openai_provider_name = "fake"
-        openai_model_name: Optional[str] = None
-        openai_issue_id: Optional[str] = None
-        openai_debate_round = 1
-        openai_human_choice = "random"
+    llm_deadline = time.monotonic() + get_settings().llm_request_deadline_seconds
+    if event in ("ISSUE_DEBATE_STEP", "HUMAN_DEBATE_MESSAGE"):
+        # Phase 1: pick the pending AI speaker and build its request; the row lock is released before generating.
+        speech_plan: Optional[Dict[str, Any]] = None
         async with session.begin():
             game = await fetch_game_with_state(session, game_id)
             state = game["state"]
@@ -753,109 +1559,107 @@ async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSe
             if current_status in ("ISSUE_DEBATE_ROUND_1", "ISSUE_DEBATE_ROUND_2"):
                 ai = state.get("round3", {}).get("active_issue") or {}
                 issue_id = ai.get("issue_id", "1")
-                openai_issue_id = issue_id
-                openai_human_choice = ai.get("human_placement_choice", "random")
                 debate_round = ai.get("debate_round", 1)
-                openai_debate_round = debate_round
                 cursor = int(ai.get("debate_cursor", 0))
                 queue = ai.get("debate_queue", [])
-                if cursor < len(queue):
+                if cursor < len(queue) and queue[cursor] != state.get("human_role_id"):
                     speaker = queue[cursor]
-                    human_role = state.get("human_role_id")
-                    is_human = speaker == human_role
                     settings = get_settings()
-                    openai_provider = get_llm_provider(app.state)
-                    openai_provider_name = getattr(openai_provider, "provider_name", "fake")
-                    openai_model_name = getattr(openai_provider, "model_name", None)
-                    use_openai_r3 = should_use_openai_round3(settings, openai_provider_name, debate_round, speaker)
+                    speech_provider: Optional[LLMProvider] = get_llm_provider(app.state)
+                    speech_provider_name = getattr(speech_provider, "provider_name", "fake")
+                    speech_model_name = getattr(speech_provider, "model_name", None)
+                    use_provider_r3 = should_use_provider_round3(settings, speech_provider_name, debate_round, speaker)
                     if settings.mercury_env == "dev":
                         logger.info(
-                            "Round3 debate provider selection (preflight)",
+                            "Round3 debate provider selection",
                             extra={
                                 "status": current_status,
                                 "debate_round": debate_round,
                                 "speaker": speaker,
-                                "provider_name": openai_provider_name,
-                                "model_name": openai_model_name,
-                                "use_openai": use_openai_r3,
+                                "provider_name": speech_provider_name,
+                                "model_name": speech_model_name,
+                                "use_provider": use_provider_r3,
                                 "openai_round3_debate_speeches": settings.openai_round3_debate_speeches,
                                 "llm_provider_env": os.getenv("LLM_PROVIDER"),
                             },
                         )
-                    if (
-                        use_openai_r3
-                        and not is_human
-                        and openai_provider_name == "openai"
-                    ):
-                        speech_number = 1 if debate_round == 1 else 2
-                        prompt_payload = build_round3_debate_speech_prompt_v1(
-                            state=state,
-                            active_issue=ai,
-                            speaker_role=speaker,
-                            debate_round=debate_round,
-                            speech_number=speech_number,
-                            public_debate_tail=[],
+                    library_speech = None
+                    if settings.speech_library_enabled:
+                        library_speech = await select_library_speech(
+                            session, state, speaker, issue_id, debate_round, game["seed"]
                         )
-                        openai_prompt = prompt_payload["prompt_text"]
-                        openai_payload = prompt_payload["request_payload"]
-                        openai_request = cast(
+                    prompt_payload = build_round3_debate_speech_prompt_v1(
+                        state=state,
+                        active_issue=ai,
+                        speaker_role=speaker,
+                        debate_round=debate_round,
+                        speech_number=1 if debate_round == 1 else 2,
+                        public_debate_tail=[],
+                        token_budget=settings.prompt_token_budgets.get("r3_debate_speech_v1"),
+                    )
+                    speech_request = apply_output_limits(
+                        cast(
                             LLMRequest,
                             {
                                 "game_id": str(game_id),
                                 "role_id": speaker,
                                 "status": current_status,
                                 "prompt_version": "r3_debate_speech_v1",
-                                "prompt": openai_prompt,
-                                "request_payload": openai_payload,
+                                "prompt": prompt_payload["prompt_text"],
+                                "request_payload": prompt_payload["request_payload"],
+                                "deadline": llm_deadline,
                             },
                         )
-        if openai_request and openai_provider:
-            required_request = cast(_RequiredLLMRequest, openai_request)
-            openai_role_id = required_request["role_id"]
-            openai_status = required_request["status"]
-            openai_prompt_version = required_request["prompt_version"]
-            openai_request_payload = required_request["request_payload"]
-            try:
-                llm_response = await openai_provider.generate(openai_request)
-                llm_response = validate_llm_response(llm_response)
-            except ValidationError as e:
-                error_payload: Dict[str, Any] = {"error": {"type": "ValidationError", "message": str(e)}}
-                error_payload["error_type"] = e.__class__.__name__
-                error_payload["error_message"] = str(e)
-                async with session.begin():
-                    await insert_llm_trace(
-                        session,
-                        game_id,
-                        openai_role_id,
-                        openai_status,
-                        provider=openai_provider_name,
-                        model=openai_model_name,
-                        prompt_version=openai_prompt_version,
-                        request_payload=openai_request_payload,
-                        response_payload=error_payload,
                     )
-                # OpenAI Speech-1 failures return 502 with no transcript/state advance.
-                return JSONResponse(status_code=502, content={"detail": "LLM response validation failed"})
-            except Exception as e:
-                error_payload: Dict[str, Any] = {"error": {"type": e.__class__.__name__, "message": str(e)}}
-                error_payload["error_type"] = e.__class__.__name__
-                error_payload["error_message"] = str(e)
-                async with session.begin():
-                    await insert_llm_trace(
-                        session,
-                        game_id,
-                        openai_role_id,
-                        openai_status,
-                        provider=openai_provider_name,
-                        model=openai_model_name,
-                        prompt_version=openai_prompt_version,
-                        request_payload=openai_request_payload,
-                        response_payload=error_payload,
-                    )
-                # OpenAI Speech-1 failures return 502 with no transcript/state advance.
-                return JSONResponse(status_code=502, content={"detail": "LLM generation failed"})
+                    if library_speech is not None:
+                        speech_provider = None
+                        speech_provider_name = "speech_library"
+                        speech_model_name = library_speech.get("model")
+                    elif not use_provider_r3:
+                        speech_provider = FakeLLMProvider(get_ai_responder())
+                        speech_provider_name = "fake"
+                        speech_model_name = "fake"
+                    speech_plan = {
+                        "status": current_status,
+                        "issue_id": issue_id,
+                        "debate_round": debate_round,
+                        "cursor": cursor,
+                        "speaker": speaker,
+                        "request": speech_request,
+                        "provider": speech_provider,
+                        "provider_name": speech_provider_name,
+                        "model_name": speech_model_name,
+                        "library_speech": library_speech,
+                    }
+        if speech_plan is not None:
+            # Phase 2: generate with no transaction (and no pooled connection) held.
+            speech_request = speech_plan["request"]
+            library_speech = speech_plan["library_speech"]
+            if library_speech is not None:
+                reply = library_speech["speech_text"]
+                trace_response_payload: Dict[str, Any] = {
+                    "assistant_text": reply,
+                    "speech_variant_id": str(library_speech["id"]),
+                    "stance_bucket": library_speech["stance_bucket"],
+                }
+                llm_latency_ms = 0
+            else:
+                outcome = await generate_unlocked(
+                    session,
+                    game_id,
+                    speech_plan["provider"],
+                    speech_request,
+                    provider_name=speech_plan["provider_name"],
+                    model_name=speech_plan["model_name"],
+                    is_disconnected=is_disconnected,
+                )
+                if isinstance(outcome, Response):
+                    return outcome
+                llm_response, llm_latency_ms = outcome
+                reply = llm_response.get("assistant_text", "")
+                trace_response_payload = dict(llm_response)
 
-            reply = llm_response.get("assistant_text", "")
+            # Phase 3: re-read under lock and only apply the speech if the same turn is still pending.
             async with session.begin():
                 game = await fetch_game_with_state(session, game_id)
                 state = game["state"]
@@ -871,17 +1675,27 @@ async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSe
                 if cursor >= len(queue):
                     raise HTTPException(status_code=400, detail="No pending speaker")
                 speaker = queue[cursor]
+                if (current_status, issue_id, debate_round, cursor, speaker) != (
+                    speech_plan["status"],
+                    speech_plan["issue_id"],
+                    speech_plan["debate_round"],
+                    speech_plan["cursor"],
+                    speech_plan["speaker"],
+                ):
+                    raise HTTPException(status_code=409, detail="Debate advanced during generation; retry")
 
                 await insert_llm_trace(
                     session,
                     game_id,
-                    openai_role_id,
-                    openai_status,
-                    provider=openai_provider_name,
-                    model=openai_model_name,
-                    prompt_version=openai_prompt_version,
-                    request_payload=openai_request_payload,
-                    response_payload=dict(llm_response),
+                    speaker,
+                    current_status,
+                    provider=speech_plan["provider_name"],
+                    model=speech_plan["model_name"],
+                    prompt_version=speech_request.get("prompt_version"),
+                    request_payload=speech_request.get("request_payload"),
+                    response_payload=trace_response_payload,
+                    latency_ms=llm_latency_ms,
+                    prompt=speech_request.get("prompt"),
                 )
                 transcript_id = await insert_transcript_entry(
                     session,
@@ -896,7 +1710,7 @@ async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSe
                 ai["debate_cursor"] = cursor + 1
                 state["round3"]["active_issue"] = ai
                 issue_spec = _issue_option_spec_from_active_issue(issue_id, ai.get("options", []))
-                reasons = _apply_stance_shifts_for_roles(
+                reasons = apply_stance_shifts_for_roles(
                     state=state,
                     role_ids=[speaker],
                     round_id=3,
@@ -977,7 +1791,7 @@ async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSe
                 convo["final_human_sent"] = True
             issues = await fetch_issue_definitions(session)
             issue_spec = _issue_option_spec_from_defs(issues)
-            reasons = _apply_stance_shifts_for_roles(
+            reasons = apply_stance_shifts_for_roles(
                 state=state,
                 role_ids=[human_role_id, partner],
                 round_id=2,
@@ -1022,6 +1836,7 @@ async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSe
             ai_turns=ai_turns_used,
             human_role=human_role_id,
             context=round2_context,
+            token_budget=get_settings().prompt_token_budgets.get(ROUND2_PROMPT_VERSION),
         )
         llm_request: LLMRequest = {
             "game_id": str(game_id),
@@ -1036,53 +1851,24 @@ async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSe
                 "human_turns": human_turns_used,
                 "ai_turns": ai_turns_used,
             },
+            "deadline": llm_deadline,
         }
+        apply_output_limits(llm_request)
         provider_name = getattr(provider, "provider_name", "fake")
         model_name = getattr(provider, "model_name", "fake")
-        try:
-            llm_response = await provider.generate(llm_request)
-            llm_response = validate_llm_response(llm_response)
-        except ValidationError as e:
-            error_payload: Dict[str, Any] = {"error": {"type": "ValidationError", "message": str(e)}}
-            if provider_name == "openai":
-                error_payload["error_type"] = e.__class__.__name__
-                error_payload["error_message"] = str(e)
-            async with session.begin():
-                await insert_llm_trace(
-                    session,
-                    game_id,
-                    partner_role,
-                    current_status_local,
-                    provider=provider_name,
-                    model=model_name,
-                    prompt_version=llm_request.get("prompt_version"),
-                    request_payload=llm_request.get("request_payload"),
-                    response_payload=error_payload,
-                )
-            if provider_name == "openai":
-                return JSONResponse(status_code=502, content={"detail": "LLM response validation failed"})
-            raise HTTPException(status_code=502, detail="LLM response validation failed")
-        except Exception as e:
-            error_payload: Dict[str, Any] = {"error": {"type": e.__class__.__name__, "message": str(e)}}
-            if provider_name == "openai":
-                error_payload["error_type"] = e.__class__.__name__
-                error_payload["error_message"] = str(e)
-            async with session.begin():
-                await insert_llm_trace(
-                    session,
-                    game_id,
-                    partner_role,
-                    current_status_local,
-                    provider=provider_name,
-                    model=model_name,
-                    prompt_version=llm_request.get("prompt_version"),
-                    request_payload=llm_request.get("request_payload"),
-                    response_payload=error_payload,
-                )
-            if provider_name == "openai":
-                return JSONResponse(status_code=502, content={"detail": "LLM generation failed"})
-            raise HTTPException(status_code=502, detail="LLM generation failed")
-
+        outcome = await generate_unlocked(
+            session,
+            game_id,
+            provider,
+            llm_request,
+            provider_name=provider_name,
+            model_name=model_name,
+            is_disconnected=is_disconnected,
+            detailed_errors=is_live_provider(provider_name),
+        )
+        if isinstance(outcome, Response):
+            return outcome
+        llm_response, llm_latency_ms = outcome
         success_state: Optional[Dict[str, Any]] = None
         async with session.begin():
             game = await fetch_game_with_state(session, game_id)
@@ -1101,6 +1887,13 @@ async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSe
 
             post_interrupt = bool(convo.get("post_interrupt"))
             ai_turns = int(convo.get("ai_turns_used", 0))
+            if (current_status, convo_key, partner, ai_turns) != (
+                current_status_local,
+                convo_key_local,
+                partner_role,
+                ai_turns_used,
+            ):
+                raise HTTPException(status_code=409, detail="Conversation advanced during generation; retry")
 
             await insert_llm_trace(
                 session,
@@ -1112,6 +1905,8 @@ async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSe
                 prompt_version=llm_request.get("prompt_version"),
                 request_payload=llm_request.get("request_payload"),
                 response_payload=dict(llm_response),
+                latency_ms=llm_latency_ms,
+                prompt=llm_request.get("prompt"),
             )
             reply = llm_response.get("assistant_text", "")
             ai_tid = await insert_transcript_entry(
@@ -1180,7 +1975,8 @@ async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSe
 
         return {"game_id": game_id, "state": success_state}
 
-    async with session.begin():
+    after_commit: List[Callable[[], None]] = []
+    async with _transaction_then(session, after_commit):
         game = await fetch_game_with_state(session, game_id)
         state = game["state"]
         current_status = game["status"]
@@ -1369,6 +2165,9 @@ async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSe
             state.setdefault("round2", {})
             state["round2"]["active_convo_index"] = None
             await persist_state(session, game_id, "ROUND_2_SELECT_CONVO_1", state, transcript_id)
+            if get_settings().round2_side_negotiations_enabled:
+                issues = await fetch_issue_definitions(session)
+                after_commit.append(lambda: start_side_negotiations(game_id, state, issues))
             return {"game_id": game_id, "state": state}
 
         if event == "CONVO_1_SELECTED":
@@ -1503,6 +2302,9 @@ async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSe
                 visible_to_human=True,
                 round_number=2,
             )
+            if get_settings().round2_side_negotiations_enabled:
+                issues = await fetch_issue_definitions(session)
+                await apply_side_negotiation_shifts(session, game_id, state, _issue_option_spec_from_defs(issues))
             await persist_state(session, game_id, "ROUND_3_SETUP", state, transcript_id)
             return {"game_id": game_id, "state": state}
 
@@ -1630,7 +2432,7 @@ async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSe
                     metadata={"issue_id": issue_id, "round": debate_round, "speaker": speaker},
                 )
                 issue_spec = _issue_option_spec_from_active_issue(issue_id, ai.get("options", []))
-                reasons = _apply_stance_shifts_for_roles(
+                reasons = apply_stance_shifts_for_roles(
                     state=state,
                     role_ids=[speaker],
                     round_id=3,
@@ -1645,109 +2447,8 @@ async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSe
                 await persist_state(session, game_id, current_status, state, transcript_id)
                 return {"game_id": game_id, "state": state}
 
-            # AI speaker
-            speech_number = 1 if debate_round == 1 else 2
-            prompt_payload = build_round3_debate_speech_prompt_v1(
-                state=state,
-                active_issue=ai,
-                speaker_role=speaker,
-                debate_round=debate_round,
-                speech_number=speech_number,
-                public_debate_tail=[],
-            )
-            prompt = prompt_payload["prompt_text"]
-            trace_request_payload = prompt_payload["request_payload"]
-            settings = get_settings()
-            provider = get_llm_provider(app.state)
-            provider_name = getattr(provider, "provider_name", "fake")
-            model_name = getattr(provider, "model_name", None)
-            use_openai_r3 = should_use_openai_round3(settings, provider_name, debate_round, speaker)
-            if settings.mercury_env == "dev":
-                responder = get_ai_responder() if not use_openai_r3 else None
-                logger.info(
-                    "Round3 debate provider selection",
-                    extra={
-                        "status": current_status,
-                        "debate_round": debate_round,
-                        "speaker": speaker,
-                        "provider_name": provider_name,
-                        "model_name": model_name,
-                        "use_openai": use_openai_r3,
-                        "openai_round3_debate_speeches": settings.openai_round3_debate_speeches,
-                        "llm_provider_env": os.getenv("LLM_PROVIDER"),
-                        "responder_class": responder.__class__.__name__ if responder else "OpenAIProvider",
-                    },
-                )
-            if use_openai_r3 and provider_name == "openai":
-                llm_request: LLMRequest = {
-                    "game_id": str(game_id),
-                    "role_id": speaker,
-                    "status": current_status,
-                    "prompt_version": "r3_debate_speech_v1",
-                    "prompt": prompt,
-                    "request_payload": trace_request_payload,
-                }
-                llm_response = await provider.generate(llm_request)
-                llm_response = validate_llm_response(llm_response)
-                reply = llm_response.get("assistant_text", "")
-            else:
-                provider_name = "fake"
-                model_name = "fake"
-                reply = await get_ai_responder().respond(prompt)
-            await insert_llm_trace(
-                session,
-                game_id,
-                speaker,
-                current_status,
-                provider=provider_name,
-                model=model_name,
-                prompt_version="r3_debate_speech_v1",
-                request_payload=trace_request_payload,
-                response_payload={"assistant_text": reply},
-            )
-            transcript_id = await insert_transcript_entry(
-                session,
-                game_id,
-                role_id=speaker,
-                phase=current_status,
-                content=reply,
-                visible_to_human=True,
-                round_number=3,
-                metadata={"issue_id": issue_id, "round": debate_round, "speaker": speaker},
-            )
-            issue_spec = _issue_option_spec_from_active_issue(issue_id, ai.get("options", []))
-            reasons = _apply_stance_shifts_for_roles(
-                state=state,
-                role_ids=[speaker],
-                round_id=3,
-                issue_id=issue_id,
-                trigger_text=reply,
-                issue_option_spec=issue_spec,
-            )
-            if reasons:
-                state.setdefault("round3", {}).setdefault("stance_log", []).extend(reasons)
-            ai["debate_cursor"] = cursor + 1
-            state["round3"]["active_issue"] = ai
-            await persist_state(session, game_id, current_status, state, transcript_id)
-
-            # After writing, check if we should transition on next call
-            if ai["debate_cursor"] >= len(queue):
-                if current_status == "ISSUE_DEBATE_ROUND_1":
-                    countries = sorted([r for r in state.get("roles", {}) if state["roles"][r].get("type") == "country"])
-                    ngos = sorted([r for r in state.get("roles", {}) if state["roles"][r].get("type") == "ngo"])
-                    human_role = state.get("human_role_id")
-                    seed = game["seed"]
-                    countries = _human_placement(countries, human_role, human_choice, seed, f"{issue_id}-countries-2")
-                    ngos = _human_placement(ngos, human_role, human_choice, seed, f"{issue_id}-ngos-2")
-                    ai["debate_queue"] = countries + ngos
-                    ai["debate_cursor"] = 0
-                    ai["debate_round"] = 2
-                    state["round3"]["active_issue"] = ai
-                    await persist_state_no_checkpoint(session, game_id, "ISSUE_DEBATE_ROUND_2", state)
-                else:
-                    await persist_state_no_checkpoint(session, game_id, "ISSUE_POSITION_FINALIZATION", state)
-
-            return {"game_id": game_id, "state": state}
+            # AI speeches are generated outside the transaction by the ISSUE_DEBATE_STEP path above.
+            raise HTTPException(status_code=400, detail="AI debate turn requires ISSUE_DEBATE_STEP")
 
         if current_status == "ISSUE_POSITION_FINALIZATION":
             current_status = "ISSUE_PROPOSAL_SELECTION"
@@ -1877,7 +2578,9 @@ async def advance_game(game_id: uuid.UUID, req: AdvanceRequest, session: AsyncSe
                 if not all_closed and isinstance(state.get("round3"), dict):
                     state["round3"]["active_issue"] = None
                 state["status"] = next_status
-                await persist_state(session, game_id, next_status, state, res_tid)
+                state_version = await persist_state(session, game_id, next_status, state, res_tid)
+                if next_status == REVIEW_STATUS:
+                    await materialize_review(session, game_id, state_version)
                 return {"game_id": game_id, "state": state}
 
             # Unsupported event while in ISSUE_RESOLUTION
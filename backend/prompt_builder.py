@@ -1,19 +1,74 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from pathlib import Path
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
-_ROUND2_BEHAVIOR_PATH = Path(__file__).resolve().parent / "prompts" / "round2_behavior_instructions_v1.txt"
+_ROUND2_BEHAVIOR_PATH = Path(__file__).resolve().parent / "prompts" / "round2_behavior_instructions_v2.txt"
 _ROUND2_BEHAVIOR_TEMPLATE: Optional[str] = None
+_ROUND2_ROLE_PREAMBLE_PATH = Path(__file__).resolve().parent / "prompts" / "round2_role_preamble_v1.txt"
+_ROUND2_ROLE_PREAMBLE_TEMPLATE: Optional[str] = None
 _ROUND3_DEBATE_SPEECH_INSTRUCTIONS_PATH = (
     Path(__file__).resolve().parent / "prompts" / "round3_debate_speech_instructions_v1.txt"
 )
 _ROUND3_DEBATE_SPEECH_INSTRUCTIONS_TEMPLATE: Optional[str] = None
+# Bump when the Round 2 prompt text or layout changes; budgets, output limits and traces are keyed by it.
+ROUND2_PROMPT_VERSION = "r2_convo_v4"
 ROUND3_PUBLIC_DEBATE_TAIL_LIMIT = 8
 ROUND3_DEBATE_SNIPPET_LEN = 240
+CHARS_PER_TOKEN = 4
+DEFAULT_PROMPT_TOKEN_BUDGETS: Dict[str, int] = {
+    ROUND2_PROMPT_VERSION: 3500,
+    "r3_debate_speech_v1": 1500,
+}
+TRIMMED_OPTION_LIMIT = 4
+MIN_TRANSCRIPT_TAIL = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap provider-agnostic estimate (~4 characters per token); good enough to budget prompt size."""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def resolve_token_budget(prompt_version: str, token_budget: Optional[int]) -> Optional[int]:
+    budget = token_budget if token_budget is not None else DEFAULT_PROMPT_TOKEN_BUDGETS.get(prompt_version)
+    if budget is None or budget <= 0:
+        return None
+    return budget
+
+
+def fit_prompt_to_budget(
+    render: Callable[[], str],
+    trim_steps: List[Tuple[str, Callable[[], bool]]],
+    token_budget: Optional[int],
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Render, then apply trim steps in priority order until the estimate fits the budget.
+    Each step mutates the context it closes over and returns False once it has nothing left to trim.
+    """
+    prompt_text = render()
+    untrimmed = estimate_tokens(prompt_text)
+    applied: List[str] = []
+    if token_budget is not None:
+        for name, step in trim_steps:
+            while estimate_tokens(prompt_text) > token_budget and step():
+                prompt_text = render()
+                if name not in applied:
+                    applied.append(name)
+            if estimate_tokens(prompt_text) <= token_budget:
+                break
+    token_info: Dict[str, Any] = {
+        "token_budget": token_budget,
+        "estimated_tokens": estimate_tokens(prompt_text),
+        "estimated_tokens_untrimmed": untrimmed,
+        "trimmed": applied,
+    }
+    return prompt_text, token_info
 
 
 def build_round2_conversation_prompt(
@@ -28,18 +83,24 @@ def build_round2_conversation_prompt(
     ai_turns: int,
     human_role: str,
     context: Optional[Dict[str, Any]] = None,
+    token_budget: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Centralized Round 2 prompt builder (deterministic).
     Keeps current FakeLLM behavior by using the human content as the prompt text.
+    Context is trimmed in place, lowest-value parts first, until the prompt fits the token budget.
     """
-    prompt_version = "r2_convo_v3"
+    prompt_version = ROUND2_PROMPT_VERSION
     context_payload = context or {}
-    prompt_text = _render_round2_prompt(
-        human_content=human_content,
-        context=context_payload,
-        role=role_id,
-        human_role=human_role,
+    prompt_text, token_info = fit_prompt_to_budget(
+        lambda: _render_round2_prompt(
+            human_content=human_content,
+            context=context_payload,
+            role=role_id,
+            human_role=human_role,
+        ),
+        _round2_trim_steps(context_payload),
+        resolve_token_budget(prompt_version, token_budget),
     )
     request_payload: Dict[str, Any] = {
         "game_id": game_id,
@@ -52,6 +113,8 @@ def build_round2_conversation_prompt(
         "prompt": prompt_text,
         "prompt_version": prompt_version,
         "context": context_payload,
+        "token_estimate": token_info,
+        "static_prefix_hash": _static_prefix_hash(_round2_static_prefix(context_payload)),
     }
     return {
         "prompt_version": prompt_version,
@@ -60,6 +123,59 @@ def build_round2_conversation_prompt(
     }
 
 
+def _round2_trim_steps(context: Dict[str, Any]) -> List[Tuple[str, Callable[[], bool]]]:
+    def drop_oldest_tail(minimum: int) -> Callable[[], bool]:
+        def step() -> bool:
+            tail = context.get("transcript_tail")
+            if not isinstance(tail, list) or len(tail) <= minimum:
+                return False
+            del tail[0]
+            return True
+
+        return step
+
+    def summarize_openings() -> bool:
+        openings = context.get("openings")
+        if not isinstance(openings, dict):
+            return False
+        changed = False
+        human_text = openings.get("human_opening_text")
+        if isinstance(human_text, str):
+            summary = _summarize_public_opening(human_text)
+            if summary != human_text:
+                openings["human_opening_text"] = summary
+                changed = True
+        partner = openings.get("partner_opening")
+        if isinstance(partner, dict) and isinstance(partner.get("text"), str):
+            summary = _summarize_public_opening(partner["text"])
+            if summary != partner["text"]:
+                partner["text"] = summary
+                changed = True
+        return changed
+
+    def trim_options() -> bool:
+        return _trim_option_lists(context.get("issues"), TRIMMED_OPTION_LIMIT)
+
+    return [
+        ("transcript_tail", drop_oldest_tail(MIN_TRANSCRIPT_TAIL)),
+        ("opening_summaries", summarize_openings),
+        ("option_lists", trim_options),
+        ("transcript_tail_min", drop_oldest_tail(1)),
+    ]
+
+
+def _trim_option_lists(issues: Any, limit: int) -> bool:
+    if not isinstance(issues, list):
+        return False
+    changed = False
+    for issue in issues:
+        options = issue.get("options") if isinstance(issue, dict) else None
+        if isinstance(options, list) and len(options) > limit:
+            del options[limit:]
+            changed = True
+    return changed
+
+
 def build_round2_context(
     *,
     game_id: str,
@@ -138,7 +254,11 @@ def _render_round2_prompt(
     role: str,
     human_role: str,
 ) -> str:
-    instructions = _load_round2_behavior_instructions(role=role, human_role=human_role)
+    """
+    Layout is ordered for provider prompt caching: the static instructions and the shared issue
+    catalogue form a byte-stable prefix; role-specific and per-turn content follows it.
+    """
+    role_preamble = _load_round2_role_preamble(role=role, human_role=human_role)
     transcript_tail = context.get("transcript_tail") or []
     compact_transcript = [
         {"role_id": entry.get("role_id"), "content": entry.get("content")}
@@ -146,47 +266,67 @@ def _render_round2_prompt(
         if isinstance(entry, dict)
     ]
     openings = context.get("openings") or {}
-    issues = context.get("issues")
-    compact_issues = None
-    if isinstance(issues, list):
-        compact_issues = []
-        for issue in issues:
-            if not isinstance(issue, dict):
-                continue
-            options = issue.get("options") or []
-            compact_options = []
-            if isinstance(options, list):
-                for opt in options:
-                    if not isinstance(opt, dict):
-                        continue
-                    compact_options.append(
-                        {"option_id": opt.get("option_id"), "label": opt.get("label")}
-                    )
-            compact_issues.append(
-                {
-                    "issue_id": issue.get("issue_id"),
-                    "title": issue.get("title"),
-                    "options": compact_options,
-                }
-            )
     context_block = {
         "openings": openings,
         "transcript_tail": compact_transcript,
     }
-    if compact_issues is not None:
-        context_block["issues"] = compact_issues
     context_json = json.dumps(context_block, sort_keys=True, separators=(",", ":"))
-    return f"{instructions}\n\nContext:\n{context_json}\n\nHuman message:\n{human_content}"
+    return (
+        f"{_round2_static_prefix(context)}\n\n{role_preamble}\n\n"
+        f"Context:\n{context_json}\n\nHuman message:\n{human_content}"
+    )
+
+
+def _round2_static_prefix(context: Dict[str, Any]) -> str:
+    instructions = _load_round2_behavior_instructions()
+    issues = context.get("issues")
+    if not isinstance(issues, list):
+        return instructions
+    compact_issues = []
+    for issue in issues:
+        if not isinstance(issue, dict):
+            continue
+        options = issue.get("options") or []
+        compact_options = []
+        if isinstance(options, list):
+            for opt in options:
+                if not isinstance(opt, dict):
+                    continue
+                compact_options.append(
+                    {"option_id": opt.get("option_id"), "label": opt.get("label")}
+                )
+        compact_issues.append(
+            {
+                "issue_id": issue.get("issue_id"),
+                "title": issue.get("title"),
+                "options": compact_options,
+            }
+        )
+    issues_json = json.dumps(compact_issues, sort_keys=True, separators=(",", ":"))
+    return f"{instructions}\n\nIssues:\n{issues_json}"
 
 
-def _load_round2_behavior_instructions(*, role: str, human_role: str) -> str:
+def _static_prefix_hash(prefix: str) -> str:
+    return hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16]
+
+
+def _load_round2_behavior_instructions() -> str:
     global _ROUND2_BEHAVIOR_TEMPLATE
     if _ROUND2_BEHAVIOR_TEMPLATE is None:
         if not _ROUND2_BEHAVIOR_PATH.exists():
             raise RuntimeError(f"Round 2 instructions file not found: {_ROUND2_BEHAVIOR_PATH}")
         _ROUND2_BEHAVIOR_TEMPLATE = _ROUND2_BEHAVIOR_PATH.read_text(encoding="utf-8")
+    return _ROUND2_BEHAVIOR_TEMPLATE.strip()
+
+
+def _load_round2_role_preamble(*, role: str, human_role: str) -> str:
+    global _ROUND2_ROLE_PREAMBLE_TEMPLATE
+    if _ROUND2_ROLE_PREAMBLE_TEMPLATE is None:
+        if not _ROUND2_ROLE_PREAMBLE_PATH.exists():
+            raise RuntimeError(f"Round 2 role preamble file not found: {_ROUND2_ROLE_PREAMBLE_PATH}")
+        _ROUND2_ROLE_PREAMBLE_TEMPLATE = _ROUND2_ROLE_PREAMBLE_PATH.read_text(encoding="utf-8")
     return (
-        _ROUND2_BEHAVIOR_TEMPLATE.replace("{ROLE}", role)
+        _ROUND2_ROLE_PREAMBLE_TEMPLATE.replace("{ROLE}", role)
         .replace("{HUMAN_ROLE}", human_role)
         .strip()
     )
@@ -200,6 +340,7 @@ def build_round3_debate_speech_prompt_v1(
     debate_round: int,
     speech_number: int = 1,
     public_debate_tail: List[Dict[str, Any]],
+    token_budget: Optional[int] = None,
 ) -> Dict[str, Any]:
     issue_id = active_issue.get("issue_id")
     issue_title = active_issue.get("issue_title")
@@ -251,6 +392,24 @@ def build_round3_debate_speech_prompt_v1(
     }
 
     prompt_version = "r3_debate_speech_v1"
+    instructions = _load_round3_debate_speech_instructions()
+
+    def static_prefix() -> str:
+        # Instructions plus the issue block are identical for every speaker on the same issue.
+        issue_json = json.dumps(context_payload["active_issue"], sort_keys=True, separators=(",", ":"))
+        return f"{instructions}\n\nIssue:\n{issue_json}"
+
+    def render() -> str:
+        dynamic = {key: value for key, value in context_payload.items() if key != "active_issue"}
+        context_json = json.dumps(dynamic, sort_keys=True, separators=(",", ":"))
+        return f"{static_prefix()}\n\nContext:\n{context_json}\n\nSpeech:\n"
+
+    prompt_text, token_info = fit_prompt_to_budget(
+        render,
+        _round3_trim_steps(context_payload),
+        resolve_token_budget(prompt_version, token_budget),
+    )
+    opening_summary = context_payload["speaker_opening_summary"]
     request_payload: Dict[str, Any] = {
         "prompt_version": prompt_version,
         "speech_number": speech_number,
@@ -266,15 +425,51 @@ def build_round3_debate_speech_prompt_v1(
         "debate_transcript_tail": tail_payload,
         "debate_round": debate_round,
         "context": context_payload,
+        "token_estimate": token_info,
+        "static_prefix_hash": _static_prefix_hash(static_prefix()),
     }
 
-    instructions = _load_round3_debate_speech_instructions()
-    context_json = json.dumps(context_payload, sort_keys=True, separators=(",", ":"))
-    prompt_text = f"{instructions}\n\nContext:\n{context_json}\n\nSpeech:\n"
-
     return {"prompt_text": prompt_text, "request_payload": request_payload}
 
 
+def _round3_trim_steps(context: Dict[str, Any]) -> List[Tuple[str, Callable[[], bool]]]:
+    def drop_oldest_tail(minimum: int) -> Callable[[], bool]:
+        def step() -> bool:
+            tail = context.get("debate_transcript_tail")
+            if not isinstance(tail, list) or len(tail) <= minimum:
+                return False
+            del tail[0]
+            return True
+
+        return step
+
+    def shorten_opening_summary() -> bool:
+        summary = context.get("speaker_opening_summary")
+        limit = ROUND3_DEBATE_SNIPPET_LEN // 2
+        if not isinstance(summary, str) or len(summary) <= limit:
+            return False
+        context["speaker_opening_summary"] = summary[:limit]
+        return True
+
+    def compact_options() -> bool:
+        options = context.get("active_issue", {}).get("options")
+        if not isinstance(options, list):
+            return False
+        changed = False
+        for opt in options:
+            if isinstance(opt, dict) and opt.get("short_text") not in (None, opt.get("label")):
+                opt["short_text"] = opt.get("label")
+                changed = True
+        return changed
+
+    return [
+        ("debate_transcript_tail", drop_oldest_tail(MIN_TRANSCRIPT_TAIL)),
+        ("opening_summary", shorten_opening_summary),
+        ("option_lists", compact_options),
+        ("debate_transcript_tail_min", drop_oldest_tail(0)),
+    ]
+
+
 def _load_round3_debate_speech_instructions() -> str:
     global _ROUND3_DEBATE_SPEECH_INSTRUCTIONS_TEMPLATE
     if _ROUND3_DEBATE_SPEECH_INSTRUCTIONS_TEMPLATE is None:
@@ -344,7 +539,9 @@ def _build_round3_role_type_context(role_info: Dict[str, Any]) -> Dict[str, str]
 
 
 __all__ = [
+    "DEFAULT_PROMPT_TOKEN_BUDGETS",
     "build_round2_conversation_prompt",
     "build_round2_context",
     "build_round3_debate_speech_prompt_v1",
+    "estimate_tokens",
 ]
@@ -0,0 +1,141 @@
+"""
+Materialized end-of-game review documents.
+
+The review (the full visible transcript plus the Round 3 votes) is built once, when a game enters REVIEW.
+It is stored as gzip-compressed JSON in `game_reviews` together with the state version it was built
+from. `GET /games/{id}/review` serves the stored bytes while that version is still current. Any later
+state write bumps `game_state.version`, which invalidates the stored document, and the next read
+rebuilds it.
+"""
+
+import datetime
+import gzip
+import json
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+REVIEW_STATUS = "REVIEW"
+
+
+def _iso(value: Any) -> str:
+    return value.replace(tzinfo=datetime.timezone.utc).isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+async def build_review(session: AsyncSession, game_id: uuid.UUID) -> Dict[str, Any]:
+    # Transcript: include all except round2 hidden; require ordering by created_at then id
+    result = await session.execute(
+        text(
+            """
+            SELECT id, game_id, role_id, phase, round, issue_id, visible_to_human, content, metadata, created_at
+            FROM transcript_entries
+            WHERE game_id = :gid
+              AND (
+                (round = 2 AND visible_to_human = true) OR (round != 2 OR round IS NULL)
+              )
+            ORDER BY created_at ASC, COALESCE((metadata->>'index')::int, 0) ASC, id ASC
+            """
+        ),
+        {"gid": str(game_id)},
+    )
+    transcript = [
+        {
+            "id": str(row["id"]),
+            "game_id": str(row["game_id"]),
+            "role_id": row["role_id"],
+            "phase": row["phase"],
+            "round": row["round"],
+            "issue_id": row["issue_id"],
+            "visible_to_human": row["visible_to_human"],
+            "content": row["content"],
+            "metadata": row["metadata"],
+            "created_at": _iso(row["created_at"]),
+        }
+        for row in result.mappings()
+    ]
+
+    votes_rows = await session.execute(
+        text(
+            """
+            SELECT id, issue_id, proposal_option_id, votes_by_country, passed, created_at
+            FROM votes
+            WHERE game_id = :gid
+            ORDER BY created_at ASC, id ASC
+            """
+        ),
+        {"gid": str(game_id)},
+    )
+    votes = [
+        {
+            "id": str(row["id"]),
+            "issue_id": row["issue_id"],
+            "proposal_option_id": row["proposal_option_id"],
+            "votes_by_country": row["votes_by_country"],
+            "passed": row["passed"],
+            "created_at": _iso(row["created_at"]),
+        }
+        for row in votes_rows.mappings()
+    ]
+    return {"game_id": str(game_id), "transcript": transcript, "votes": votes}
+
+
+def encode_review(review: Dict[str, Any]) -> bytes:
+    return json.dumps(review, separators=(",", ":")).encode("utf-8")
+
+
+async def store_review(session: AsyncSession, game_id: uuid.UUID, state_version: int, body: bytes) -> None:
+    """Store the encoded review for `state_version`; a document for a newer version is never replaced."""
+    await session.execute(
+        text(
+            """
+            INSERT INTO game_reviews (game_id, state_version, body)
+            VALUES (:game_id, :state_version, :body)
+            ON CONFLICT (game_id) DO UPDATE
+              SET state_version = EXCLUDED.state_version, body = EXCLUDED.body, created_at = now()
+              WHERE game_reviews.state_version <= EXCLUDED.state_version
+            """
+        ),
+        {"game_id": str(game_id), "state_version": state_version, "body": gzip.compress(body)},
+    )
+
+
+async def materialize_review(session: AsyncSession, game_id: uuid.UUID, state_version: int) -> bytes:
+    """Build and store the review inside the caller's transaction (the REVIEW transition)."""
+    body = encode_review(await build_review(session, game_id))
+    await store_review(session, game_id, state_version, body)
+    return body
+
+
+async def fetch_stored_review(session: AsyncSession, game_id: uuid.UUID) -> Tuple[Optional[bytes], Optional[int], Optional[str]]:
+    """
+    (gzip body if still current, current state version, game status) in one lookup. The body is None
+    when no review is stored or it was built from an older state version.
+    """
+    result = await session.execute(
+        text(
+            """
+            SELECT gs.version, g.status, r.body
+            FROM game_state gs
+            JOIN games g ON g.id = gs.game_id
+            LEFT JOIN game_reviews r ON r.game_id = gs.game_id AND r.state_version = gs.version
+            WHERE gs.game_id = :id
+            """
+        ),
+        {"id": str(game_id)},
+    )
+    row = result.first()
+    if row is None:
+        return None, None, None
+    return (bytes(row[2]) if row[2] is not None else None), int(row[0]), row[1]
+
+
+__all__ = [
+    "REVIEW_STATUS",
+    "build_review",
+    "encode_review",
+    "fetch_stored_review",
+    "materialize_review",
+    "store_review",
+]
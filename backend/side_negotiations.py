@@ -0,0 +1,243 @@
+"""
+Optional Round 2 AI-to-AI side negotiations.
+
+When ROUND2_SIDE_NEGOTIATIONS_ENABLED is set, ROUND_2_READY starts a background task that runs a short
+negotiation for every pair of AI roles concurrently, under the process-wide LLM concurrency limit, and
+stores each pair's turns in `round2_side_negotiations`. Nothing waits on it: at ROUND_2_WRAP_READY the
+completed pairs are folded into the stances in one batched state write and marked applied.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+import uuid
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .llm_provider import LLMProvider, LLMRequest, LLMResponse, apply_output_limits, validate_llm_response
+from .prompt_builder import build_round2_conversation_prompt, build_round2_context
+from .stance_shift import apply_stance_shifts_for_roles
+
+logger = logging.getLogger(__name__)
+
+SIDE_NEGOTIATION_STATUS = "ROUND_2_SIDE_NEGOTIATION"
+SIDE_NEGOTIATION_TAIL_LIMIT = 10
+
+# (session, game_id, role_id, request, response, latency_ms) -> writes an llm_traces row
+TraceWriter = Callable[[AsyncSession, uuid.UUID, str, LLMRequest, LLMResponse, int], Awaitable[None]]
+
+
+def side_negotiation_pairs(state: Dict[str, Any]) -> List[Tuple[str, str]]:
+    human_role = state.get("human_role_id")
+    roles = sorted(
+        role_id
+        for role_id, info in (state.get("roles") or {}).items()
+        if isinstance(info, dict) and info.get("type") in ("country", "ngo") and role_id != human_role
+    )
+    return list(itertools.combinations(roles, 2))
+
+
+async def negotiate_pair(
+    provider: LLMProvider,
+    game_id: uuid.UUID,
+    state: Dict[str, Any],
+    pair: Tuple[str, str],
+    issues: List[Dict[str, Any]],
+    turns: int,
+    limiter: AsyncContextManager[Any],
+    trace: Optional[Callable[[str, LLMRequest, LLMResponse, int], Awaitable[None]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Alternate `turns` messages between the pair, starting with pair[0] answering pair[1]'s opening.
+    Each turn reuses the Round 2 prompt builder with the listener in the counterpart slot.
+    """
+    role_a, role_b = pair
+    openings = state.get("round1", {}).get("openings", {})
+    convo_key = f"side:{role_a}-{role_b}"
+    transcript: List[Dict[str, Any]] = []
+    message = (openings.get(role_b) or {}).get("text") or ""
+    for turn in range(turns):
+        speaker, listener = (role_a, role_b) if turn % 2 == 0 else (role_b, role_a)
+        context = build_round2_context(
+            game_id=str(game_id),
+            active_convo_index=None,
+            active_convo={"partner_role": speaker, "status": "ACTIVE", "phase": "SIDE"},
+            partner_role=speaker,
+            partner_opening=openings.get(speaker),
+            human_opening_text=(openings.get(listener) or {}).get("text"),
+            transcript_tail=transcript[-SIDE_NEGOTIATION_TAIL_LIMIT:],
+            issues=issues,
+        )
+        prompt_payload = build_round2_conversation_prompt(
+            game_id=str(game_id),
+            role_id=speaker,
+            status=SIDE_NEGOTIATION_STATUS,
+            human_content=message,
+            partner_role=speaker,
+            convo_key=convo_key,
+            human_turns=turn // 2,
+            ai_turns=(turn + 1) // 2,
+            human_role=listener,
+            context=context,
+        )
+        request: LLMRequest = {
+            "game_id": str(game_id),
+            "role_id": speaker,
+            "status": SIDE_NEGOTIATION_STATUS,
+            "prompt_version": prompt_payload["prompt_version"],
+            "prompt": prompt_payload["prompt"],
+            "request_payload": prompt_payload.get("request_payload", {}),
+            "conversation_context": {"partner": listener, "convo": convo_key, "turn": turn},
+        }
+        apply_output_limits(request)
+        async with limiter:
+            started = time.perf_counter()
+            response = validate_llm_response(await provider.generate(request))
+            latency_ms = int((time.perf_counter() - started) * 1000)
+        reply = response.get("assistant_text", "")
+        if trace is not None:
+            await trace(speaker, request, response, latency_ms)
+        transcript.append({"role_id": speaker, "to": listener, "content": reply, "turn": turn})
+        message = reply
+    return transcript
+
+
+async def run_side_negotiations(
+    session_maker: async_sessionmaker[AsyncSession],
+    provider: LLMProvider,
+    game_id: uuid.UUID,
+    state: Dict[str, Any],
+    issues: List[Dict[str, Any]],
+    *,
+    turns: int,
+    limiter: AsyncContextManager[Any],
+    trace_writer: Optional[TraceWriter] = None,
+) -> Dict[str, int]:
+    """Run every not-yet-started pair concurrently; each pair's outcome is committed on its own."""
+    pairs = side_negotiation_pairs(state)
+    async with session_maker() as session:
+        async with session.begin():
+            started_pairs: List[Tuple[str, str]] = []
+            for role_a, role_b in pairs:
+                inserted = await session.execute(
+                    text(
+                        """
+                        INSERT INTO round2_side_negotiations (game_id, role_a, role_b)
+                        VALUES (:game_id, :role_a, :role_b)
+                        ON CONFLICT (game_id, role_a, role_b) DO NOTHING
+                        RETURNING id
+                        """
+                    ),
+                    {"game_id": str(game_id), "role_a": role_a, "role_b": role_b},
+                )
+                if inserted.first() is not None:
+                    started_pairs.append((role_a, role_b))
+
+    async def run(pair: Tuple[str, str]) -> None:
+        async def trace(role_id: str, request: LLMRequest, response: LLMResponse, latency_ms: int) -> None:
+            if trace_writer is None:
+                return
+            async with session_maker() as trace_session:
+                async with trace_session.begin():
+                    await trace_writer(trace_session, game_id, role_id, request, response, latency_ms)
+
+        params: Dict[str, Any] = {"game_id": str(game_id), "role_a": pair[0], "role_b": pair[1]}
+        try:
+            turns_out = await negotiate_pair(provider, game_id, state, pair, issues, turns, limiter, trace)
+        except Exception as exc:
+            logger.warning("Side negotiation failed", extra={"game_id": str(game_id), "pair": pair, "error": repr(exc)})
+            sql = """
+                UPDATE round2_side_negotiations
+                SET status = 'failed', error = CAST(:payload AS JSONB), completed_at = now()
+                WHERE game_id = :game_id AND role_a = :role_a AND role_b = :role_b AND status = 'running'
+            """
+            params["payload"] = json.dumps({"type": exc.__class__.__name__, "message": str(exc)})
+        else:
+            sql = """
+                UPDATE round2_side_negotiations
+                SET status = 'completed', turns = CAST(:payload AS JSONB), completed_at = now()
+                WHERE game_id = :game_id AND role_a = :role_a AND role_b = :role_b AND status = 'running'
+            """
+            params["payload"] = json.dumps(turns_out)
+        async with session_maker() as session:
+            async with session.begin():
+                await session.execute(text(sql), params)
+
+    await asyncio.gather(*(run(pair) for pair in started_pairs))
+    return {"pairs": len(pairs), "started": len(started_pairs)}
+
+
+async def apply_side_negotiation_shifts(
+    session: AsyncSession,
+    game_id: uuid.UUID,
+    state: Dict[str, Any],
+    issue_option_spec: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """
+    Fold every completed, unapplied negotiation into `state["stances"]` (in memory) and mark the rows applied.
+    Pairs still running are left alone. The caller persists the state once.
+    """
+    rows = await session.execute(
+        text(
+            """
+            SELECT id, role_a, role_b, turns
+            FROM round2_side_negotiations
+            WHERE game_id = :game_id AND status = 'completed'
+            ORDER BY role_a, role_b
+            FOR UPDATE
+            """
+        ),
+        {"game_id": str(game_id)},
+    )
+    records = list(rows.mappings())
+    if not records:
+        return []
+    reasons_all: List[Dict[str, Any]] = []
+    summary: List[Dict[str, Any]] = []
+    for record in records:
+        turns = record["turns"]
+        if isinstance(turns, str):
+            turns = json.loads(turns)
+        for entry in turns or []:
+            # A turn moves only the role it was addressed to, never the speaker.
+            listener = entry.get("to") or (record["role_b"] if entry.get("role_id") == record["role_a"] else record["role_a"])
+            reasons = apply_stance_shifts_for_roles(
+                state=state,
+                role_ids=[listener],
+                round_id=2,
+                issue_id=None,
+                trigger_text=entry.get("content") or "",
+                issue_option_spec=issue_option_spec,
+            )
+            for reason in reasons:
+                reason["source"] = "side_negotiation"
+            reasons_all.extend(reasons)
+        summary.append({"roles": [record["role_a"], record["role_b"]], "turns": len(turns or [])})
+    round2 = state.setdefault("round2", {})
+    round2.setdefault("side_negotiations", []).extend(summary)
+    if reasons_all:
+        round2.setdefault("stance_log", []).extend(reasons_all)
+    await session.execute(
+        text(
+            """
+            UPDATE round2_side_negotiations
+            SET status = 'applied'
+            WHERE id = ANY(CAST(:ids AS UUID[]))
+            """
+        ),
+        {"ids": [str(record["id"]) for record in records]},
+    )
+    return reasons_all
+
+
+__all__ = [
+    "SIDE_NEGOTIATION_STATUS",
+    "apply_side_negotiation_shifts",
+    "negotiate_pair",
+    "run_side_negotiations",
+    "side_negotiation_pairs",
+]
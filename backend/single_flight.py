@@ -0,0 +1,201 @@
+"""
+Single-flight coordination for duplicate `/advance` calls.
+
+Double clicks and client retries arrive as overlapping identical requests. Calls with the same
+(game_id, event, payload hash) that overlap in time share one execution: inside a process the
+duplicates await the first caller's result; across API workers (ADVANCE_SINGLE_FLIGHT_SHARED=1) the
+first caller registers the flight in `advance_flights` under a Postgres advisory lock and duplicates
+poll that row for the stored response. Only flights still running are joined, so deliberate repeats
+such as consecutive ISSUE_DEBATE_STEP calls always run.
+"""
+
+import asyncio
+import collections
+import hashlib
+import json
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Counter, Dict, Optional, Tuple, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+FLIGHT_STATUS_RUNNING = "running"
+FLIGHT_STATUS_DONE = "done"
+
+T = TypeVar("T")
+
+
+def advance_flight_key(game_id: uuid.UUID, event: str, payload: Dict[str, Any]) -> str:
+    canonical = json.dumps(payload or {}, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+    return f"{game_id}:{event}:{digest}"
+
+
+class SingleFlightGroup:
+    """In-process single-flight: concurrent calls with the same key share the first caller's outcome."""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self.stats: Counter[str] = collections.Counter()
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    async def run(
+        self, key: str, fn: Callable[[], Awaitable[T]], shareable: Optional[Callable[[T], bool]] = None
+    ) -> T:
+        """
+        Run `fn` once for concurrent callers of `key`. A result for which `shareable` returns False
+        (e.g. the leader's own client disconnected) goes only to the leader; waiters retry, one of
+        them as the new leader.
+        """
+        while True:
+            existing = self._inflight.get(key)
+            if existing is None:
+                break
+            try:
+                result = await asyncio.shield(existing)
+            except asyncio.CancelledError:
+                if existing.cancelled():
+                    # The leader was abandoned or its outcome is not shareable; try again, possibly as leader.
+                    continue
+                raise
+            except Exception:
+                self.stats["coalesced_local"] += 1
+                raise
+            self.stats["coalesced_local"] += 1
+            return result
+
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.stats["leaders"] += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            if shareable is not None and not shareable(result):
+                self.stats["unshared"] += 1
+                future.cancel()
+            else:
+                future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if future.done() and not future.cancelled():
+                # Mark the exception retrieved even when no duplicate was waiting.
+                future.exception()
+
+
+async def claim_advance_flight(
+    session: AsyncSession,
+    game_id: uuid.UUID,
+    flight_key: str,
+    ttl_seconds: float,
+) -> Tuple[uuid.UUID, bool]:
+    """
+    Join the running flight for `flight_key` or register a new one; returns (flight id, is_leader).
+    The transaction-scoped advisory lock makes check-and-insert atomic across workers and is released
+    at commit, so nothing is held while the flight runs. Flights older than `ttl_seconds` are expired.
+    """
+    await session.execute(text("SELECT pg_advisory_xact_lock(hashtextextended(:key, 0))"), {"key": flight_key})
+    await session.execute(
+        text(
+            """
+            DELETE FROM advance_flights
+            WHERE game_id = :game_id AND created_at < now() - make_interval(secs => :ttl_seconds)
+            """
+        ),
+        {"game_id": str(game_id), "ttl_seconds": float(ttl_seconds)},
+    )
+    running = await session.execute(
+        text("SELECT id FROM advance_flights WHERE flight_key = :key AND status = 'running'"),
+        {"key": flight_key},
+    )
+    row = running.first()
+    if row is not None:
+        return uuid.UUID(str(row[0])), False
+    inserted = await session.execute(
+        text(
+            """
+            INSERT INTO advance_flights (game_id, flight_key)
+            VALUES (:game_id, :key)
+            RETURNING id
+            """
+        ),
+        {"game_id": str(game_id), "key": flight_key},
+    )
+    return uuid.UUID(str(inserted.scalar_one())), True
+
+
+async def finish_advance_flight(
+    session: AsyncSession,
+    flight_id: uuid.UUID,
+    result_status: int,
+    result: Any,
+) -> None:
+    await session.execute(
+        text(
+            """
+            UPDATE advance_flights
+            SET status = 'done', result_status = :result_status, result = CAST(:result AS JSONB),
+                completed_at = now()
+            WHERE id = :id
+            """
+        ),
+        {"id": str(flight_id), "result_status": result_status, "result": json.dumps(result)},
+    )
+
+
+async def abandon_advance_flight(session: AsyncSession, flight_id: uuid.UUID) -> None:
+    """Drop a flight whose outcome must not be shared; waiting duplicates then run on their own."""
+    await session.execute(text("DELETE FROM advance_flights WHERE id = :id"), {"id": str(flight_id)})
+
+
+async def wait_for_advance_flight(
+    session: AsyncSession,
+    flight_id: uuid.UUID,
+    *,
+    poll_interval: float,
+    timeout: float,
+) -> Optional[Tuple[int, Any]]:
+    """
+    Poll a flight until it is done and return its stored (status, body). Each poll is its own short
+    transaction. Returns None if the flight disappears (expired) or `timeout` passes.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        async with session.begin():
+            result = await session.execute(
+                text("SELECT status, result_status, result FROM advance_flights WHERE id = :id"),
+                {"id": str(flight_id)},
+            )
+            row = result.mappings().first()
+        if row is None:
+            return None
+        if row["status"] == FLIGHT_STATUS_DONE:
+            body = row["result"]
+            if isinstance(body, str):
+                body = json.loads(body)
+            return int(row["result_status"]), body
+        if time.monotonic() + poll_interval > deadline:
+            return None
+        await asyncio.sleep(poll_interval)
+
+
+__all__ = [
+    "FLIGHT_STATUS_DONE",
+    "FLIGHT_STATUS_RUNNING",
+    "SingleFlightGroup",
+    "abandon_advance_flight",
+    "advance_flight_key",
+    "claim_advance_flight",
+    "finish_advance_flight",
+    "wait_for_advance_flight",
+]
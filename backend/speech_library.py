@@ -0,0 +1,334 @@
+"""
+Pre-built Round 3 debate speeches.
+
+Speeches are generated offline for every role x issue x debate round x stance bucket and stored in
+`speech_variants`; at runtime `advance_game` picks one deterministically from the game seed, the same
+way opening statements are chosen from `opening_variants`.
+
+Run the batch job with:
+    python -m backend.speech_library --variants 2 --concurrency 4
+Rows already present are skipped, so an interrupted run can simply be restarted.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .llm_provider import LLMProvider, LLMRequest, apply_output_limits, served_by, validate_llm_response
+from .prompt_builder import build_round3_debate_speech_prompt_v1
+from .state import COUNTRIES, NGOS, initial_state, pick_speech_variant
+
+logger = logging.getLogger(__name__)
+
+SPEECH_LIBRARY_PROMPT_VERSION = "r3_debate_speech_v1"
+DEBATE_ROUNDS: Tuple[int, ...] = (1, 2)
+# Upper bounds (exclusive) for each firmness band, with the representative value used when generating.
+FIRMNESS_BANDS: Tuple[Tuple[str, float, float], ...] = (
+    ("low", 0.34, 0.2),
+    ("mid", 0.67, 0.5),
+    ("high", 1.01, 0.85),
+)
+NO_LEAD_OPTION = "none"
+LEAD_ACCEPTANCE = 0.8
+
+
+class SpeechSlot(NamedTuple):
+    role_id: str
+    issue_id: str
+    debate_round: int
+    stance_bucket: str
+    variant_index: int
+
+
+def firmness_band(firmness: Any) -> str:
+    value = float(firmness) if isinstance(firmness, (int, float)) else 0.5
+    for name, upper, _ in FIRMNESS_BANDS:
+        if value < upper:
+            return name
+    return FIRMNESS_BANDS[-1][0]
+
+
+def lead_option(stance: Dict[str, Any]) -> Optional[str]:
+    preferred = stance.get("preferred")
+    if isinstance(preferred, str) and preferred:
+        return preferred
+    acceptance = stance.get("acceptance")
+    if not isinstance(acceptance, dict):
+        return None
+    scored = [(float(val), opt_id) for opt_id, val in acceptance.items() if isinstance(val, (int, float))]
+    if not scored:
+        return None
+    return sorted(scored, key=lambda item: (-item[0], item[1]))[0][1]
+
+
+def stance_bucket(stance: Any) -> str:
+    """Quantize an issue stance to "<lead option>:<firmness band>", e.g. "1.2:high"."""
+    if not isinstance(stance, dict):
+        stance = {}
+    lead = lead_option(stance) or NO_LEAD_OPTION
+    return f"{lead}:{firmness_band(stance.get('firmness'))}"
+
+
+def representative_stance(bucket: str) -> Dict[str, Any]:
+    lead, _, band = bucket.partition(":")
+    firmness = next((value for name, _, value in FIRMNESS_BANDS if name == band), 0.5)
+    if lead == NO_LEAD_OPTION:
+        return {"acceptance": {}, "firmness": firmness}
+    return {"preferred": lead, "acceptance": {lead: LEAD_ACCEPTANCE}, "firmness": firmness}
+
+
+def stance_buckets_for_issue(issue: Dict[str, Any]) -> List[str]:
+    option_ids = [opt.get("option_id") for opt in issue.get("options") or [] if isinstance(opt, dict)]
+    leads = [NO_LEAD_OPTION] + sorted(opt_id for opt_id in option_ids if isinstance(opt_id, str))
+    return [f"{lead}:{band}" for lead in leads for band, _, _ in FIRMNESS_BANDS]
+
+
+def iter_speech_slots(
+    issues: Sequence[Dict[str, Any]],
+    roles: Optional[Sequence[str]] = None,
+    variants_per_slot: int = 1,
+) -> Iterable[SpeechSlot]:
+    role_ids = list(roles) if roles else COUNTRIES + NGOS
+    for issue in issues:
+        buckets = stance_buckets_for_issue(issue)
+        for role_id in role_ids:
+            for debate_round in DEBATE_ROUNDS:
+                for bucket in buckets:
+                    for variant_index in range(variants_per_slot):
+                        yield SpeechSlot(role_id, issue["issue_id"], debate_round, bucket, variant_index)
+
+
+def _slot_state(slot: SpeechSlot) -> Dict[str, Any]:
+    state = initial_state(None)
+    state["stances"] = {slot.role_id: {slot.issue_id: representative_stance(slot.stance_bucket)}}
+    return state
+
+
+def _active_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    return {"issue_id": issue["issue_id"], "issue_title": issue.get("title"), "options": issue.get("options") or []}
+
+
+async def fetch_library_issues(session: AsyncSession, issue_ids: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    rows = await session.execute(text("SELECT id, title, options FROM issue_definitions ORDER BY id ASC"))
+    issues: List[Dict[str, Any]] = []
+    for row in rows.mappings():
+        issue_id = str(row["id"])
+        if issue_ids and issue_id not in issue_ids:
+            continue
+        options = row["options"]
+        if isinstance(options, str):
+            options = json.loads(options)
+        if isinstance(options, list):
+            options = sorted(options, key=lambda opt: opt.get("option_id"))
+        issues.append({"issue_id": issue_id, "title": row["title"], "options": options or []})
+    return issues
+
+
+async def fetch_existing_slots(
+    session: AsyncSession, prompt_version: str = SPEECH_LIBRARY_PROMPT_VERSION
+) -> Set[SpeechSlot]:
+    rows = await session.execute(
+        text(
+            """
+            SELECT role_id, issue_id, debate_round, stance_bucket, variant_index
+            FROM speech_variants
+            WHERE prompt_version = :prompt_version
+            """
+        ),
+        {"prompt_version": prompt_version},
+    )
+    return {
+        SpeechSlot(row["role_id"], row["issue_id"], int(row["debate_round"]), row["stance_bucket"], int(row["variant_index"]))
+        for row in rows.mappings()
+    }
+
+
+async def insert_speech_variant(
+    session: AsyncSession,
+    slot: SpeechSlot,
+    speech_text: str,
+    provider: Optional[str],
+    model: Optional[str],
+    prompt_version: str = SPEECH_LIBRARY_PROMPT_VERSION,
+) -> None:
+    await session.execute(
+        text(
+            """
+            INSERT INTO speech_variants (
+              role_id, issue_id, debate_round, stance_bucket, variant_index,
+              prompt_version, speech_text, provider, model
+            )
+            VALUES (
+              :role_id, :issue_id, :debate_round, :stance_bucket, :variant_index,
+              :prompt_version, :speech_text, :provider, :model
+            )
+            ON CONFLICT (prompt_version, role_id, issue_id, debate_round, stance_bucket, variant_index)
+            DO NOTHING
+            """
+        ),
+        {
+            **slot._asdict(),
+            "prompt_version": prompt_version,
+            "speech_text": speech_text,
+            "provider": provider,
+            "model": model,
+        },
+    )
+
+
+async def generate_speech_library(
+    session_maker: async_sessionmaker[AsyncSession],
+    provider: LLMProvider,
+    issues: Sequence[Dict[str, Any]],
+    *,
+    roles: Optional[Sequence[str]] = None,
+    variants_per_slot: int = 2,
+    concurrency: int = 4,
+) -> Dict[str, int]:
+    """
+    Generate every missing speech slot through `provider`, at most `concurrency` calls at a time.
+    Each speech is committed on its own, so failures only cost that slot and a rerun resumes.
+    """
+    async with session_maker() as session:
+        existing = await fetch_existing_slots(session)
+    issues_by_id = {issue["issue_id"]: issue for issue in issues}
+    slots = list(iter_speech_slots(issues, roles, variants_per_slot))
+    pending = [slot for slot in slots if slot not in existing]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    provider_name = getattr(provider, "provider_name", "fake")
+    model_name = getattr(provider, "model_name", None)
+
+    async def run(slot: SpeechSlot) -> None:
+        async with semaphore:
+            prompt_payload = build_round3_debate_speech_prompt_v1(
+                state=_slot_state(slot),
+                active_issue=_active_issue(issues_by_id[slot.issue_id]),
+                speaker_role=slot.role_id,
+                debate_round=slot.debate_round,
+                speech_number=slot.debate_round,
+                public_debate_tail=[],
+            )
+            request: LLMRequest = {
+                "role_id": slot.role_id,
+                "status": f"ISSUE_DEBATE_ROUND_{slot.debate_round}",
+                "prompt_version": SPEECH_LIBRARY_PROMPT_VERSION,
+                "prompt": prompt_payload["prompt_text"],
+                "request_payload": prompt_payload["request_payload"],
+            }
+            apply_output_limits(request)
+            response = validate_llm_response(await provider.generate(request))
+            speech_text = response.get("assistant_text", "").strip()
+            if not speech_text:
+                raise ValueError(f"Empty speech for {slot}")
+            async with session_maker() as session:
+                async with session.begin():
+                    await insert_speech_variant(session, slot, speech_text, *served_by(provider_name, model_name, response))
+
+    results = await asyncio.gather(*(run(slot) for slot in pending), return_exceptions=True)
+    failed = 0
+    for slot, result in zip(pending, results):
+        if isinstance(result, BaseException):
+            failed += 1
+            logger.warning("Speech library slot failed", extra={"slot": slot._asdict(), "error": repr(result)})
+    return {
+        "total": len(slots),
+        "skipped": len(slots) - len(pending),
+        "generated": len(pending) - failed,
+        "failed": failed,
+    }
+
+
+async def fetch_speech_variants(
+    session: AsyncSession,
+    role_id: str,
+    issue_id: str,
+    debate_round: int,
+    bucket: str,
+    prompt_version: str = SPEECH_LIBRARY_PROMPT_VERSION,
+) -> List[Dict[str, Any]]:
+    rows = await session.execute(
+        text(
+            """
+            SELECT id, speech_text, stance_bucket, variant_index, provider, model
+            FROM speech_variants
+            WHERE role_id = :role_id
+              AND issue_id = :issue_id
+              AND debate_round = :debate_round
+              AND stance_bucket = :stance_bucket
+              AND prompt_version = :prompt_version
+            """
+        ),
+        {
+            "role_id": role_id,
+            "issue_id": issue_id,
+            "debate_round": debate_round,
+            "stance_bucket": bucket,
+            "prompt_version": prompt_version,
+        },
+    )
+    return [dict(row) for row in rows.mappings()]
+
+
+async def select_library_speech(
+    session: AsyncSession,
+    state: Dict[str, Any],
+    speaker: str,
+    issue_id: str,
+    debate_round: int,
+    seed: int,
+) -> Optional[Dict[str, Any]]:
+    """Return the seed-chosen pre-built speech for the speaker's current stance, or None if the slot is empty."""
+    stance = state.get("stances", {}).get(speaker, {}).get(issue_id, {})
+    candidates = await fetch_speech_variants(session, speaker, issue_id, debate_round, stance_bucket(stance))
+    if not candidates:
+        return None
+    return pick_speech_variant(speaker, issue_id, debate_round, seed, candidates)
+
+
+async def _main(argv: Optional[Sequence[str]] = None) -> None:
+    from types import SimpleNamespace
+
+    from .db import get_session_maker
+    from .llm_provider import get_llm_provider
+
+    parser = argparse.ArgumentParser(description="Pre-generate Round 3 debate speeches into speech_variants.")
+    parser.add_argument("--variants", type=int, default=2, help="speeches per role/issue/round/stance bucket")
+    parser.add_argument("--concurrency", type=int, default=4, help="maximum in-flight provider calls")
+    parser.add_argument("--roles", nargs="*", help="limit to these role ids")
+    parser.add_argument("--issues", nargs="*", help="limit to these issue ids")
+    args = parser.parse_args(argv)
+
+    session_maker = get_session_maker()
+    async with session_maker() as session:
+        issues = await fetch_library_issues(session, args.issues)
+    provider = get_llm_provider(SimpleNamespace())
+    summary = await generate_speech_library(
+        session_maker,
+        provider,
+        issues,
+        roles=args.roles,
+        variants_per_slot=args.variants,
+        concurrency=args.concurrency,
+    )
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
+
+
+__all__ = [
+    "SPEECH_LIBRARY_PROMPT_VERSION",
+    "SpeechSlot",
+    "stance_bucket",
+    "iter_speech_slots",
+    "generate_speech_library",
+    "fetch_speech_variants",
+    "select_library_speech",
+]
@@ -0,0 +1,9 @@
+BEGIN;
+
+ALTER TABLE llm_traces ADD COLUMN IF NOT EXISTS prompt_hash TEXT;
+ALTER TABLE llm_traces ADD COLUMN IF NOT EXISTS latency_ms INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_llm_traces_prompt_version_hash
+  ON llm_traces(prompt_version, prompt_hash);
+
+COMMIT;
@@ -0,0 +1,21 @@
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS speech_variants (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  role_id TEXT NOT NULL REFERENCES roles(id),
+  issue_id TEXT NOT NULL,
+  debate_round INTEGER NOT NULL CHECK (debate_round IN (1, 2)),
+  stance_bucket TEXT NOT NULL,
+  variant_index INTEGER NOT NULL DEFAULT 0,
+  prompt_version TEXT NOT NULL,
+  speech_text TEXT NOT NULL,
+  provider TEXT,
+  model TEXT,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  UNIQUE (prompt_version, role_id, issue_id, debate_round, stance_bucket, variant_index)
+);
+
+CREATE INDEX IF NOT EXISTS idx_speech_variants_lookup
+  ON speech_variants(role_id, issue_id, debate_round, stance_bucket);
+
+COMMIT;
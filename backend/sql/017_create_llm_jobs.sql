@@ -0,0 +1,31 @@
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS llm_jobs (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  game_id UUID NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+  kind TEXT NOT NULL,
+  status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued','running','succeeded','failed')),
+  payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+  result_status INTEGER,
+  result JSONB,
+  error JSONB,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  max_attempts INTEGER NOT NULL DEFAULT 3,
+  locked_by TEXT,
+  locked_at TIMESTAMPTZ,
+  available_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Claim scan: oldest runnable jobs first.
+CREATE INDEX IF NOT EXISTS idx_llm_jobs_claim
+  ON llm_jobs(created_at)
+  WHERE status IN ('queued','running');
+
+-- Per-game FIFO check (an older unfinished job for the same game blocks later ones).
+CREATE INDEX IF NOT EXISTS idx_llm_jobs_game_pending
+  ON llm_jobs(game_id, created_at)
+  WHERE status IN ('queued','running');
+
+COMMIT;
@@ -0,0 +1,19 @@
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS round2_side_negotiations (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  game_id UUID NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+  role_a TEXT NOT NULL REFERENCES roles(id),
+  role_b TEXT NOT NULL REFERENCES roles(id),
+  status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running','completed','failed','applied')),
+  turns JSONB NOT NULL DEFAULT '[]'::jsonb,
+  error JSONB,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  completed_at TIMESTAMPTZ,
+  UNIQUE (game_id, role_a, role_b)
+);
+
+CREATE INDEX IF NOT EXISTS idx_round2_side_negotiations_game_status
+  ON round2_side_negotiations(game_id, status);
+
+COMMIT;
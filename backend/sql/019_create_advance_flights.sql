@@ -0,0 +1,25 @@
+BEGIN;
+
+-- In-flight /advance executions shared across API workers (ADVANCE_SINGLE_FLIGHT_SHARED=1).
+-- A row lives only as long as its flight plus a short grace period for waiting duplicates.
+CREATE TABLE IF NOT EXISTS advance_flights (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  game_id UUID NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+  flight_key TEXT NOT NULL,
+  status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running','done')),
+  result_status INTEGER,
+  result JSONB,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  completed_at TIMESTAMPTZ
+);
+
+-- At most one running flight per (game_id, event, payload hash).
+CREATE UNIQUE INDEX IF NOT EXISTS idx_advance_flights_running
+  ON advance_flights(flight_key)
+  WHERE status = 'running';
+
+-- Expiry sweep per game.
+CREATE INDEX IF NOT EXISTS idx_advance_flights_game_created
+  ON advance_flights(game_id, created_at);
+
+COMMIT;
@@ -0,0 +1,21 @@
+BEGIN;
+
+-- Stored /advance responses keyed by the client's Idempotency-Key header, scoped per game.
+-- response_body holds the gzip-compressed JSON body; rows are dropped after expires_at.
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+  game_id UUID NOT NULL,
+  idempotency_key TEXT NOT NULL,
+  request_hash TEXT NOT NULL,
+  status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running','done')),
+  response_status INTEGER,
+  response_body BYTEA,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  expires_at TIMESTAMPTZ NOT NULL,
+  PRIMARY KEY (game_id, idempotency_key)
+);
+
+-- Expiry sweep.
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at
+  ON idempotency_keys(expires_at);
+
+COMMIT;
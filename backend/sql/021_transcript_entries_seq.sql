@@ -0,0 +1,28 @@
+BEGIN;
+
+-- Monotonic write-order position used by GET /games/{id}/transcript?after=<cursor>&limit=<n>.
+ALTER TABLE transcript_entries ADD COLUMN IF NOT EXISTS seq BIGINT;
+
+-- Backfill existing rows in the order the full transcript endpoint returns them.
+WITH ordered AS (
+  SELECT id,
+         row_number() OVER (
+           ORDER BY created_at ASC, COALESCE((metadata->>'index')::int, 0) ASC, id ASC
+         ) AS rn
+  FROM transcript_entries
+)
+UPDATE transcript_entries t
+SET seq = ordered.rn
+FROM ordered
+WHERE t.id = ordered.id AND t.seq IS NULL;
+
+CREATE SEQUENCE IF NOT EXISTS transcript_entries_seq_seq OWNED BY transcript_entries.seq;
+SELECT setval('transcript_entries_seq_seq', COALESCE((SELECT max(seq) FROM transcript_entries), 0) + 1, false);
+ALTER TABLE transcript_entries ALTER COLUMN seq SET DEFAULT nextval('transcript_entries_seq_seq');
+ALTER TABLE transcript_entries ALTER COLUMN seq SET NOT NULL;
+
+-- Keyset pagination per game.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_transcript_game_seq
+  ON transcript_entries(game_id, seq);
+
+COMMIT;
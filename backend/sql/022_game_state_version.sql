@@ -0,0 +1,6 @@
+BEGIN;
+
+-- Monotonic state version, bumped on every state write; exposed as the ETag of GET /games/{id}.
+ALTER TABLE game_state ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 1;
+
+COMMIT;
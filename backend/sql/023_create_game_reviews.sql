@@ -0,0 +1,12 @@
+BEGIN;
+
+-- End-of-game review document, built when a game enters REVIEW.
+-- body is gzip-compressed JSON; it is current only while state_version equals game_state.version.
+CREATE TABLE IF NOT EXISTS game_reviews (
+  game_id UUID PRIMARY KEY REFERENCES games(id) ON DELETE CASCADE,
+  state_version BIGINT NOT NULL,
+  body BYTEA NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+COMMIT;
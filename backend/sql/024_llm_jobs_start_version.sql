@@ -0,0 +1,6 @@
+BEGIN;
+
+-- Game state version when a job was first claimed. A retried job whose game has moved past it is not re-run.
+ALTER TABLE llm_jobs ADD COLUMN IF NOT EXISTS start_version BIGINT;
+
+COMMIT;
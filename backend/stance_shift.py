@@ -96,6 +96,34 @@ def apply_stance_shift(
     return updated, reasons
 
 
+def apply_stance_shifts_for_roles(
+    *,
+    state: Dict[str, Any],
+    role_ids: List[str],
+    round_id: int,
+    issue_id: Optional[str],
+    trigger_text: str,
+    issue_option_spec: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Apply `trigger_text` to each of `role_ids` in turn; updates `state["stances"]` and returns the reasons."""
+    updated = state.get("stances", {})
+    reasons_all: List[Dict[str, Any]] = []
+    for rid in role_ids:
+        updated, reasons = apply_stance_shift(
+            role_id=rid,
+            round_id=round_id,
+            issue_id=issue_id,
+            trigger_text=trigger_text,
+            stance_snapshot=updated,
+            issue_option_spec=issue_option_spec,
+        )
+        if reasons:
+            reasons_all.extend(reasons)
+    if reasons_all:
+        state["stances"] = updated
+    return reasons_all
+
+
 def _matched_issue_ids(
     issue_id: Optional[str], trigger: str, issue_option_spec: Dict[str, Any]
 ) -> List[str]:
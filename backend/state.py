@@ -119,6 +119,15 @@ def pick_opening_variant(role_id: str, seed: int, candidates: List[Dict]) -> Dic
     return rng.choice(ordered)
 
 
+def pick_speech_variant(role_id: str, issue_id: str, debate_round: int, seed: int, candidates: List[Dict]) -> Dict:
+    if not candidates:
+        raise ValueError(f"No speech variants available for role {role_id} on issue {issue_id}")
+    ordered = sorted(candidates, key=lambda c: (str(c.get("id")), c.get("speech_text", "")))
+    salted_seed = _stable_int(seed, f"speech-{role_id}-{issue_id}-{debate_round}")
+    rng = random.Random(salted_seed)
+    return rng.choice(ordered)
+
+
 def _clamp01(value: float) -> float:
     if value < 0.0:
         return 0.0
@@ -138,4 +147,5 @@ __all__ = [
     "merge_initial_stances",
     "speaker_order_with_constraint",
     "pick_opening_variant",
+    "pick_speech_variant",
 ]
@@ -0,0 +1,83 @@
+"""
+RFC 6902 JSON Patch between two game state snapshots.
+
+`state_patch(old, new)` returns the operations that turn `old` into `new`: objects are diffed key by
+key, lists that only grew become appends (`/path/-`), and any other change replaces the value at its
+path. `apply_state_patch` applies the subset of operations `state_patch` emits.
+"""
+
+import copy
+from typing import Any, Dict, List
+
+JsonPatch = List[Dict[str, Any]]
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _diff(old: Any, new: Any, path: str, ops: JsonPatch) -> None:
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(str(key))}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(str(key))}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                _diff(old[key], value, child, ops)
+        return
+    if isinstance(old, list) and isinstance(new, list) and len(new) > len(old) and new[: len(old)] == old:
+        for value in new[len(old) :]:
+            ops.append({"op": "add", "path": f"{path}/-", "value": value})
+        return
+    if type(old) is type(new) and old == new:
+        return
+    ops.append({"op": "replace", "path": path, "value": new})
+
+
+def state_patch(old: Any, new: Any) -> JsonPatch:
+    ops: JsonPatch = []
+    _diff(old, new, "", ops)
+    return ops
+
+
+def changed_paths(patch: JsonPatch) -> List[str]:
+    return [op["path"] for op in patch]
+
+
+def apply_state_patch(document: Any, patch: JsonPatch) -> Any:
+    result = copy.deepcopy(document)
+    for op in patch:
+        if op["path"] == "":
+            result = copy.deepcopy(op["value"])
+            continue
+        tokens = [_unescape(token) for token in op["path"].split("/")[1:]]
+        parent = result
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if op["op"] == "remove":
+            if isinstance(parent, list):
+                del parent[int(last)]
+            else:
+                del parent[last]
+        elif isinstance(parent, list):
+            value = copy.deepcopy(op["value"])
+            if last == "-":
+                parent.append(value)
+            elif op["op"] == "add":
+                parent.insert(int(last), value)
+            else:
+                parent[int(last)] = value
+        else:
+            parent[last] = copy.deepcopy(op["value"])
+    return result
+
+
+__all__ = ["JsonPatch", "apply_state_patch", "changed_paths", "state_patch"]
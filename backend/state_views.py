@@ -0,0 +1,133 @@
+"""
+Server-side projections of the game state.
+
+`GET /games/{id}` and `POST /games/{id}/advance` accept `?fields=status,round3.active_issue` (dotted
+paths into the state) or `?view=player|debug|full`, and the state is cut down before serialization:
+
+- `player`: identity, status, roles, the sub-state of the round being played (`round1`, `round2`, or
+  `round3` without its `stance_log`), and `round3.active_issue`.
+- `debug`: everything except the `checkpoints` list.
+- `full`: the whole state (the default).
+
+`fields` takes precedence over `view`. Paths that do not exist in the state are left out.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+STATE_VIEWS = ("player", "debug", "full")
+MAX_STATE_FIELDS = 50
+
+Path = Tuple[str, ...]
+
+_CURRENT_ROUND = "@round"
+_VIEW_FIELDS: Dict[str, Sequence[str]] = {
+    "player": ("game_id", "status", "updated_at", "human_role_id", "roles", _CURRENT_ROUND, "round3.active_issue"),
+}
+_VIEW_EXCLUDES: Dict[str, Sequence[str]] = {
+    "player": ("round3.stance_log",),
+    "debug": ("checkpoints",),
+}
+
+
+def parse_state_fields(fields: Optional[str]) -> Optional[List[Path]]:
+    """Parse a comma-separated list of dotted paths; None when no projection was asked for."""
+    if fields is None:
+        return None
+    paths: List[Path] = []
+    for raw in fields.split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        tokens = tuple(raw.split("."))
+        if any(not token for token in tokens):
+            raise ValueError(f"Invalid field path: {raw!r}")
+        paths.append(tokens)
+    if not paths:
+        raise ValueError("fields must name at least one path")
+    if len(paths) > MAX_STATE_FIELDS:
+        raise ValueError(f"At most {MAX_STATE_FIELDS} fields may be requested")
+    return paths
+
+
+def current_round_key(status: Any) -> Optional[str]:
+    if not isinstance(status, str):
+        return None
+    if status.startswith("ROUND_1"):
+        return "round1"
+    if status.startswith("ROUND_2"):
+        return "round2"
+    if status.startswith(("ROUND_3", "ISSUE_")) or status == "REVIEW":
+        return "round3"
+    return None
+
+
+def _select(state: Dict[str, Any], paths: Sequence[Path]) -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
+    selected: set = set()
+    # Shorter paths first, so a whole subtree wins over paths inside it.
+    for path in sorted(set(paths), key=len):
+        if any(path[:i] in selected for i in range(1, len(path))):
+            continue
+        value: Any = state
+        for token in path:
+            if not isinstance(value, dict) or token not in value:
+                break
+            value = value[token]
+        else:
+            target = result
+            for token in path[:-1]:
+                target = target.setdefault(token, {})
+            target[path[-1]] = value
+            selected.add(path)
+    return result
+
+
+def _drop(state: Dict[str, Any], path: Path) -> Dict[str, Any]:
+    """Copy of `state` without `path`; only the dicts along the path are copied."""
+    head, rest = path[0], path[1:]
+    if head not in state:
+        return state
+    trimmed = dict(state)
+    if not rest:
+        del trimmed[head]
+    elif isinstance(state[head], dict):
+        trimmed[head] = _drop(state[head], rest)
+    return trimmed
+
+
+def project_state(state: Dict[str, Any], fields: Optional[Sequence[Path]] = None, view: str = "full") -> Dict[str, Any]:
+    if fields is not None:
+        return _select(state, fields)
+    if view not in STATE_VIEWS:
+        raise ValueError(f"Unknown view: {view!r}")
+    view_fields = _VIEW_FIELDS.get(view)
+    if view_fields is not None:
+        round_key = current_round_key(state.get("status"))
+        paths = [
+            tuple((round_key if name == _CURRENT_ROUND else name).split("."))
+            for name in view_fields
+            if name != _CURRENT_ROUND or round_key is not None
+        ]
+        state = _select(state, paths)
+    for excluded in _VIEW_EXCLUDES.get(view, ()):
+        state = _drop(state, tuple(excluded.split(".")))
+    return state
+
+
+def projection_tag(fields: Optional[Sequence[Path]], view: str) -> Optional[str]:
+    """Short stable tag of a projection for ETags and idempotency hashes; None for the full state."""
+    if fields is None and view == "full":
+        return None
+    spec = "fields:" + ",".join(sorted(".".join(path) for path in set(fields))) if fields is not None else f"view:{view}"
+    return hashlib.sha256(spec.encode("utf-8")).hexdigest()[:12]
+
+
+__all__ = [
+    "MAX_STATE_FIELDS",
+    "STATE_VIEWS",
+    "current_round_key",
+    "parse_state_fields",
+    "project_state",
+    "projection_tag",
+]
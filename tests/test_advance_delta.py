@@ -0,0 +1,40 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from typing import Any, cast
+
+from backend.main import app
+from backend.state_patch import apply_state_patch
+
+
+@pytest.mark.asyncio
+async def test_delta_advance_returns_new_transcript_rows_and_patch_from_client_version():
+    transport = ASGITransport(app=cast(Any, app))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        game_id = (await client.post("/games", json={})).json()["game_id"]
+        await client.post(
+            f"/games/{game_id}/advance", json={"event": "ROLE_CONFIRMED", "payload": {"human_role_id": "USA"}}
+        )
+        before = (await client.get(f"/games/{game_id}")).json()
+        transcript_before = (await client.get(f"/games/{game_id}/transcript", params={"limit": 500})).json()
+
+        resp = await client.post(
+            f"/games/{game_id}/advance",
+            params={"delta": 1, "since": before["game"]["version"]},
+            json={"event": "ROUND_1_READY", "payload": {}},
+        )
+        assert resp.status_code == 200
+        delta = resp.json()
+        assert delta["base_version"] == before["game"]["version"]
+        assert delta["version"] > before["game"]["version"]
+        assert resp.headers["etag"].removeprefix("W/") == f'"v{delta["version"]}"'
+
+        after = (await client.get(f"/games/{game_id}")).json()
+        assert after["game"]["version"] == delta["version"]
+        assert apply_state_patch(before["state"], delta["patch"]) == after["state"]
+
+        new_rows = (
+            await client.get(f"/games/{game_id}/transcript", params={"after": transcript_before["next_cursor"], "limit": 500})
+        ).json()["entries"]
+        assert [row["id"] for row in delta["transcript"]] == [row["id"] for row in new_rows]
+        if new_rows:
+            assert delta["transcript_cursor"] is not None
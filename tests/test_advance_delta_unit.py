@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+from backend.advance_delta import (
+    ADVANCE_DELTA_MEDIA_TYPE,
+    advance_delta_body,
+    current_advance_writes,
+    record_advance_writes,
+    wants_advance_delta,
+)
+from backend.state_patch import apply_state_patch
+
+
+def test_delta_body_patches_from_known_base_and_falls_back_to_full_state():
+    base = {"status": "ROUND_1_SETUP", "round1": {"turns": ["a"]}}
+    new = {"status": "ROUND_1_OPENINGS", "round1": {"turns": ["a", "b"]}}
+
+    async def advance():
+        writes = current_advance_writes()
+        assert writes is not None
+        writes.record_transcript({"id": "t1", "seq": 7})
+        writes.record_state(5, new["status"], json.dumps(new))
+        return {"state": new}
+
+    result, writes = asyncio.run(record_advance_writes(advance))
+    assert current_advance_writes() is None
+
+    body = advance_delta_body("g", 4, base, writes, result["state"])
+    assert body["version"] == 5 and body["base_version"] == 4 and body["state"] is None
+    assert apply_state_patch(base, body["patch"]) == new
+    assert body["transcript"] == [{"id": "t1", "seq": 7}]
+
+    unknown_base = advance_delta_body("g", 3, None, writes, result["state"])
+    assert unknown_base["patch"] is None and unknown_base["state"] == new
+
+
+def test_delta_mode_is_selected_by_query_or_accept_header():
+    assert wants_advance_delta(True, None)
+    assert wants_advance_delta(False, f"{ADVANCE_DELTA_MEDIA_TYPE}, application/json")
+    assert not wants_advance_delta(False, "application/json")
+
+
+def test_shared_flight_game_bodies_are_rerendered_but_errors_pass_through():
+    from fastapi.responses import JSONResponse
+
+    from backend.main import _advance_result_payload
+
+    state = {"status": "ROUND_1_OPENINGS"}
+    follower = JSONResponse(status_code=200, content={"game_id": "g", "state": state})
+    assert _advance_result_payload(follower) == {"game_id": "g", "state": state}
+
+    for passthrough in (
+        JSONResponse(status_code=409, content={"detail": "conflict"}),
+        JSONResponse(status_code=499, content={"detail": "client disconnected"}),
+        JSONResponse(status_code=202, content={"job_id": "j", "status": "queued"}),
+    ):
+        assert _advance_result_payload(passthrough) is passthrough
+    assert _advance_result_payload({"game_id": "g", "state": state}) == {"game_id": "g", "state": state}
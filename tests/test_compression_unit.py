@@ -0,0 +1,87 @@
+import asyncio
+import gzip
+from types import SimpleNamespace
+
+from backend.compression import COMPRESSION_CACHE_KEY_HEADER, CompressionMiddleware, negotiate_encoding
+
+SETTINGS = SimpleNamespace(
+    response_compression_enabled=True,
+    response_compression_min_bytes=100,
+    response_compression_thread_bytes=1000,
+    response_compression_cache_entries=8,
+)
+
+
+def _app(body: bytes, headers, chunks: int = 1):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for i in range(chunks):
+            await send({"type": "http.response.body", "body": body, "more_body": i < chunks - 1})
+
+    return app
+
+
+def _call(middleware, accept: bytes):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept)]}
+    asyncio.run(middleware(scope, None, send))
+    headers = dict(sent[0]["headers"])
+    return headers, b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def test_negotiation_honours_q_values_and_server_preference():
+    assert negotiate_encoding("gzip, br", ("br", "gzip")) == "br"
+    assert negotiate_encoding("br;q=0, gzip;q=0.5", ("br", "gzip")) == "gzip"
+    assert negotiate_encoding("identity", ("gzip",)) is None
+    assert negotiate_encoding("*", ("gzip",)) == "gzip"
+    assert negotiate_encoding(None, ("gzip",)) is None
+
+
+def test_large_json_is_compressed_in_a_thread_and_cached_by_key():
+    body = b'{"transcript":[' + b'{"content":"hello"},' * 200 + b'{}]}'
+    headers = [(b"content-type", b"application/json"), (COMPRESSION_CACHE_KEY_HEADER.encode(), b"review:g:v3")]
+    middleware = CompressionMiddleware(_app(body, headers), settings=lambda: SETTINGS)
+
+    sent_headers, sent_body = _call(middleware, b"gzip")
+    assert sent_headers[b"content-encoding"] == b"gzip" and sent_headers[b"vary"] == b"Accept-Encoding"
+    assert COMPRESSION_CACHE_KEY_HEADER.encode() not in sent_headers
+    assert gzip.decompress(sent_body) == body and int(sent_headers[b"content-length"]) == len(sent_body)
+    assert len(middleware.cache) == 1
+
+    identity_headers, identity_body = _call(middleware, b"identity")
+    assert b"content-encoding" not in identity_headers and identity_body == body
+
+
+def test_compressed_and_not_modified_responses_carry_a_weak_etag():
+    body = b'{"state":' + b'"x",' * 100 + b'"y"}'
+    headers = [(b"content-type", b"application/json"), (b"etag", b'"v3"')]
+    middleware = CompressionMiddleware(_app(body, headers), settings=lambda: SETTINGS)
+    assert _call(middleware, b"gzip")[0][b"etag"] == b'W/"v3"'
+    assert _call(middleware, b"identity")[0][b"etag"] == b'"v3"'
+
+    async def not_modified(scope, receive, send):
+        await send({"type": "http.response.start", "status": 304, "headers": [(b"etag", b'"v3"')]})
+        await send({"type": "http.response.body", "body": b""})
+
+    conditional = CompressionMiddleware(not_modified, settings=lambda: SETTINGS)
+    assert _call(conditional, b"gzip")[0][b"etag"] == b'W/"v3"'
+    assert _call(conditional, b"identity")[0][b"etag"] == b'"v3"'
+
+
+def test_small_streaming_and_preencoded_responses_pass_through():
+    small = CompressionMiddleware(_app(b"{}", [(b"content-type", b"application/json")]), settings=lambda: SETTINGS)
+    assert b"content-encoding" not in _call(small, b"gzip")[0]
+
+    stream = CompressionMiddleware(_app(b"x" * 500, [(b"content-type", b"text/event-stream")], chunks=3), settings=lambda: SETTINGS)
+    headers, body = _call(stream, b"gzip")
+    assert b"content-encoding" not in headers and body == b"x" * 1500
+
+    encoded = gzip.compress(b"{}" * 200)
+    pre = CompressionMiddleware(
+        _app(encoded, [(b"content-type", b"application/json"), (b"content-encoding", b"gzip")]), settings=lambda: SETTINGS
+    )
+    assert _call(pre, b"gzip")[1] == encoded
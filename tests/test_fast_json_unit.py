@@ -0,0 +1,19 @@
+import json
+import uuid
+
+from backend.fast_json import dumps, game_response_body, object_body
+
+
+def test_bodies_splice_preencoded_state_without_reencoding():
+    game_id = uuid.uuid4()
+    state = {"status": "ROUND_1_SETUP", "notes": ["é", 1.5, None]}
+    written = json.dumps(state)
+
+    assert json.loads(game_response_body(game_id, state, written)) == {"game_id": str(game_id), "state": state}
+    assert json.loads(game_response_body(game_id, state)) == {"game_id": str(game_id), "state": state}
+    # The pre-encoded string is used verbatim (it is trusted to match `state`).
+    assert game_response_body(game_id, state, written).endswith(written.encode() + b"}")
+
+    assert json.loads(object_body({"game": {"id": 1}}, {"state": written})) == {"game": {"id": 1}, "state": state}
+    assert json.loads(object_body({}, {"state": b"[]"})) == {"state": []}
+    assert json.loads(dumps({"id": game_id})) == {"id": str(game_id)}
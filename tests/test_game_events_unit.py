@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from backend.game_events import GameEventHub, listen_dsn
+from backend.state_patch import apply_state_patch, state_patch
+
+
+def test_state_patch_roundtrip_with_appends_removals_and_escaped_keys():
+    old = {"status": "ROUND_1_STEP", "round1": {"openings": {"USA": "a"}, "log": [1, 2]}, "gone": True, "a/b": 1}
+    new = {"status": "ROUND_2_READY", "round1": {"openings": {"USA": "a", "BRA": "b"}, "log": [1, 2, 3]}, "a/b": 2}
+    patch = state_patch(old, new)
+    assert {"op": "add", "path": "/round1/log/-", "value": 3} in patch
+    assert {"op": "remove", "path": "/gone"} in patch
+    assert {"op": "replace", "path": "/a~1b", "value": 2} in patch
+    assert apply_state_patch(old, patch) == new
+    assert state_patch(new, new) == []
+    assert state_patch({"x": 1}, {"x": True}) == [{"op": "replace", "path": "/x", "value": True}]
+
+
+def test_listen_dsn_drops_driver_suffix():
+    assert listen_dsn("postgresql+asyncpg://u:p@db:5432/x") == "postgresql://u:p@db:5432/x"
+
+
+@pytest.mark.asyncio
+async def test_hub_wakes_waiters_and_subscribers_only_on_newer_versions():
+    hub = GameEventHub()
+    queue = hub.subscribe("g1")
+    waiter = asyncio.create_task(hub.wait_for_version("g1", 3, timeout=1.0))
+    await asyncio.sleep(0)
+    hub.publish("g1", 3, "ROUND_1_STEP")
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    hub.publish("g1", 4, "ROUND_2_READY")
+    assert await waiter == 4
+    assert [queue.get_nowait()["version"], queue.get_nowait()["version"]] == [3, 4]
+
+    hub.publish("g1", 2, "stale")
+    assert queue.empty() and hub.latest_version("g1") == 4
+    assert await hub.wait_for_version("g1", 4, timeout=0.01) is None
+    hub.unsubscribe("g1", queue)
@@ -0,0 +1,43 @@
+import asyncio
+from typing import Any, cast
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.main import app
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_immediately_for_old_version_and_times_out_when_unchanged():
+    transport = ASGITransport(app=cast(Any, app))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        game_id = (await client.post("/games", json={})).json()["game_id"]
+        version = (await client.get(f"/games/{game_id}")).json()["game"]["version"]
+
+        stale = (await client.get(f"/games/{game_id}/wait", params={"version": version - 1, "timeout": 5})).json()
+        assert stale["changed"] is True and stale["version"] == version
+
+        unchanged = (await client.get(f"/games/{game_id}/wait", params={"version": version, "timeout": 0.2})).json()
+        assert unchanged["changed"] is False and unchanged["version"] == version
+
+
+@pytest.mark.asyncio
+async def test_wait_is_woken_by_a_commit_from_another_request():
+    transport = ASGITransport(app=cast(Any, app))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        game_id = (await client.post("/games", json={})).json()["game_id"]
+        version = (await client.get(f"/games/{game_id}")).json()["game"]["version"]
+
+        async def advance_later() -> None:
+            await asyncio.sleep(0.3)
+            await client.post(
+                f"/games/{game_id}/advance", json={"event": "ROLE_CONFIRMED", "payload": {"human_role_id": "USA"}}
+            )
+
+        waited, _ = await asyncio.gather(
+            client.get(f"/games/{game_id}/wait", params={"version": version, "timeout": 10}),
+            advance_later(),
+        )
+        body = waited.json()
+        assert body["changed"] is True
+        assert body["version"] > version
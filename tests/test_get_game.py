@@ -21,3 +21,69 @@ async def test_get_game_returns_state_and_game():
         assert "game" in body and "state" in body
         assert str(body["game"]["id"]) == str(game_id)
         assert body["state"]["status"] == initial_status
+
+
+def test_etag_matching_and_body_cache_keep_latest_version():
+    import uuid
+
+    from backend.game_versions import GameBodyCache, etag_matches, game_state_etag
+
+    assert game_state_etag(3) == '"v3"'
+    assert etag_matches('"v2", W/"v3"', '"v3"')
+    assert not etag_matches('"v2"', '"v3"')
+    assert not etag_matches(None, '"v3"')
+
+    cache = GameBodyCache(max_games=1)
+    game_id = uuid.uuid4()
+    cache.put(game_id, 2, b"two")
+    cache.put(game_id, 1, b"one")
+    assert cache.get(game_id, 2) == b"two"
+    assert cache.get(game_id, 1) is None
+    cache.put(uuid.uuid4(), 1, b"other")
+    assert len(cache) == 1 and cache.get(game_id, 2) is None
+
+
+@pytest.mark.asyncio
+async def test_get_game_etag_returns_304_until_state_changes():
+    transport = ASGITransport(app=cast(Any, app))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        game_id = (await client.post("/games", json={})).json()["game_id"]
+
+        first = await client.get(f"/games/{game_id}")
+        etag = first.headers["etag"]
+        assert first.json()["game"]["version"] >= 1
+
+        unchanged = await client.get(f"/games/{game_id}", headers={"If-None-Match": etag})
+        assert unchanged.status_code == 304
+        assert unchanged.headers["etag"] == etag
+
+        await client.post(
+            f"/games/{game_id}/advance", json={"event": "ROLE_CONFIRMED", "payload": {"human_role_id": "USA"}}
+        )
+        changed = await client.get(f"/games/{game_id}", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert changed.json()["state"]["human_role_id"] == "USA"
+
+
+@pytest.mark.asyncio
+async def test_get_game_projects_state_by_view_and_fields():
+    transport = ASGITransport(app=cast(Any, app))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        game_id = (await client.post("/games", json={})).json()["game_id"]
+
+        full = await client.get(f"/games/{game_id}")
+        player = await client.get(f"/games/{game_id}", params={"view": "player"})
+        assert "stances" in full.json()["state"]
+        assert "stances" not in player.json()["state"] and "checkpoints" not in player.json()["state"]
+        assert player.headers["etag"] != full.headers["etag"]
+
+        slim = await client.get(f"/games/{game_id}", params={"fields": "status"})
+        assert slim.json()["state"] == {"status": full.json()["state"]["status"]}
+        again = await client.get(
+            f"/games/{game_id}", params={"fields": "status"}, headers={"If-None-Match": slim.headers["etag"]}
+        )
+        assert again.status_code == 304
+
+        bad = await client.get(f"/games/{game_id}", params={"fields": "round3..x"})
+        assert bad.status_code == 400
@@ -0,0 +1,122 @@
+import asyncio
+import json
+from typing import Any, cast
+
+import pytest
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+import backend.main as main
+from backend.db import get_session_maker
+from backend.idempotency import compress_body, decompress_body, idempotency_request_hash, should_store_response
+from backend.main import app
+
+
+async def _key_statuses(game_id: str) -> list:
+    async with get_session_maker()() as session:
+        rows = await session.execute(
+            text("SELECT status FROM idempotency_keys WHERE game_id = :gid"), {"gid": game_id}
+        )
+        return [row[0] for row in rows]
+
+
+def test_idempotency_helpers_roundtrip_and_fingerprint():
+    body = {"game_id": "g", "state": {"status": "ROUND_1_SETUP", "notes": ["x"] * 50}}
+    packed = compress_body(body)
+    assert len(packed) < len(json.dumps(body))
+    assert json.loads(decompress_body(packed)) == body
+    assert idempotency_request_hash("E", {"a": 1, "b": 2}, False) == idempotency_request_hash("E", {"b": 2, "a": 1}, False)
+    assert idempotency_request_hash("E", {}, False) != idempotency_request_hash("E", {}, True)
+    assert should_store_response(200) and should_store_response(400)
+    assert not should_store_response(499) and not should_store_response(502)
+
+
+@pytest.mark.asyncio
+async def test_replayed_idempotency_key_returns_stored_response_without_advancing():
+    transport = ASGITransport(app=cast(Any, app))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        create = await client.post("/games", json={})
+        create.raise_for_status()
+        game_id = create.json()["game_id"]
+        await client.post(
+            f"/games/{game_id}/advance", json={"event": "ROLE_CONFIRMED", "payload": {"human_role_id": "USA"}}
+        )
+        ready = await client.post(f"/games/{game_id}/advance", json={"event": "ROUND_1_READY", "payload": {}})
+        ready.raise_for_status()
+
+        headers = {"Idempotency-Key": "step-1"}
+        step = {"event": "ROUND_1_STEP", "payload": {}}
+        first = await client.post(f"/games/{game_id}/advance", json=step, headers=headers)
+        assert first.status_code == 200
+        assert "idempotent-replayed" not in first.headers
+        retry = await client.post(f"/games/{game_id}/advance", json=step, headers=headers)
+        assert retry.status_code == 200
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert retry.json() == first.json()
+
+        current = (await client.get(f"/games/{game_id}")).json()["state"]
+        assert current["round1"] == first.json()["state"]["round1"]
+
+        mismatch = await client.post(
+            f"/games/{game_id}/advance", json={"event": "ROUND_2_READY", "payload": {}}, headers=headers
+        )
+        assert mismatch.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_in_flight_key_conflicts_and_is_released_when_the_request_is_cancelled(monkeypatch: pytest.MonkeyPatch):
+    transport = ASGITransport(app=cast(Any, app))
+    started = asyncio.Event()
+
+    async def hang(_game_id: Any, _req: Any, session: Any, **_kwargs: Any):
+        # Cancelled mid-transaction: the request session cannot be reused to settle the key.
+        async with session.begin():
+            started.set()
+            await asyncio.sleep(3600)
+
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        game_id = (await client.post("/games", json={})).json()["game_id"]
+        monkeypatch.setattr(main, "run_advance", hang)
+        headers = {"Idempotency-Key": "role-1"}
+        body = {"event": "ROLE_CONFIRMED", "payload": {"human_role_id": "USA"}}
+        first = asyncio.create_task(client.post(f"/games/{game_id}/advance", json=body, headers=headers))
+        await started.wait()
+
+        duplicate = await client.post(f"/games/{game_id}/advance", json=body, headers=headers)
+        assert duplicate.status_code == 409
+        assert await _key_statuses(game_id) == ["running"]
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        for _ in range(50):
+            if not await _key_statuses(game_id):
+                break
+            await asyncio.sleep(0.05)
+        assert await _key_statuses(game_id) == []
+
+
+@pytest.mark.asyncio
+async def test_key_is_released_after_a_server_error_so_the_retry_runs(monkeypatch: pytest.MonkeyPatch):
+    transport = ASGITransport(app=cast(Any, app))
+    real_run_advance = main.run_advance
+
+    async def unavailable(*_args: Any, **_kwargs: Any):
+        raise HTTPException(status_code=503, detail="try again")
+
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        game_id = (await client.post("/games", json={})).json()["game_id"]
+        headers = {"Idempotency-Key": "role-1"}
+        body = {"event": "ROLE_CONFIRMED", "payload": {"human_role_id": "USA"}}
+
+        monkeypatch.setattr(main, "run_advance", unavailable)
+        failed = await client.post(f"/games/{game_id}/advance", json=body, headers=headers)
+        assert failed.status_code == 503
+        assert await _key_statuses(game_id) == []
+
+        monkeypatch.setattr(main, "run_advance", real_run_advance)
+        retry = await client.post(f"/games/{game_id}/advance", json=body, headers=headers)
+        assert retry.status_code == 200
+        assert "idempotent-replayed" not in retry.headers
+        assert await _key_statuses(game_id) == ["done"]
@@ -0,0 +1,88 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from typing import Any, cast
+
+from backend.db import get_session_maker
+from backend.jobs import LLMJobWorkerPool
+from backend.main import app, default_job_handlers
+
+
+async def _drain_until_done(client: AsyncClient, job_id: str, max_runs: int = 20) -> dict:
+    pool = LLMJobWorkerPool(get_session_maker(), default_job_handlers(), concurrency=1)
+    job: dict = {}
+    for _ in range(max_runs):
+        job = (await client.get(f"/jobs/{job_id}")).json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        await pool.run_once("test-worker")
+    return job
+
+
+@pytest.mark.asyncio
+async def test_async_advance_enqueues_job_and_worker_applies_it():
+    transport = ASGITransport(app=cast(Any, app))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        create = await client.post("/games", json={})
+        create.raise_for_status()
+        game_id = create.json()["game_id"]
+
+        resp = await client.post(
+            f"/games/{game_id}/advance?async=1",
+            json={"event": "ROLE_CONFIRMED", "payload": {"human_role_id": "USA"}},
+        )
+        assert resp.status_code == 202
+        job_id = resp.json()["job_id"]
+        assert resp.headers["location"] == f"/jobs/{job_id}"
+
+        job = await _drain_until_done(client, job_id)
+        assert job["status"] == "succeeded"
+        assert job["result_status"] == 200
+        assert job["result"]["state"]["human_role_id"] == "USA"
+
+        state = (await client.get(f"/games/{game_id}")).json()["state"]
+        assert state["human_role_id"] == "USA"
+
+
+@pytest.mark.asyncio
+async def test_async_advance_records_rejected_event_as_failed_job():
+    transport = ASGITransport(app=cast(Any, app))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        create = await client.post("/games", json={})
+        create.raise_for_status()
+        game_id = create.json()["game_id"]
+
+        resp = await client.post(f"/games/{game_id}/advance?async=1", json={"event": "ROUND_2_READY", "payload": {}})
+        assert resp.status_code == 202
+
+        job = await _drain_until_done(client, resp.json()["job_id"])
+        assert job["status"] == "failed"
+        assert job["result_status"] == 400
+        assert job["attempts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retried_advance_job_does_not_apply_a_committed_event_twice():
+    transport = ASGITransport(app=cast(Any, app))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        create = await client.post("/games", json={})
+        create.raise_for_status()
+        game_id = create.json()["game_id"]
+        await client.post(f"/games/{game_id}/advance", json={"event": "ROLE_CONFIRMED", "payload": {"human_role_id": "USA"}})
+
+        resp = await client.post(f"/games/{game_id}/advance?async=1", json={"event": "ROUND_1_READY", "payload": {}})
+        assert resp.status_code == 202
+        advance = default_job_handlers()["advance"]
+
+        async def commit_then_crash(session, job):
+            await advance(session, job)
+            raise RuntimeError("worker lost after commit")
+
+        crashing = LLMJobWorkerPool(get_session_maker(), {"advance": commit_then_crash}, concurrency=1, retry_delay=0)
+        assert await crashing.run_once("test-worker")
+        after_first = (await client.get(f"/games/{game_id}")).json()
+
+        job = await _drain_until_done(client, resp.json()["job_id"])
+        assert job["status"] == "failed"
+        assert job["result_status"] == 409
+        assert job["attempts"] == 2
+        assert (await client.get(f"/games/{game_id}")).json()["game"]["version"] == after_first["game"]["version"]
@@ -94,7 +94,7 @@ async def test_round2_llm_writes_trace_row():
         trace = traces[-1]
         assert trace["provider"] == "fake"
         assert trace["model"] == "fake"
-        assert trace["prompt_version"] == "r2_convo_v3"
+        assert trace["prompt_version"] == "r2_convo_v4"
         req_payload = _normalize_payload(trace.get("request_payload"))
         assert test_msg in (req_payload.get("prompt") or "")
         assert "Role: You are" in (req_payload.get("prompt") or "")
@@ -213,7 +213,7 @@ async def test_round2_llm_trace_openai_stub(monkeypatch: pytest.MonkeyPatch):
         trace = traces[-1]
         assert trace["provider"] == "openai"
         assert trace["model"] == expected_model
-        assert trace["prompt_version"] == "r2_convo_v3"
+        assert trace["prompt_version"] == "r2_convo_v4"
         resp_payload = trace.get("response_payload") or {}
         assert resp_payload.get("assistant_text") == ai_content
 
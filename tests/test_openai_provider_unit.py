@@ -1,8 +1,47 @@
 import pytest
 import asyncio
+import json
+import os
+import time
 
 from backend.config import get_settings
-from backend.llm_provider import OpenAIProvider, ValidationError, DEFAULT_OPENAI_MODEL, FakeLLMProvider, get_llm_provider
+from backend.llm_provider import (
+    CannedLLMProvider,
+    CircuitBreaker,
+    CircuitOpenError,
+    DEFAULT_OPENAI_MODEL,
+    FakeLLMProvider,
+    HedgedLLMProvider,
+    LatencyTracker,
+    LLMCallError,
+    LLMCancelledError,
+    ModelRouter,
+    OpenAIProvider,
+    RetryBudget,
+    ReusingLLMProvider,
+    RoutedLLMProvider,
+    SpeechReuseCache,
+    ValidationError,
+    classify_llm_error,
+    generate_with_cancellation,
+    get_llm_provider,
+    is_reasoning_model,
+    output_limits_for,
+    served_by,
+    truncate_output,
+)
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
 
 
 @pytest.mark.asyncio
@@ -81,3 +120,620 @@ def test_provider_uses_default_model_when_env_unset(monkeypatch: pytest.MonkeyPa
     provider = get_llm_provider(_AppState())
     assert provider.provider_name == "openai"
     assert provider.model_name == DEFAULT_OPENAI_MODEL
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_retries_rate_limit_with_backoff(monkeypatch: pytest.MonkeyPatch):
+    get_settings.cache_clear()
+    monkeypatch.setenv("MERCURY_ENV", "dev")
+    get_settings.cache_clear()
+    calls: list[str] = []
+    sleeps: list[float] = []
+
+    async def stub_caller(prompt: str) -> str:
+        calls.append(prompt)
+        if len(calls) < 3:
+            raise _RateLimitError("slow down")
+        return "ok"
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    provider = OpenAIProvider(
+        api_key="dummy",
+        model="stub-model",
+        client=stub_caller,
+        retry_base_delay=1.0,
+        retry_max_delay=4.0,
+        retry_budget=RetryBudget(),
+        sleep=fake_sleep,
+    )
+    resp = await provider.generate({"prompt": "hello"})
+    assert resp.get("assistant_text") == "ok"
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+    assert 0.0 <= sleeps[0] <= 1.0
+    assert 0.0 <= sleeps[1] <= 2.0
+    metadata = resp.get("metadata") or {}
+    assert metadata.get("attempts") == 3
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_does_not_retry_unclassified_errors(monkeypatch: pytest.MonkeyPatch):
+    get_settings.cache_clear()
+    monkeypatch.setenv("MERCURY_ENV", "dev")
+    get_settings.cache_clear()
+    calls: list[str] = []
+
+    async def stub_caller(prompt: str) -> str:
+        calls.append(prompt)
+        raise RuntimeError("rate of something went wrong")
+
+    async def fake_sleep(delay: float) -> None:
+        raise AssertionError("should not sleep")
+
+    provider = OpenAIProvider(api_key="dummy", model="stub-model", client=stub_caller, sleep=fake_sleep)
+    with pytest.raises(LLMCallError) as excinfo:
+        await provider.generate({"prompt": "hello"})
+    assert len(calls) == 1
+    assert excinfo.value.error_class == "unknown"
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_respects_retry_budget(monkeypatch: pytest.MonkeyPatch):
+    get_settings.cache_clear()
+    monkeypatch.setenv("MERCURY_ENV", "dev")
+    get_settings.cache_clear()
+    calls: list[str] = []
+
+    async def stub_caller(prompt: str) -> str:
+        calls.append(prompt)
+        raise TimeoutError("timed out")
+
+    async def fake_sleep(delay: float) -> None:
+        return None
+
+    budget = RetryBudget(ratio=0.0, min_retries=1, clock=_Clock())
+    provider = OpenAIProvider(
+        api_key="dummy", model="stub-model", client=stub_caller, max_retries=5, retry_budget=budget, sleep=fake_sleep
+    )
+    with pytest.raises(LLMCallError):
+        await provider.generate({"prompt": "hello"})
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_opens_and_routes_to_fallback(monkeypatch: pytest.MonkeyPatch):
+    get_settings.cache_clear()
+    monkeypatch.setenv("MERCURY_ENV", "dev")
+    get_settings.cache_clear()
+    calls: list[str] = []
+    healthy = False
+
+    async def stub_caller(prompt: str) -> str:
+        calls.append(prompt)
+        if not healthy:
+            raise _RateLimitError("overloaded")
+        return "recovered"
+
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, clock=clock)
+    provider = OpenAIProvider(
+        api_key="dummy",
+        model="stub-model",
+        client=stub_caller,
+        max_retries=0,
+        circuit_breaker=breaker,
+        fallback=CannedLLMProvider(),
+    )
+    for _ in range(2):
+        with pytest.raises(LLMCallError):
+            await provider.generate({"prompt": "hello", "prompt_version": "r3_debate_speech_v1"})
+    assert breaker.state == CircuitBreaker.OPEN
+
+    resp = await provider.generate({"prompt": "hello", "prompt_version": "r3_debate_speech_v1"})
+    assert len(calls) == 2
+    metadata = resp.get("metadata") or {}
+    assert metadata.get("provider") == "canned"
+    assert metadata.get("fallback_from") == "openai"
+
+    clock.now = 11.0
+    healthy = True
+    resp = await provider.generate({"prompt": "hello"})
+    assert resp.get("assistant_text") == "recovered"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_without_fallback_fails_fast(monkeypatch: pytest.MonkeyPatch):
+    get_settings.cache_clear()
+    monkeypatch.setenv("MERCURY_ENV", "dev")
+    get_settings.cache_clear()
+
+    async def stub_caller(prompt: str) -> str:
+        raise TimeoutError("timed out")
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0, clock=_Clock())
+    provider = OpenAIProvider(
+        api_key="dummy", model="stub-model", client=stub_caller, max_retries=0, circuit_breaker=breaker
+    )
+    with pytest.raises(LLMCallError):
+        await provider.generate({"prompt": "hello"})
+    with pytest.raises(CircuitOpenError):
+        await provider.generate({"prompt": "hello"})
+
+
+def test_classify_llm_error_uses_types_and_status_codes() -> None:
+    class APIConnectionError(Exception):
+        pass
+
+    class _ServerError(Exception):
+        status_code = 503
+
+    class _BadRequest(Exception):
+        status_code = 400
+
+    assert classify_llm_error(TimeoutError()) == "timeout"
+    assert classify_llm_error(APIConnectionError()) == "connection"
+    assert classify_llm_error(_RateLimitError()) == "rate_limit"
+    assert classify_llm_error(_ServerError()) == "server"
+    assert classify_llm_error(_BadRequest()) == "client"
+    assert classify_llm_error(RuntimeError("timeout")) == "unknown"
+
+
+@pytest.mark.asyncio
+async def test_hedged_provider_hedge_wins_and_cancels_primary():
+    cancelled: list[str] = []
+    calls: list[int] = []
+
+    class _SlowThenFast:
+        provider_name = "openai"
+        model_name = "stub-model"
+
+        async def generate(self, request):
+            calls.append(len(calls))
+            delay = 5.0 if len(calls) == 1 else 0.0
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled.append("primary")
+                raise
+            return {"assistant_text": f"call-{len(calls)}", "metadata": {"provider": "openai"}}
+
+    provider = HedgedLLMProvider(_SlowThenFast(), initial_delay=0.01)
+    resp = await provider.generate({"prompt": "hello", "prompt_version": "r2_convo_v4"})
+    assert resp.get("assistant_text") == "call-2"
+    hedge = (resp.get("metadata") or {}).get("hedge") or {}
+    assert hedge.get("hedge_count") == 1
+    assert hedge.get("hedge_won") is True
+    assert cancelled == ["primary"]
+    assert provider.provider_name == "openai"
+
+
+@pytest.mark.asyncio
+async def test_hedged_provider_fast_primary_skips_hedge():
+    class _Fast:
+        provider_name = "fake"
+        model_name = "fake"
+
+        async def generate(self, request):
+            return {"assistant_text": "quick", "metadata": None}
+
+    provider = HedgedLLMProvider(_Fast(), initial_delay=1.0)
+    resp = await provider.generate({"prompt": "hello", "prompt_version": "r2_convo_v4"})
+    hedge = (resp.get("metadata") or {}).get("hedge") or {}
+    assert hedge.get("hedge_count") == 0
+    assert hedge.get("hedge_won") is False
+    assert provider.tracker.sample_count("r2_convo_v4") == 1
+
+
+def test_hedge_delay_tracks_percentile_per_prompt_version():
+    tracker = LatencyTracker()
+    for i in range(1, 101):
+        tracker.record("r3_debate_speech_v1", i / 100.0)
+    provider = HedgedLLMProvider(FakeLLMProvider(), percentile=95.0, min_samples=20, initial_delay=9.0, tracker=tracker)
+    assert provider.hedge_delay("r3_debate_speech_v1") == pytest.approx(0.95, abs=0.011)
+    assert provider.hedge_delay("r2_convo_v4") == 9.0
+
+
+class _NamedProvider:
+    def __init__(self, name: str, model: str, fail: bool = False) -> None:
+        self.provider_name = name
+        self.model_name = model
+        self.fail = fail
+        self.calls = 0
+
+    async def generate(self, request):
+        self.calls += 1
+        if self.fail:
+            raise _RateLimitError("slow down")
+        return {"assistant_text": f"{self.model_name} reply", "metadata": None}
+
+
+_ROUTING_TABLE = {
+    "default": [{"provider": "openai", "model": "small"}],
+    "prompt_versions": {
+        "r3_debate_speech_v1": [
+            {
+                "name": "quality",
+                "when": {"min_remaining_seconds": 20},
+                "targets": [{"provider": "openai", "model": "large"}, {"provider": "openai", "model": "small"}],
+            },
+        ],
+        "r2_convo_v4": [
+            {"name": "short_turn", "when": {"max_prompt_tokens": 100}, "targets": [{"provider": "openai", "model": "small"}]},
+        ],
+    },
+}
+
+
+@pytest.mark.asyncio
+async def test_routed_provider_selects_by_prompt_version_and_conditions():
+    providers = {"small": _NamedProvider("openai", "small"), "large": _NamedProvider("openai", "large")}
+    routed = RoutedLLMProvider(ModelRouter(_ROUTING_TABLE), lambda target: providers[target["model"]])
+    assert routed.provider_name == "routed"
+
+    speech = await routed.generate(
+        {"prompt": "x", "prompt_version": "r3_debate_speech_v1", "deadline": time.monotonic() + 60}
+    )
+    assert speech.get("assistant_text") == "large reply"
+    assert (speech.get("metadata") or {})["routing"]["rule"] == "quality"
+
+    rushed = await routed.generate(
+        {"prompt": "x", "prompt_version": "r3_debate_speech_v1", "deadline": time.monotonic() + 5}
+    )
+    assert (rushed.get("metadata") or {})["routing"]["rule"] == "default"
+
+    long_turn = await routed.generate({"prompt": "y" * 1000, "prompt_version": "r2_convo_v4"})
+    assert (long_turn.get("metadata") or {})["routing"]["rule"] == "default"
+    short_turn = await routed.generate({"prompt": "y", "prompt_version": "r2_convo_v4"})
+    assert (short_turn.get("metadata") or {})["routing"]["rule"] == "short_turn"
+
+
+@pytest.mark.asyncio
+async def test_routed_provider_falls_back_in_order_and_records_decision():
+    providers = {"small": _NamedProvider("openai", "small"), "large": _NamedProvider("openai", "large", fail=True)}
+    routed = RoutedLLMProvider(ModelRouter(_ROUTING_TABLE), lambda target: providers[target["model"]])
+    resp = await routed.generate(
+        {"prompt": "x", "prompt_version": "r3_debate_speech_v1", "deadline": time.monotonic() + 60}
+    )
+    routing = (resp.get("metadata") or {})["routing"]
+    assert resp.get("assistant_text") == "small reply"
+    assert routing["fallback_index"] == 1
+    assert routing["failed_attempts"] == [{"target": "openai:large", "error_class": "rate_limit"}]
+    assert served_by(routed.provider_name, routed.model_name, resp) == ("openai", "small")
+    assert served_by("openai", "small", {"assistant_text": "x", "metadata": None}) == ("openai", "small")
+
+
+def test_routed_openai_targets_share_the_process_retry_budget(monkeypatch):
+    from backend.llm_provider import _build_route_target_provider
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("LLM_RETRY_BUDGET_RATIO", "0.1")
+    get_settings.cache_clear()
+    try:
+        settings = get_settings()
+        small = _build_route_target_provider({"provider": "openai", "model": "small"}, settings, object())
+        large = _build_route_target_provider({"provider": "openai", "model": "large"}, settings, object())
+    finally:
+        get_settings.cache_clear()
+    assert isinstance(small, OpenAIProvider) and isinstance(large, OpenAIProvider)
+    assert small.retry_budget is large.retry_budget
+    assert small.retry_budget.ratio == 0.1
+
+
+def test_model_router_hot_reloads_table_from_file(tmp_path):
+    path = tmp_path / "routing.json"
+    path.write_text(json.dumps({"default": [{"provider": "openai", "model": "small"}]}))
+    clock = _Clock()
+    router = ModelRouter(path=str(path), reload_interval=5.0, clock=clock)
+    assert router.default_targets()[0]["model"] == "small"
+
+    path.write_text(json.dumps({"default": [{"provider": "openai", "model": "large"}]}))
+    os.utime(path, (time.time() + 10, time.time() + 10))
+    router.select({"prompt_version": "r2_convo_v4"})
+    assert router.default_targets()[0]["model"] == "small"
+    clock.now += 6.0
+    router.select({"prompt_version": "r2_convo_v4"})
+    assert router.default_targets()[0]["model"] == "large"
+
+    path.write_text("{not json")
+    os.utime(path, (time.time() + 20, time.time() + 20))
+    clock.now += 6.0
+    router.select({"prompt_version": "r2_convo_v4"})
+    assert router.default_targets()[0]["model"] == "large"
+
+
+def _speech_request(acceptance: float, firmness: float) -> dict:
+    return {
+        "prompt": f"speech {acceptance} {firmness}",
+        "prompt_version": "r3_debate_speech_v1",
+        "request_payload": {
+            "speaker_role": "BRA",
+            "issue_id": "1",
+            "debate_round": 1,
+            "speech_number": 1,
+            "speaker_opening_summary": "Brazil opening.",
+            "speaker_issue_stance_snapshot": {
+                "preferred": "1.2",
+                "firmness": firmness,
+                "acceptance": {"1.2": acceptance},
+            },
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_reuse_cache_serves_near_duplicate_contexts_after_variety_limit():
+    calls: list[str] = []
+
+    class _Counting:
+        provider_name = "openai"
+        model_name = "stub-model"
+
+        async def generate(self, request):
+            calls.append(request["prompt"])
+            return {"assistant_text": f"speech-{len(calls)}", "metadata": None}
+
+    provider = ReusingLLMProvider(_Counting(), SpeechReuseCache(variants_per_key=2, granularity=0.1))
+    first = await provider.generate(_speech_request(0.71, 0.52))
+    second = await provider.generate(_speech_request(0.69, 0.48))
+    third = await provider.generate(_speech_request(0.70, 0.50))
+    fourth = await provider.generate(_speech_request(0.72, 0.51))
+    assert len(calls) == 2
+    assert (third.get("metadata") or {})["reuse"]["hit"] is True
+    assert {third.get("assistant_text"), fourth.get("assistant_text")} == {
+        first.get("assistant_text"),
+        second.get("assistant_text"),
+    }
+
+    await provider.generate(_speech_request(0.3, 0.5))
+    assert len(calls) == 3
+    await provider.generate({"prompt": "convo", "prompt_version": "r2_convo_v4", "request_payload": {}})
+    assert len(calls) == 4
+
+
+def test_reuse_cache_evicts_least_recently_used_key():
+    cache = SpeechReuseCache(max_keys=2, variants_per_key=1)
+    cache.store("a", "speech a")
+    cache.store("b", "speech b")
+    assert cache.lookup("a") == "speech a"
+    cache.store("c", "speech c")
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") == "speech a"
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_reports_token_usage(monkeypatch: pytest.MonkeyPatch):
+    get_settings.cache_clear()
+    monkeypatch.setenv("MERCURY_ENV", "dev")
+    get_settings.cache_clear()
+
+    class _InputDetails:
+        cached_tokens = 96
+
+    class _Usage:
+        input_tokens = 120
+        output_tokens = 30
+        input_tokens_details = _InputDetails()
+
+    class _Resp:
+        output_text = "speech"
+        usage = _Usage()
+
+    class _Responses:
+        async def create(self, **kwargs):
+            return _Resp()
+
+    class _Client:
+        responses = _Responses()
+
+    provider = OpenAIProvider(api_key="dummy", model="stub-model", client=_Client())
+    resp = await provider.generate({"prompt": "hello"})
+    metadata = resp.get("metadata") or {}
+    assert metadata.get("usage") == {"input_tokens": 120, "output_tokens": 30, "cached_input_tokens": 96}
+
+
+@pytest.mark.asyncio
+async def test_openai_reasoning_model_reports_a_cap_spent_on_reasoning(monkeypatch: pytest.MonkeyPatch):
+    get_settings.cache_clear()
+    monkeypatch.setenv("MERCURY_ENV", "dev")
+    get_settings.cache_clear()
+    seen: dict = {}
+
+    class _Details:
+        reason = "max_output_tokens"
+
+    class _Resp:
+        output_text = ""
+        status = "incomplete"
+        incomplete_details = _Details()
+        usage = None
+
+    class _Responses:
+        async def create(self, **kwargs):
+            seen.update(kwargs)
+            return _Resp()
+
+    class _Client:
+        responses = _Responses()
+
+    assert is_reasoning_model(DEFAULT_OPENAI_MODEL)
+    assert not is_reasoning_model("gpt-4o-mini")
+    provider = OpenAIProvider(api_key="dummy", model=DEFAULT_OPENAI_MODEL, client=_Client(), reasoning_effort="minimal")
+    with pytest.raises(ValidationError) as excinfo:
+        await provider.generate({"prompt": "hello", "max_output_tokens": 800})
+    assert seen["reasoning"] == {"effort": "minimal"}
+    message = str(excinfo.value)
+    assert "incomplete (max_output_tokens)" in message and "max_output_tokens=800" in message
+
+
+@pytest.mark.asyncio
+async def test_openai_streamed_response_reports_incomplete_without_text(monkeypatch: pytest.MonkeyPatch):
+    get_settings.cache_clear()
+    monkeypatch.setenv("MERCURY_ENV", "dev")
+    get_settings.cache_clear()
+
+    class _Details:
+        reason = "max_output_tokens"
+
+    class _Resp:
+        incomplete_details = _Details()
+        usage = None
+
+    class _Incomplete:
+        type = "response.incomplete"
+        response = _Resp()
+
+    class _Stream:
+        def __aiter__(self):
+            return self._events()
+
+        async def _events(self):
+            yield _Incomplete()
+
+    class _Responses:
+        async def create(self, **kwargs):
+            return _Stream()
+
+    class _Client:
+        responses = _Responses()
+
+    provider = OpenAIProvider(api_key="dummy", model=DEFAULT_OPENAI_MODEL, client=_Client(), reasoning_effort="minimal")
+    with pytest.raises(ValidationError, match=r"incomplete \(max_output_tokens\)"):
+        await provider.generate({"prompt": "hello", "max_output_tokens": 1200, "target_words": 180})
+
+
+def test_truncate_output_applies_stop_sequences_and_word_cap():
+    text, truncated = truncate_output("We support 1.2.\n\nSpeech:\nmore", {"stop": ["\n\nSpeech:"]})
+    assert (text, truncated) == ("We support 1.2.", True)
+
+    long_text = "First sentence here. " + " ".join(["word"] * 40)
+    text, truncated = truncate_output(long_text, {"target_words": 10})
+    assert truncated is True
+    assert len(text.split()) <= 15
+
+    sentences = "One two three four five. Six seven eight nine ten. Eleven twelve thirteen fourteen fifteen sixteen."
+    text, _ = truncate_output(sentences, {"target_words": 10})
+    assert text == "One two three four five. Six seven eight nine ten."
+
+    assert truncate_output("short reply", {"target_words": 10, "stop": ["\n\nX"]}) == ("short reply", False)
+
+
+def test_output_limits_for_merges_overrides():
+    limits = output_limits_for("r3_debate_speech_v1", {"r3_debate_speech_v1": {"target_words": 90}})
+    assert limits["target_words"] == 90
+    assert limits["max_output_tokens"] > 0
+    assert output_limits_for("unknown_version") == {}
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_streams_and_stops_at_word_cap(monkeypatch: pytest.MonkeyPatch):
+    get_settings.cache_clear()
+    monkeypatch.setenv("MERCURY_ENV", "dev")
+    get_settings.cache_clear()
+    seen: dict = {}
+    consumed: list[int] = []
+
+    class _Event:
+        def __init__(self, delta: str) -> None:
+            self.type = "response.output_text.delta"
+            self.delta = delta
+
+    class _Stream:
+        def __init__(self) -> None:
+            self.closed = False
+
+        def __aiter__(self):
+            return self._events()
+
+        async def _events(self):
+            for i in range(200):
+                consumed.append(i)
+                yield _Event(f"w{i} " if i % 5 else f"S{i}. ")
+
+        async def close(self) -> None:
+            self.closed = True
+
+    stream = _Stream()
+
+    class _Responses:
+        async def create(self, **kwargs):
+            seen.update(kwargs)
+            return stream
+
+    class _Client:
+        responses = _Responses()
+
+    provider = OpenAIProvider(api_key="dummy", model="stub-model", client=_Client())
+    resp = await provider.generate(
+        {"prompt": "hello", "prompt_version": "r3_debate_speech_v1", "max_output_tokens": 300, "target_words": 20}
+    )
+    assert seen["stream"] is True
+    assert seen["max_output_tokens"] == 300
+    assert len(consumed) < 40
+    assert stream.closed is True
+    assert len((resp.get("assistant_text") or "").split()) <= 30
+    assert (resp.get("metadata") or {}).get("truncated") is True
+
+
+class _SlowProvider:
+    provider_name = "openai"
+    model_name = "stub-model"
+
+    def __init__(self) -> None:
+        self.cancelled = False
+
+    async def generate(self, request):
+        try:
+            await asyncio.sleep(5.0)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {"assistant_text": "late", "metadata": None}
+
+
+@pytest.mark.asyncio
+async def test_generate_with_cancellation_enforces_deadline():
+    provider = _SlowProvider()
+    request = {"prompt": "hello", "deadline": time.monotonic() + 0.05}
+    with pytest.raises(LLMCancelledError) as excinfo:
+        await generate_with_cancellation(provider, request)
+    assert excinfo.value.reason == "deadline_exceeded"
+    assert provider.cancelled
+
+
+@pytest.mark.asyncio
+async def test_generate_with_cancellation_stops_on_client_disconnect():
+    provider = _SlowProvider()
+    polls: list[int] = []
+
+    async def is_disconnected() -> bool:
+        polls.append(1)
+        return len(polls) >= 2
+
+    with pytest.raises(LLMCancelledError) as excinfo:
+        await generate_with_cancellation(provider, {"prompt": "hello"}, is_disconnected=is_disconnected, poll_interval=0.01)
+    assert excinfo.value.reason == "client_disconnected"
+    assert provider.cancelled
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_skips_retry_past_deadline(monkeypatch: pytest.MonkeyPatch):
+    get_settings.cache_clear()
+    monkeypatch.setenv("MERCURY_ENV", "dev")
+    get_settings.cache_clear()
+    calls: list[str] = []
+
+    async def stub_caller(prompt: str) -> str:
+        calls.append(prompt)
+        raise TimeoutError("timed out")
+
+    provider = OpenAIProvider(
+        api_key="dummy", model="stub-model", client=stub_caller, retry_base_delay=10.0, retry_max_delay=10.0
+    )
+    monkeypatch.setattr("random.uniform", lambda a, b: b)
+    with pytest.raises(LLMCallError):
+        await provider.generate({"prompt": "hello", "deadline": time.monotonic() + 1.0})
+    assert len(calls) == 1
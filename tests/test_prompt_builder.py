@@ -0,0 +1,151 @@
+from backend.llm_provider import CANNED_RESPONSES, DEFAULT_OUTPUT_LIMITS
+from backend.prompt_builder import (
+    DEFAULT_PROMPT_TOKEN_BUDGETS,
+    ROUND2_PROMPT_VERSION,
+    build_round2_context,
+    build_round2_conversation_prompt,
+    build_round3_debate_speech_prompt_v1,
+    estimate_tokens,
+)
+
+
+def _round2_context(tail_len: int) -> dict:
+    long_opening = "Our delegation opens with a first sentence. " + ("More detail follows here. " * 80)
+    transcript_tail = [
+        {"role_id": "USA" if i % 2 == 0 else "BRA", "content": f"message {i} " + ("x" * 200)}
+        for i in range(tail_len)
+    ]
+    issues = [
+        {
+            "issue_id": str(n),
+            "title": f"Issue {n}",
+            "options": [{"option_id": f"{n}.{k}", "label": f"Option {n}.{k}"} for k in range(1, 9)],
+        }
+        for n in range(1, 5)
+    ]
+    return build_round2_context(
+        game_id="g1",
+        active_convo_index=1,
+        active_convo={"partner_role": "BRA", "status": "ACTIVE"},
+        partner_role="BRA",
+        partner_opening={"text": long_opening, "initial_stances": {}, "conversation_interests": {}},
+        human_opening_text=long_opening,
+        transcript_tail=transcript_tail,
+        issues=issues,
+    )
+
+
+def _build_round2(context: dict, token_budget: int) -> dict:
+    return build_round2_conversation_prompt(
+        game_id="g1",
+        role_id="BRA",
+        status="ROUND_2_CONVERSATION_ACTIVE",
+        human_content="latest human message",
+        partner_role="BRA",
+        convo_key="convo1",
+        human_turns=5,
+        ai_turns=4,
+        human_role="USA",
+        context=context,
+        token_budget=token_budget,
+    )
+
+
+def test_round2_prompt_untouched_when_within_budget():
+    context = _round2_context(tail_len=2)
+    payload = _build_round2(context, token_budget=100000)
+    token_info = payload["request_payload"]["token_estimate"]
+    assert token_info["trimmed"] == []
+    assert token_info["estimated_tokens"] == estimate_tokens(payload["prompt"])
+    assert len(context["transcript_tail"]) == 2
+
+
+def test_round2_prompt_trims_tail_before_openings():
+    context = _round2_context(tail_len=10)
+    untrimmed = estimate_tokens(_build_round2(_round2_context(tail_len=10), token_budget=0)["prompt"])
+    payload = _build_round2(context, token_budget=untrimmed - 100)
+    token_info = payload["request_payload"]["token_estimate"]
+    assert token_info["trimmed"] == ["transcript_tail"]
+    assert token_info["estimated_tokens"] <= untrimmed - 100
+    assert context["transcript_tail"][-1]["content"].startswith("message 9")
+    assert len(context["openings"]["human_opening_text"]) > 1000
+
+
+def test_round2_prompt_trims_by_priority_under_tight_budget():
+    context = _round2_context(tail_len=10)
+    payload = _build_round2(context, token_budget=400)
+    token_info = payload["request_payload"]["token_estimate"]
+    assert token_info["trimmed"][:3] == ["transcript_tail", "opening_summaries", "option_lists"]
+    assert context["openings"]["human_opening_text"] == "Our delegation opens with a first sentence."
+    assert all(len(issue["options"]) <= 4 for issue in context["issues"])
+    assert len(context["transcript_tail"]) >= 1
+    assert "latest human message" in payload["prompt"]
+
+
+def test_round3_prompt_records_token_estimate():
+    state = {
+        "roles": {"BRA": {"type": "country"}},
+        "round1": {"openings": {"BRA": {"text": "Brazil supports action. " + ("Detail. " * 50)}}},
+        "stances": {},
+    }
+    active_issue = {
+        "issue_id": "1",
+        "issue_title": "Issue 1",
+        "options": [
+            {"option_id": "1.1", "label": "Label", "short_description": "A much longer description " * 10}
+        ],
+    }
+    tail = [{"role_id": "BRA", "content": "y" * 240} for _ in range(8)]
+    payload = build_round3_debate_speech_prompt_v1(
+        state=state,
+        active_issue=active_issue,
+        speaker_role="BRA",
+        debate_round=1,
+        public_debate_tail=tail,
+        token_budget=300,
+    )
+    token_info = payload["request_payload"]["token_estimate"]
+    assert token_info["token_budget"] == 300
+    assert "debate_transcript_tail" in token_info["trimmed"]
+    assert token_info["estimated_tokens"] < token_info["estimated_tokens_untrimmed"]
+    assert token_info["estimated_tokens"] == estimate_tokens(payload["prompt_text"])
+
+
+def test_round2_prompt_shares_static_prefix_across_roles():
+    first = build_round2_conversation_prompt(
+        game_id="g1",
+        role_id="BRA",
+        status="ROUND_2_CONVERSATION_ACTIVE",
+        human_content="hello",
+        partner_role="BRA",
+        convo_key="convo1",
+        human_turns=1,
+        ai_turns=0,
+        human_role="USA",
+        context=_round2_context(tail_len=1),
+    )
+    second = build_round2_conversation_prompt(
+        game_id="g2",
+        role_id="CHN",
+        status="ROUND_2_CONVERSATION_ACTIVE",
+        human_content="a different message",
+        partner_role="CHN",
+        convo_key="convo2",
+        human_turns=3,
+        ai_turns=2,
+        human_role="EU",
+        context=_round2_context(tail_len=4),
+    )
+    assert first["request_payload"]["static_prefix_hash"] == second["request_payload"]["static_prefix_hash"]
+    role_index = first["prompt"].index("Role: You are BRA")
+    assert first["prompt"][:role_index] == second["prompt"][:role_index]
+    assert "{ROLE}" not in first["prompt"][:role_index]
+
+
+def test_round2_prompt_version_keys_budgets_limits_and_fallbacks():
+    payload = _build_round2(_round2_context(tail_len=2), token_budget=100_000)
+    assert payload["prompt_version"] == ROUND2_PROMPT_VERSION
+    assert ROUND2_PROMPT_VERSION in DEFAULT_PROMPT_TOKEN_BUDGETS
+    assert ROUND2_PROMPT_VERSION in DEFAULT_OUTPUT_LIMITS
+    assert ROUND2_PROMPT_VERSION in CANNED_RESPONSES
+    assert "listed under Issues" in payload["prompt"]
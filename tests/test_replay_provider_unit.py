@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from backend.llm_provider import ReplayLLMProvider, prompt_hash
+
+
+def _trace(prompt_version: str, prompt: str, text: str, latency_ms: int | None) -> dict:
+    return {
+        "prompt_version": prompt_version,
+        "latency_ms": latency_ms,
+        "request_payload": {"prompt": prompt, "prompt_version": prompt_version},
+        "response_payload": {"assistant_text": text},
+    }
+
+
+@pytest.mark.asyncio
+async def test_replay_exact_prompt_hash_hit_uses_recorded_latency():
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    provider = ReplayLLMProvider(
+        [_trace("r2_convo_v4", "hello", "recorded reply", 1200)],
+        sleep=fake_sleep,
+    )
+    resp = await provider.generate({"prompt": "hello", "prompt_version": "r2_convo_v4"})
+    assert resp.get("assistant_text") == "recorded reply"
+    metadata = resp.get("metadata") or {}
+    assert metadata.get("replay_match") == "exact"
+    assert sleeps == [pytest.approx(1.2)]
+
+
+@pytest.mark.asyncio
+async def test_replay_miss_falls_back_to_same_prompt_version():
+    provider = ReplayLLMProvider(
+        [
+            _trace("r2_convo_v4", "a", "convo reply", None),
+            _trace("r3_debate_speech_v1", "b", "debate speech", None),
+        ],
+        latency_mode="none",
+    )
+    resp = await provider.generate({"prompt": "unseen", "prompt_version": "r3_debate_speech_v1"})
+    assert resp.get("assistant_text") == "debate speech"
+    assert (resp.get("metadata") or {}).get("replay_match") == "prompt_version"
+    with pytest.raises(RuntimeError):
+        await provider.generate({"prompt": "x", "prompt_version": "unknown_v0"})
+
+
+@pytest.mark.asyncio
+async def test_replay_load_export_skips_error_rows_and_applies_fixed_latency(tmp_path):
+    rows = [
+        {
+            "prompt_version": "r2_convo_v4",
+            "prompt_hash": prompt_hash("p1"),
+            "latency_ms": 900,
+            "request_payload": json.dumps({"prompt": "p1"}),
+            "response_payload": json.dumps({"assistant_text": "ok"}),
+        },
+        {
+            "prompt_version": "r2_convo_v4",
+            "request_payload": {"prompt": "p2"},
+            "response_payload": {"error": {"type": "RuntimeError", "message": "boom"}},
+        },
+    ]
+    export = tmp_path / "traces.jsonl"
+    export.write_text("\n".join(json.dumps(r) for r in rows), encoding="utf-8")
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    provider = ReplayLLMProvider(latency_mode="fixed", fixed_latency_ms=250, latency_scale=2.0, sleep=fake_sleep)
+    assert provider.load_export(export) == 1
+    assert provider.record_count == 1
+    resp = await provider.generate({"prompt": "p1", "prompt_version": "r2_convo_v4"})
+    assert resp.get("assistant_text") == "ok"
+    assert sleeps == [pytest.approx(0.5)]
@@ -0,0 +1,35 @@
+import json
+import uuid
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from typing import Any, cast
+
+from backend.db import get_session_maker
+from backend.main import app
+from backend.reviews import fetch_stored_review, store_review
+
+
+@pytest.mark.asyncio
+async def test_stored_review_is_served_until_the_next_state_write():
+    transport = ASGITransport(app=cast(Any, app))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        game_id = (await client.post("/games", json={})).json()["game_id"]
+        fresh = (await client.get(f"/games/{game_id}/review")).json()
+        assert fresh["game_id"] == game_id and fresh["votes"] == []
+
+        marker = json.dumps({"game_id": game_id, "transcript": [], "votes": [], "materialized": True}).encode()
+        async with get_session_maker()() as session:
+            async with session.begin():
+                _, version, _ = await fetch_stored_review(session, uuid.UUID(game_id))
+                assert version is not None
+                await store_review(session, uuid.UUID(game_id), version, marker)
+
+        served = await client.get(f"/games/{game_id}/review")
+        assert served.json().get("materialized") is True
+
+        await client.post(
+            f"/games/{game_id}/advance", json={"event": "ROLE_CONFIRMED", "payload": {"human_role_id": "USA"}}
+        )
+        rebuilt = (await client.get(f"/games/{game_id}/review")).json()
+        assert "materialized" not in rebuilt
@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.main import app
 from backend.ai import FakeLLM
-from backend.db import get_session
+from backend.db import get_session, get_session_maker
 
 
 async def _count(session: AsyncSession, table: str, game_id: str) -> int:
@@ -142,3 +142,47 @@ async def test_interrupt_and_final_closure():
             json={"event": "CONVO_1_MESSAGE", "payload": {"content": "extra"}},
         )
         assert blocked.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_reply_is_rejected_when_conversation_moved_during_generation():
+    transport = ASGITransport(app=cast(Any, app))
+    game_ref: dict[str, str] = {}
+
+    class _ConcurrentTurn(FakeLLM):
+        async def respond(self, prompt: str) -> str:
+            if "game_id" in game_ref:
+                # Another request lands an AI turn while this one is generating.
+                async with get_session_maker()() as other:
+                    async with other.begin():
+                        await other.execute(
+                            text(
+                                "UPDATE game_state SET state = jsonb_set(state, '{round2,convo1,ai_turns_used}', '1'::jsonb), "
+                                "version = version + 1 WHERE game_id = :gid"
+                            ),
+                            {"gid": game_ref["game_id"]},
+                        )
+            return await super().respond(prompt)
+
+    app.state.ai_responder = _ConcurrentTurn()
+    try:
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            game_id = await _prepare_convo_active(client)
+            game_ref["game_id"] = game_id
+            resp = await client.post(
+                f"/games/{game_id}/advance",
+                json={"event": "CONVO_1_MESSAGE", "payload": {"content": "h0"}},
+            )
+            assert resp.status_code == 409
+
+            async with get_session_maker()() as session:
+                ai_rows = await session.execute(
+                    text(
+                        "SELECT COUNT(*) FROM transcript_entries "
+                        "WHERE game_id = :gid AND phase = 'ROUND_2' AND metadata->>'sender' = 'ai'"
+                    ),
+                    {"gid": game_id},
+                )
+                assert ai_rows.scalar_one() == 0
+    finally:
+        app.state.ai_responder = FakeLLM()
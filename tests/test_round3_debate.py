@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.main import app
 from backend.ai import FakeLLM
-from backend.db import get_session
+from backend.db import get_session, get_session_maker
 
 
 async def _count(session: AsyncSession, table: str, game_id: str) -> int:
@@ -136,3 +136,34 @@ async def test_human_turn_requires_explicit_message():
 
         assert t_after - t_before == 1
         assert c_after - c_before == 1
+
+
+@pytest.mark.asyncio
+async def test_ai_debate_speech_is_generated_without_holding_the_game_row_lock():
+    transport = ASGITransport(app=cast(Any, app))
+    lock_checks: list[bool] = []
+    game_ref: dict[str, str] = {}
+
+    class _LockProbe(FakeLLM):
+        async def respond(self, prompt: str) -> str:
+            if "game_id" in game_ref:
+                async with get_session_maker()() as probe:
+                    async with probe.begin():
+                        row = await probe.execute(
+                            text("SELECT id FROM games WHERE id = :gid FOR UPDATE NOWAIT"),
+                            {"gid": game_ref["game_id"]},
+                        )
+                        lock_checks.append(row.first() is not None)
+            return await super().respond(prompt)
+
+    app.state.ai_responder = _LockProbe()
+    try:
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            game_id = await _reach_issue_debate(client, human_placement="skip")
+            game_ref["game_id"] = game_id
+            resp = await client.post(f"/games/{game_id}/advance", json={"event": "ISSUE_DEBATE_STEP", "payload": {}})
+            assert resp.status_code == 200
+            assert resp.json()["state"]["round3"]["active_issue"]["debate_cursor"] == 1
+    finally:
+        app.state.ai_responder = FakeLLM()
+    assert lock_checks == [True]
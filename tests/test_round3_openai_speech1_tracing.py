@@ -17,7 +17,7 @@ async def _fetch_llm_traces(session: AsyncSession, game_id: str) -> list[dict[st
     rows = await session.execute(
         text(
             """
-            SELECT game_id, role_id, status, provider, model, prompt_version, request_payload, response_payload
+            SELECT game_id, role_id, status, provider, model, prompt_version, prompt_hash, request_payload, response_payload
             FROM llm_traces
             WHERE game_id = :gid
             ORDER BY created_at DESC, id DESC
@@ -95,6 +95,8 @@ async def test_round3_openai_speech1_success(monkeypatch: pytest.MonkeyPatch):
         trace = traces[0]
         assert trace["provider"] == "openai"
         assert trace["prompt_version"] == "r3_debate_speech_v1"
+        # The Round 3 payload carries no "prompt" key; the hash comes from the prompt text itself.
+        assert trace["prompt_hash"], "Round 3 trace has no prompt_hash, so replay cannot match it exactly"
         req_payload = _normalize_payload(trace.get("request_payload"))
         assert req_payload.get("speech_number") == 1
         assert req_payload.get("debate_round") == 1
@@ -172,6 +174,8 @@ async def test_round3_openai_speech1_failure(monkeypatch: pytest.MonkeyPatch):
         trace = traces[0]
         assert trace["provider"] == "openai"
         assert trace["prompt_version"] == "r3_debate_speech_v1"
+        # The Round 3 payload carries no "prompt" key; the hash comes from the prompt text itself.
+        assert trace["prompt_hash"], "Round 3 trace has no prompt_hash, so replay cannot match it exactly"
         req_payload = _normalize_payload(trace.get("request_payload"))
         assert req_payload.get("speech_number") == 1
         assert req_payload.get("issue_id") == "1"
@@ -0,0 +1,168 @@
+import asyncio
+import copy
+import uuid
+
+import pytest
+
+from backend.llm_provider import LLMConcurrencyLimiter, generate_with_cancellation
+from backend.side_negotiations import negotiate_pair, side_negotiation_pairs
+from backend.state import initial_state
+
+
+def _state() -> dict:
+    state = initial_state("USA")
+    state["round1"]["openings"] = {
+        role: {"text": f"{role} opening statement.", "initial_stances": {}} for role in state["roles"]
+    }
+    return state
+
+
+def test_side_negotiation_pairs_cover_all_ai_roles_except_human_and_chair():
+    pairs = side_negotiation_pairs(_state())
+    roles = {role for pair in pairs for role in pair}
+    assert "USA" not in roles and "JPN" not in roles
+    assert len(roles) == 8
+    assert len(pairs) == 28
+    assert all(a < b for a, b in pairs)
+
+
+@pytest.mark.asyncio
+async def test_negotiate_pair_alternates_speakers_and_respects_concurrency_limit():
+    in_flight = 0
+    peak = 0
+    prompts: list[str] = []
+
+    class _Slow:
+        provider_name = "fake"
+        model_name = "fake"
+
+        async def generate(self, request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            prompts.append(request["prompt"])
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"assistant_text": f"{request['role_id']} reply", "metadata": None}
+
+    state = _state()
+    limiter = asyncio.Semaphore(3)
+    pairs = side_negotiation_pairs(state)[:6]
+    results = await asyncio.gather(
+        *(negotiate_pair(_Slow(), uuid.uuid4(), state, pair, [], 3, limiter) for pair in pairs)
+    )
+    assert peak <= 3
+    first = results[0]
+    a, b = pairs[0]
+    assert [turn["role_id"] for turn in first] == [a, b, a]
+    assert first[1]["content"] == f"{b} reply"
+    assert len(prompts) == 18
+    assert any(f"{b} opening statement." in prompt for prompt in prompts)
+
+
+class _Session:
+    def __init__(self, log: list) -> None:
+        self.log = log
+
+    def begin(self):
+        session = self
+
+        class _Transaction:
+            async def __aenter__(self):
+                session.log.append("begin")
+
+            async def __aexit__(self, exc_type, exc, tb):
+                session.log.append("rollback" if exc_type else "commit")
+                return False
+
+        return _Transaction()
+
+
+@pytest.mark.asyncio
+async def test_side_negotiations_start_only_after_the_transition_commits():
+    from backend.main import _transaction_then
+
+    log: list = []
+    async with _transaction_then(_Session(log), [lambda: log.append("start")]):
+        log.append("write")
+    assert log == ["begin", "write", "commit", "start"]
+
+    log.clear()
+    with pytest.raises(RuntimeError):
+        async with _transaction_then(_Session(log), [lambda: log.append("start")]):
+            raise RuntimeError("invalid event")
+    assert log == ["begin", "rollback"]
+
+
+@pytest.mark.asyncio
+async def test_side_negotiation_turns_shift_only_the_listener():
+    from backend.side_negotiations import apply_side_negotiation_shifts
+
+    row = {
+        "id": uuid.uuid4(),
+        "role_a": "BRA",
+        "role_b": "CHN",
+        "turns": [
+            {"role_id": "BRA", "to": "CHN", "content": "We back option 1.1.", "turn": 0},
+            {"role_id": "CHN", "to": "BRA", "content": "Option 1.2 is the one.", "turn": 1},
+        ],
+    }
+
+    class _Rows:
+        def mappings(self):
+            return [row]
+
+    class _ShiftSession:
+        async def execute(self, *_args, **_kwargs):
+            return _Rows()
+
+    stance = {"ISSUE_1": {"acceptance": {"1.1": 0.5, "1.2": 0.5}, "firmness": 0.5}}
+    state = {"stances": {"BRA": copy.deepcopy(stance), "CHN": copy.deepcopy(stance)}}
+    spec = {"ISSUE_1": {"options": [{"option_id": "1.1"}, {"option_id": "1.2"}]}}
+    reasons = await apply_side_negotiation_shifts(_ShiftSession(), uuid.uuid4(), state, spec)
+
+    assert {reason["role_id"] for reason in reasons} == {"BRA", "CHN"}
+    assert state["stances"]["CHN"]["ISSUE_1"]["acceptance"]["1.1"] > 0.5
+    assert state["stances"]["CHN"]["ISSUE_1"]["acceptance"]["1.2"] == 0.5
+    assert state["stances"]["BRA"]["ISSUE_1"]["acceptance"]["1.2"] > 0.5
+    assert state["stances"]["BRA"]["ISSUE_1"]["acceptance"]["1.1"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_foreground_generation_does_not_queue_behind_side_negotiations():
+    limiter = LLMConcurrencyLimiter(limit=3, background_limit=2)
+    release = asyncio.Event()
+    in_flight = 0
+
+    class _Blocked:
+        provider_name = "fake"
+        model_name = "fake"
+
+        async def generate(self, request):
+            nonlocal in_flight
+            in_flight += 1
+            await release.wait()
+            in_flight -= 1
+            return {"assistant_text": "side reply", "metadata": None}
+
+    class _Quick:
+        provider_name = "fake"
+        model_name = "fake"
+
+        async def generate(self, request):
+            return {"assistant_text": "player reply", "metadata": None}
+
+    state = _state()
+    pairs = side_negotiation_pairs(state)
+    background = asyncio.gather(
+        *(negotiate_pair(_Blocked(), uuid.uuid4(), state, pair, [], 2, limiter.background) for pair in pairs)
+    )
+    await asyncio.sleep(0.01)
+    assert in_flight == 2
+
+    response = await asyncio.wait_for(
+        generate_with_cancellation(_Quick(), {"prompt": "p"}, limiter=limiter.foreground), timeout=1.0
+    )
+    assert response["assistant_text"] == "player reply"
+    release.set()
+    await background
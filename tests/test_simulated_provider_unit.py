@@ -0,0 +1,118 @@
+import time
+
+import pytest
+
+from backend.llm_provider import (
+    ERROR_CLASS_RATE_LIMIT,
+    ERROR_CLASS_TIMEOUT,
+    CannedLLMProvider,
+    CircuitBreaker,
+    LLMCallError,
+    ResilientLLMProvider,
+    RetryBudget,
+    SimulatedLLMError,
+    SimulatedLLMProvider,
+    ValidationError,
+    classify_llm_error,
+    validate_llm_response,
+)
+
+
+def _recorder():
+    sleeps: list[float] = []
+
+    async def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    return sleeps, sleep
+
+
+@pytest.mark.asyncio
+async def test_simulated_provider_latency_and_output_length_follow_profile():
+    sleeps, sleep = _recorder()
+    provider = SimulatedLLMProvider(
+        {
+            "latency": {"distribution": "uniform", "min_ms": 100, "max_ms": 200},
+            "jitter_ms": 0,
+            "output_words": {"mean": 30, "stddev": 0, "min": 1},
+        },
+        seed=7,
+        sleep=sleep,
+    )
+    response = await provider.generate({"prompt_version": "r3_debate_speech_v1", "prompt": "p"})
+    assert provider.provider_name == "simulated"
+    assert len(response["assistant_text"].split()) == 31  # "[SIMULATED]" marker + 30 words
+    assert len(sleeps) == 1 and 0.1 <= sleeps[0] <= 0.2
+
+
+@pytest.mark.asyncio
+async def test_simulated_provider_injects_classified_errors_and_empty_responses():
+    _, sleep = _recorder()
+    provider = SimulatedLLMProvider(
+        {"latency": {"distribution": "fixed", "ms": 0}, "errors": {ERROR_CLASS_RATE_LIMIT: 1.0}},
+        seed=1,
+        sleep=sleep,
+    )
+    with pytest.raises(SimulatedLLMError) as excinfo:
+        await provider.generate({"prompt_version": "v", "prompt": "p"})
+    assert classify_llm_error(excinfo.value) == ERROR_CLASS_RATE_LIMIT
+
+    empty = SimulatedLLMProvider(
+        {"latency": {"distribution": "fixed", "ms": 0}, "empty_rate": 0.0, "prompt_versions": {"v": {"empty_rate": 1.0}}},
+        seed=1,
+        sleep=sleep,
+    )
+    empty_response = await empty.generate({"prompt_version": "v", "prompt": "p"})
+    assert empty_response["assistant_text"] == ""
+    with pytest.raises(ValidationError):
+        validate_llm_response(empty_response)
+    assert (await empty.generate({"prompt_version": "other", "prompt": "p"}))["assistant_text"]
+
+
+@pytest.mark.asyncio
+async def test_simulated_errors_go_through_retry_budget_and_circuit_breaker():
+    sleeps, sleep = _recorder()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60.0)
+    provider = ResilientLLMProvider(
+        SimulatedLLMProvider({"latency": {"distribution": "fixed", "ms": 0}, "errors": {ERROR_CLASS_RATE_LIMIT: 1.0}}),
+        max_retries=2,
+        retry_budget=RetryBudget(min_retries=2),
+        circuit_breaker=breaker,
+        fallback=CannedLLMProvider(),
+        sleep=sleep,
+    )
+    with pytest.raises(LLMCallError) as excinfo:
+        await provider.generate({"prompt_version": "v", "prompt": "p"})
+    assert excinfo.value.error_class == ERROR_CLASS_RATE_LIMIT
+    assert excinfo.value.attempts == 3 and len(sleeps) == 2
+    # The budget's floor of two retries is spent: the next failure is not retried.
+    with pytest.raises(LLMCallError) as excinfo:
+        await provider.generate({"prompt_version": "v", "prompt": "p"})
+    assert excinfo.value.attempts == 1 and len(sleeps) == 2
+    assert breaker.state == CircuitBreaker.OPEN
+
+    served = await provider.generate({"prompt_version": "v", "prompt": "p"})
+    assert (served.get("metadata") or {})["fallback_from"] == "simulated"
+
+
+@pytest.mark.asyncio
+async def test_simulated_provider_times_out_at_request_deadline():
+    sleeps, sleep = _recorder()
+    provider = SimulatedLLMProvider({"latency": {"distribution": "fixed", "ms": 5000}, "jitter_ms": 0}, sleep=sleep)
+    with pytest.raises(SimulatedLLMError) as excinfo:
+        await provider.generate({"prompt_version": "v", "prompt": "p", "deadline": time.monotonic() + 0.5})
+    assert classify_llm_error(excinfo.value) == ERROR_CLASS_TIMEOUT
+    assert sleeps and sleeps[0] <= 0.5
+
+
+def test_round3_debate_uses_any_configured_provider_not_just_openai():
+    from types import SimpleNamespace
+
+    from backend.main import should_use_provider_round3
+
+    prod = SimpleNamespace(mercury_env="prod", openai_round3_debate_speeches=False)
+    for name in ("openai", "replay", "simulated"):
+        assert should_use_provider_round3(prod, name, 1, "USA")
+    assert not should_use_provider_round3(prod, "fake", 1, "USA")
+    assert not should_use_provider_round3(prod, "simulated", 1, "JPN")
+    assert not should_use_provider_round3(SimpleNamespace(mercury_env="test", openai_round3_debate_speeches=False), "simulated", 1, "USA")
@@ -0,0 +1,67 @@
+import asyncio
+import uuid
+from typing import Any, cast
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+import backend.main as main
+from backend.config import get_settings
+from backend.db import get_session_maker
+from backend.main import AdvanceRequest, app
+from backend.single_flight import advance_flight_key
+
+
+async def _flight_rows(game_id: str) -> list:
+    async with get_session_maker()() as session:
+        rows = await session.execute(
+            text("SELECT status, result_status FROM advance_flights WHERE game_id = :gid"), {"gid": game_id}
+        )
+        return [tuple(row) for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_shared_flight_runs_once_and_stores_the_outcome(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("ADVANCE_SINGLE_FLIGHT_SHARED", "1")
+    get_settings.cache_clear()
+    try:
+        transport = ASGITransport(app=cast(Any, app))
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            game_id = (await client.post("/games", json={})).json()["game_id"]
+            body = {"event": "ROLE_CONFIRMED", "payload": {"human_role_id": "USA"}}
+            first, second = await asyncio.gather(
+                client.post(f"/games/{game_id}/advance", json=body),
+                client.post(f"/games/{game_id}/advance", json=body),
+            )
+            assert first.status_code == second.status_code == 200
+            assert await _flight_rows(game_id) == [("done", 200)]
+    finally:
+        get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_shared_leader_releases_its_flight(monkeypatch: pytest.MonkeyPatch):
+    transport = ASGITransport(app=cast(Any, app))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        game_id = (await client.post("/games", json={})).json()["game_id"]
+
+    started = asyncio.Event()
+
+    async def hang(*_args: Any, **_kwargs: Any):
+        started.set()
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(main, "run_advance", hang)
+    req = AdvanceRequest(event="ROUND_1_STEP", payload={})
+    flight_key = advance_flight_key(uuid.UUID(game_id), req.event, req.payload)
+    async with get_session_maker()() as session:
+        leader = asyncio.create_task(
+            main._run_shared_advance_flight(uuid.UUID(game_id), req, session, flight_key, None)
+        )
+        await started.wait()
+        assert await _flight_rows(game_id) == [("running", None)]
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+    assert await _flight_rows(game_id) == []
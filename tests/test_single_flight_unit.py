@@ -0,0 +1,68 @@
+import asyncio
+import uuid
+
+import pytest
+
+from backend.single_flight import SingleFlightGroup, advance_flight_key
+
+
+def test_advance_flight_key_ignores_payload_key_order():
+    game_id = uuid.uuid4()
+    a = advance_flight_key(game_id, "CONVO_MESSAGE", {"content": "hi", "extra": 1})
+    b = advance_flight_key(game_id, "CONVO_MESSAGE", {"extra": 1, "content": "hi"})
+    assert a == b
+    assert a != advance_flight_key(game_id, "CONVO_MESSAGE", {"content": "hello"})
+    assert a != advance_flight_key(uuid.uuid4(), "CONVO_MESSAGE", {"content": "hi"})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_share_one_execution_but_sequential_calls_rerun():
+    group = SingleFlightGroup()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"call": calls}
+
+    results = await asyncio.gather(*(group.run("k", work) for _ in range(4)))
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert group.stats["leaders"] == 1 and group.stats["coalesced_local"] == 3
+
+    assert await group.run("k", work) == {"call": 2}
+    assert group.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_duplicates_receive_the_leaders_exception():
+    group = SingleFlightGroup()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("rejected")
+
+    results = await asyncio.gather(*(group.run("k", fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert group.stats["coalesced_local"] == 2
+
+
+@pytest.mark.asyncio
+async def test_unshareable_leader_result_makes_waiters_rerun():
+    group = SingleFlightGroup()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        status = 499 if calls == 1 else 200
+        await asyncio.sleep(0.01)
+        return status
+
+    leader = asyncio.create_task(group.run("k", work, shareable=lambda status: status != 499))
+    await asyncio.sleep(0)
+    duplicate = asyncio.create_task(group.run("k", work, shareable=lambda status: status != 499))
+    assert await leader == 499
+    assert await duplicate == 200
+    assert calls == 2 and group.stats["unshared"] == 1
@@ -0,0 +1,39 @@
+from backend.speech_library import iter_speech_slots, representative_stance, stance_bucket
+from backend.state import COUNTRIES, NGOS, pick_speech_variant
+
+
+def _issue() -> dict:
+    return {
+        "issue_id": "1",
+        "title": "Issue 1",
+        "options": [{"option_id": "1.2"}, {"option_id": "1.1"}],
+    }
+
+
+def test_stance_bucket_quantizes_lead_option_and_firmness():
+    assert stance_bucket({"preferred": "1.2", "firmness": 0.9, "acceptance": {"1.1": 1.0}}) == "1.2:high"
+    assert stance_bucket({"firmness": 0.5, "acceptance": {"1.1": 0.4, "1.3": 0.6}}) == "1.3:mid"
+    assert stance_bucket({"firmness": 0.1, "acceptance": {"1.1": None}}) == "none:low"
+    assert stance_bucket(None) == "none:mid"
+
+
+def test_representative_stance_round_trips_to_its_bucket():
+    for bucket in ("none:low", "1.1:mid", "1.2:high"):
+        assert stance_bucket(representative_stance(bucket)) == bucket
+
+
+def test_iter_speech_slots_covers_every_combination():
+    slots = list(iter_speech_slots([_issue()], variants_per_slot=2))
+    # (no lead + 2 options) x 3 firmness bands, 2 debate rounds, 2 variants, every non-chair role
+    assert len(slots) == 3 * 3 * 2 * 2 * len(COUNTRIES + NGOS)
+    assert len(set(slots)) == len(slots)
+    assert {slot.stance_bucket for slot in slots} >= {"none:low", "1.1:mid", "1.2:high"}
+
+
+def test_pick_speech_variant_is_deterministic_per_seed():
+    candidates = [{"id": f"v{i}", "speech_text": f"speech {i}"} for i in range(6)]
+    first = pick_speech_variant("BRA", "1", 1, 42, candidates)
+    again = pick_speech_variant("BRA", "1", 1, 42, list(reversed(candidates)))
+    assert first == again
+    picks = {pick_speech_variant("BRA", "1", 1, seed, candidates)["id"] for seed in range(20)}
+    assert len(picks) > 1
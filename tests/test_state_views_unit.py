@@ -0,0 +1,35 @@
+import pytest
+
+from backend.state_views import parse_state_fields, project_state, projection_tag
+
+
+STATE = {
+    "game_id": "g",
+    "status": "ISSUE_DEBATE_ROUND_1",
+    "human_role_id": "USA",
+    "roles": {"USA": {"type": "country"}},
+    "round1": {"cursor": 6},
+    "round3": {"active_issue": {"issue_id": "2"}, "closed_issues": ["1"], "stance_log": [{"role": "CAN"}]},
+    "stances": {"CAN": {"1": {"firmness": 0.5}}},
+    "checkpoints": [{"checkpoint_id": "c"}],
+}
+
+
+def test_fields_select_nested_paths_and_skip_missing_ones():
+    paths = parse_state_fields("status, round3.active_issue,round3.active_issue.issue_id,nope.x")
+    assert project_state(STATE, paths) == {"status": "ISSUE_DEBATE_ROUND_1", "round3": {"active_issue": {"issue_id": "2"}}}
+    assert parse_state_fields(None) is None
+    with pytest.raises(ValueError):
+        parse_state_fields("round3..active_issue")
+    assert projection_tag(parse_state_fields("a,b"), "full") == projection_tag(parse_state_fields("b,a"), "player")
+    assert projection_tag(None, "full") is None
+
+
+def test_views_trim_state_without_mutating_it():
+    player = project_state(STATE, view="player")
+    assert set(player) == {"game_id", "status", "human_role_id", "roles", "round3"}
+    assert player["round3"] == {"active_issue": {"issue_id": "2"}, "closed_issues": ["1"]}
+    debug = project_state(STATE, view="debug")
+    assert "checkpoints" not in debug and "stances" in debug
+    assert project_state(STATE, view="full") is STATE
+    assert "stance_log" in STATE["round3"] and "checkpoints" in STATE
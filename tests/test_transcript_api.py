@@ -81,3 +81,65 @@ async def test_transcript_filtering_and_ordering():
         assert len(entries_false) == 1
         assert entries_false[0]["visible_to_human"] is False
         assert entries_false[0]["content"] == "msg3"
+
+
+def test_transcript_cursor_roundtrip_and_rejects_garbage():
+    from fastapi import HTTPException
+
+    from backend.main import decode_transcript_cursor, encode_transcript_cursor
+
+    cursor = encode_transcript_cursor(42)
+    assert cursor != "42"
+    assert decode_transcript_cursor(cursor) == 42
+    assert decode_transcript_cursor("7") == 7
+    with pytest.raises(HTTPException):
+        decode_transcript_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_transcript_pagination_returns_only_new_entries():
+    transport = ASGITransport(app=cast(Any, app))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        create_resp = await client.post("/games", json={})
+        game_id = create_resp.json()["game_id"]
+
+        async def insert(content: str, visible: bool) -> None:
+            async for session in get_session():
+                async with session.begin():
+                    await session.execute(
+                        text(
+                            """
+                            INSERT INTO transcript_entries (game_id, role_id, phase, round, visible_to_human, content)
+                            VALUES (:gid, 'JPN', 'ROUND_1', 1, :visible, :content)
+                            """
+                        ),
+                        {"gid": game_id, "visible": visible, "content": content},
+                    )
+                break
+
+        for i, visible in enumerate([True, False, True]):
+            await insert(f"p{i}", visible)
+
+        first = (await client.get(f"/games/{game_id}/transcript", params={"limit": 2})).json()
+        assert [e["content"] for e in first["entries"]] == ["p0", "p1"]
+        assert first["has_more"] is True
+
+        rest = (await client.get(f"/games/{game_id}/transcript", params={"after": first["next_cursor"]})).json()
+        assert [e["content"] for e in rest["entries"]] == ["p2"]
+        assert rest["has_more"] is False
+
+        # A cursor taken from a filtered page resumes the unfiltered stream at the same position.
+        visible_page = (
+            await client.get(f"/games/{game_id}/transcript", params={"visible_to_human": "true", "limit": 1})
+        ).json()
+        assert [e["content"] for e in visible_page["entries"]] == ["p0"]
+        after_visible = (
+            await client.get(f"/games/{game_id}/transcript", params={"after": visible_page["next_cursor"]})
+        ).json()
+        assert [e["content"] for e in after_visible["entries"]] == ["p1", "p2"]
+
+        await insert("p3", True)
+        polled = (await client.get(f"/games/{game_id}/transcript", params={"after": rest["next_cursor"]})).json()
+        assert [e["content"] for e in polled["entries"]] == ["p3"]
+        empty = (await client.get(f"/games/{game_id}/transcript", params={"after": polled["next_cursor"]})).json()
+        assert empty["entries"] == [] and empty["next_cursor"] == polled["next_cursor"]